@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Generated Artifact Store
+Author: Created for QA Team
+Description: Keeps the web UI's generated files (Word, Excel, JSON) on disk in
+             one temp directory per workspace instead of in server memory.
+             Old workspaces expire after a TTL, and size quotas per workspace
+             and overall evict the oldest jobs first. Rendered documents are
+             made on first use and shared by content hash.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Configuration
+ARTIFACT_DIR = os.getenv(
+    'QA_DOCS_ARTIFACT_DIR',
+    os.path.join(tempfile.gettempdir(), 'qa-docs-generator', 'artifacts')
+)
+ARTIFACT_TTL_SECONDS = float(os.getenv('QA_DOCS_ARTIFACT_TTL_HOURS', '24')) * 3600
+SESSION_QUOTA_BYTES = int(os.getenv('QA_DOCS_ARTIFACT_SESSION_MB', '200')) * 1024 * 1024
+TOTAL_QUOTA_BYTES = int(os.getenv('QA_DOCS_ARTIFACT_TOTAL_MB', '2048')) * 1024 * 1024
+CLEANUP_INTERVAL_SECONDS = 60   # TTL sweeps run at most this often
+RENDERED_DIR = 'rendered'      # Pseudo-workspace holding one folder per rendered content hash
+
+UNSAFE_NAME_CHARS = re.compile(r'[^A-Za-z0-9._-]+')
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def _safe_name(name):
+    """Make an ID or file name safe to use as a single path component"""
+    name = UNSAFE_NAME_CHARS.sub('_', str(name)).strip('._')
+    return name or 'unnamed'
+
+
+def _tree_size_and_mtime(path):
+    """Total bytes of the files under path and the newest modification time"""
+    total = 0
+    newest = 0.0
+    for folder, _, files in os.walk(path):
+        for file_name in files:
+            try:
+                stat = os.stat(os.path.join(folder, file_name))
+            except OSError:
+                continue
+            total += stat.st_size
+            newest = max(newest, stat.st_mtime)
+    return total, newest
+
+
+class ArtifactStore:
+    """
+    Files are laid out as <root>/<workspace>/<job>/<file>, so a whole job or
+    workspace is removed with one directory delete
+    """
+
+    def __init__(self, root=ARTIFACT_DIR, ttl_seconds=ARTIFACT_TTL_SECONDS,
+                 session_quota=SESSION_QUOTA_BYTES, total_quota=TOTAL_QUOTA_BYTES):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.session_quota = session_quota
+        self.total_quota = total_quota
+        self._lock = threading.Lock()
+        self._render_lock = threading.Lock()
+        self._last_cleanup = 0.0
+
+    def _job_dir(self, workspace, job_id):
+        return os.path.join(self.root, _safe_name(workspace), _safe_name(job_id))
+
+    @contextmanager
+    def create(self, workspace, job_id, file_name):
+        """
+        Yield a temporary path to write one artifact to. When the block ends
+        the file is moved into place and the quotas are enforced; on an error
+        the partial file is removed.
+        """
+        job_dir = self._job_dir(workspace, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        path = os.path.join(job_dir, _safe_name(file_name))
+        fd, tmp_path = tempfile.mkstemp(dir=job_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            yield tmp_path
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.enforce_quotas(workspace, keep_job=job_id)
+
+    def path(self, workspace, job_id, file_name):
+        """Path of a stored artifact, or None if it was never written or has expired"""
+        path = os.path.join(self._job_dir(workspace, job_id), _safe_name(file_name))
+        return path if os.path.isfile(path) else None
+
+    def write_json(self, workspace, job_id, file_name, value):
+        """Store value as pretty-printed UTF-8 JSON and return the artifact's path"""
+        with self.create(workspace, job_id, file_name) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f, indent=2, ensure_ascii=False)
+        return self.path(workspace, job_id, file_name)
+
+    def rendered(self, source_path, file_name, render, salt=''):
+        """
+        Path of file_name rendered from the JSON artifact at source_path by
+        render(value, output_path). The render is memoized on the SHA-256 of
+        the JSON plus salt (anything else the output depends on), so it runs
+        once per distinct content however many jobs or clicks ask for it.
+        """
+        with open(source_path, 'rb') as f:
+            source = f.read()
+        key = hashlib.sha256(salt.encode('utf-8') + b'\0' + source).hexdigest()
+
+        with self._render_lock:
+            path = self.path(RENDERED_DIR, key, file_name)
+            if path is None:
+                with self.create(RENDERED_DIR, key, file_name) as tmp_path:
+                    render(json.loads(source), tmp_path)
+                path = self.path(RENDERED_DIR, key, file_name)
+            else:
+                os.utime(path)   # Keep popular renders from expiring
+        return path
+
+    @staticmethod
+    def loader(path):
+        """
+        Zero-argument callable that reads the artifact when it is called, for
+        download buttons that fetch the file only when it is clicked
+        """
+        def load():
+            with open(path, 'rb') as f:
+                return f.read()
+        return load
+
+    def remove_job(self, workspace, job_id):
+        """Delete every artifact of a job"""
+        shutil.rmtree(self._job_dir(workspace, job_id), ignore_errors=True)
+
+    def _job_dirs(self, workspace=None):
+        """(newest mtime, bytes, workspace, job_id) for every job directory"""
+        jobs = []
+        try:
+            workspaces = [workspace] if workspace else os.listdir(self.root)
+        except OSError:
+            return jobs
+        for name in workspaces:
+            workspace_dir = os.path.join(self.root, _safe_name(name))
+            try:
+                job_ids = os.listdir(workspace_dir)
+            except OSError:
+                continue
+            for job_id in job_ids:
+                size, mtime = _tree_size_and_mtime(os.path.join(workspace_dir, job_id))
+                jobs.append((mtime, size, name, job_id))
+        return jobs
+
+    def usage(self, workspace=None):
+        """Bytes on disk for one workspace, or for the whole store"""
+        return sum(size for _, size, _, _ in self._job_dirs(workspace))
+
+    def enforce_quotas(self, workspace, keep_job=None):
+        """Evict the oldest jobs until the workspace and the whole store fit their quotas"""
+        with self._lock:
+            self._evict(self._job_dirs(workspace), self.session_quota, keep_job)
+            self._evict(self._job_dirs(), self.total_quota, keep_job)
+        self.cleanup()
+
+    def _evict(self, jobs, quota, keep_job):
+        total = sum(size for _, size, _, _ in jobs)
+        for _, size, workspace, job_id in sorted(jobs):
+            if total <= quota:
+                break
+            if job_id == keep_job:
+                continue   # Never evict the job being written
+            self.remove_job(workspace, job_id)
+            total -= size
+
+    def cleanup(self, force=False):
+        """Delete jobs (and emptied workspaces) untouched for longer than the TTL"""
+        now = time.time()
+        if not force and now - self._last_cleanup < CLEANUP_INTERVAL_SECONDS:
+            return
+        self._last_cleanup = now
+        for mtime, _, workspace, job_id in self._job_dirs():
+            if now - mtime > self.ttl_seconds:
+                self.remove_job(workspace, job_id)
+        try:
+            for workspace in os.listdir(self.root):
+                try:
+                    os.rmdir(os.path.join(self.root, workspace))   # Only succeeds when empty
+                except OSError:
+                    pass
+        except OSError:
+            pass
+
+
+def get_artifact_store():
+    """Process-wide artifact store, created (and swept for expired files) on first use"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ArtifactStore()
+            _default_store.cleanup(force=True)
+        return _default_store
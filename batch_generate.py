@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Batch QA Documentation Generator
+Author: Created for QA Team
+Description: Generates test plans and test cases for a whole directory (or glob)
+             of requirement PDFs through an asyncio pipeline using AsyncAnthropic
+Usage: python3 batch_generate.py <pdf_directory_or_glob> [options]
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import asyncio
+import sqlite3
+
+from claude_client import (
+    create_async_client, create_complete_async, describe_cache_stats, describe_usage, prime_prompt_cache_async
+)
+from pdf_extraction import extract_pdf_text
+from response_parsing import parse_test_cases, parse_test_plan
+from generate_test_plan import build_test_plan_request, create_word_document
+from generate_test_cases import build_test_cases_request, create_excel_file
+from test_case_dedup import remove_near_duplicates
+from requirements_chunking import (
+    CHUNK_CASE_RANGE, describe_chunk_failures, label_chunk, map_reduce_test_cases, renumber_test_cases, split_requirements
+)
+from test_case_store import get_test_case_store
+from token_budget import plan_test_cases
+
+# Configuration
+CLAUDE_API_KEY = os.getenv('ANTHROPIC_API_KEY')
+DEFAULT_CONCURRENCY = 4       # Claude requests in flight at once
+DEFAULT_REQUESTS_PER_MINUTE = 50
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter: allows bursts up to capacity, refills at rate per second"""
+
+    def __init__(self, rate, capacity):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be positive and capacity at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def find_pdfs(target):
+    """Resolve a directory or glob pattern to a sorted list of PDF paths"""
+    if os.path.isdir(target):
+        pattern = os.path.join(target, '*.pdf')
+    else:
+        pattern = target
+    return sorted(path for path in glob.glob(pattern) if path.lower().endswith('.pdf'))
+
+
+async def call_claude(client, semaphore, request, usage):
+    """
+    Send one concurrency-limited request and return the response text;
+    truncated responses are continued and transient errors retried, each API
+    request going through the client's rate limiter
+    """
+    async with semaphore:
+        response_text, responses = await create_complete_async(client, request)
+    for response in responses:
+        usage['input_tokens'] += response.usage.input_tokens
+        usage['cache_creation_input_tokens'] += response.usage.cache_creation_input_tokens or 0
+        usage['cache_read_input_tokens'] += response.usage.cache_read_input_tokens or 0
+        usage['output_tokens'] += response.usage.output_tokens
+    return response_text
+
+
+async def process_pdf(pdf_path, output_dir, options, client, limiter, semaphore, extraction_lock):
+    """Extract, generate and render the documents for one PDF; returns its report entry"""
+    project_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    output_name = project_name.replace(' ', '_')
+    usage = {'input_tokens': 0, 'cache_creation_input_tokens': 0, 'cache_read_input_tokens': 0, 'output_tokens': 0}
+    result = {'pdf': pdf_path, 'project': project_name, 'files': [], 'errors': [], 'usage': usage}
+    started = time.perf_counter()
+
+    try:
+        # Extraction already spreads pages across every core; run one PDF at a time
+        async with extraction_lock:
+            requirements_text, stats = await asyncio.to_thread(
+                extract_pdf_text, pdf_path, use_cache=options['use_cache']
+            )
+        result['pages'] = stats['pages']
+        print(f"📄 {project_name}: {stats['pages']} pages extracted")
+    except Exception as e:
+        result['errors'].append(f"PDF: {e}")
+        result['seconds'] = time.perf_counter() - started
+        return result
+
+    plan_request = build_test_plan_request(requirements_text, project_name)
+    budget = plan_test_cases(requirements_text)
+    cases_request = build_test_cases_request(requirements_text, budget['case_range'])
+    chunks = split_requirements(requirements_text) if budget['chunked'] else [requirements_text]
+    if options['cases'] and len(chunks) > 1:
+        print(f"🧩 {project_name}: ~{budget['input_tokens']} input tokens do not fit one call; "
+              f"generating test cases for {len(chunks)} chunks")
+    loop = asyncio.get_running_loop()
+
+    def generate_chunk(chunk_text, chunk_index):
+        # Runs in a map_chunks worker thread; the call itself goes through this
+        # loop's rate limiter and semaphore like every other request
+        chunk_request = build_test_cases_request(label_chunk(chunk_text, chunk_index, len(chunks)), CHUNK_CASE_RANGE)
+        response_text = asyncio.run_coroutine_threadsafe(
+            call_claude(client, semaphore, chunk_request, usage), loop
+        ).result()
+        chunk_cases, _ = parse_test_cases(response_text)
+        return chunk_cases
+
+    async def plan_step():
+        response_text = await call_claude(client, semaphore, plan_request, usage)
+        test_plan, _ = parse_test_plan(response_text)
+        output_docx = os.path.join(output_dir, f"{output_name}_Test_Plan.docx")
+        await asyncio.to_thread(create_word_document, test_plan, output_docx)
+        with open(os.path.join(output_dir, f"{output_name}_Test_Plan.json"), 'w', encoding='utf-8') as f:
+            json.dump(test_plan, f, indent=2, ensure_ascii=False)
+        result['files'].append(output_docx)
+
+    async def cases_step():
+        if len(chunks) > 1:
+            # Map-reduce over the chunks, the same way generate_test_cases.py --chunked does
+            failures = []
+            test_cases = await asyncio.to_thread(map_reduce_test_cases, chunks, generate_chunk, failures=failures)
+            if len(failures) == len(chunks):
+                raise failures[0][1]
+            result['chunks'] = len(chunks)
+            if failures:
+                print(f"⚠️  {project_name}: {len(failures)} of {len(chunks)} chunks failed, their test cases are missing:")
+                for line in describe_chunk_failures(chunks, failures):
+                    print(line)
+                result['failed_chunks'] = [index + 1 for index, _ in failures]
+        else:
+            response_text = await call_claude(client, semaphore, cases_request, usage)
+            test_cases, stats = parse_test_cases(response_text)
+            if not stats['complete']:
+                print(f"⚠️  {project_name}: response incomplete, salvaged {len(test_cases)} complete test cases")
+                result['incomplete'] = True
+        test_cases, dedup_report = remove_near_duplicates(test_cases)
+        if dedup_report['removed']:
+            print(f"🧹 {project_name}: merged {dedup_report['removed']} near-duplicate test cases")
+            result['duplicates_removed'] = dedup_report['removed']
+            if len(chunks) > 1:
+                # Chunked IDs are synthetic already; close the gaps the merged cases left
+                renumber_test_cases(test_cases)
+        output_xlsx = os.path.join(output_dir, f"{output_name}_Test_Cases.xlsx")
+        await asyncio.to_thread(create_excel_file, test_cases, output_xlsx, project_name)
+        with open(os.path.join(output_dir, f"{output_name}_Test_Cases.json"), 'w', encoding='utf-8') as f:
+            json.dump(test_cases, f, indent=2, ensure_ascii=False)
+        result['files'].append(output_xlsx)
+        result['test_cases'] = len(test_cases)
+        try:
+            await asyncio.to_thread(get_test_case_store().save_suite, project_name, test_cases, 'batch')
+        except (sqlite3.Error, OSError) as e:
+            print(f"⚠️  {project_name}: test case store not updated: {e}")
+
+    if options['plan'] and options['cases'] and len(chunks) == 1:
+        # Both requests share the requirements prefix; write it to the prompt cache once
+        try:
+            async with semaphore:
+                await limiter.acquire()
+                await prime_prompt_cache_async(client, [plan_request, cases_request])
+        except Exception as e:
+            print(f"⚠️  {project_name}: prompt cache priming skipped ({e})")
+
+    steps = []
+    if options['plan']:
+        steps.append(('Test Plan', plan_step()))
+    if options['cases']:
+        steps.append(('Test Cases', cases_step()))
+
+    outcomes = await asyncio.gather(*(step for _, step in steps), return_exceptions=True)
+    for (name, _), outcome in zip(steps, outcomes):
+        if isinstance(outcome, BaseException):
+            result['errors'].append(f"{name}: {outcome}")
+
+    result['seconds'] = time.perf_counter() - started
+    status = "❌" if result['errors'] else "✅"
+    print(f"{status} {project_name}: done in {result['seconds']:.1f}s")
+    return result
+
+
+async def run_batch(pdf_paths, output_dir, options, client):
+    """Run every PDF through the pipeline concurrently and return the report entries"""
+    semaphore = asyncio.Semaphore(options['concurrency'])
+    limiter = TokenBucket(rate=options['rpm'] / 60, capacity=max(1, options['concurrency']))
+    client.messages.before_request = limiter.acquire
+    extraction_lock = asyncio.Lock()
+
+    try:
+        return await asyncio.gather(*(
+            process_pdf(pdf_path, output_dir, options, client, limiter, semaphore, extraction_lock)
+            for pdf_path in pdf_paths
+        ))
+    finally:
+        await client.close()
+
+
+def print_summary(results, wall_seconds, report_path):
+    """Print one summary report for the whole batch"""
+    succeeded = [r for r in results if not r['errors']]
+    failed = [r for r in results if r['errors']]
+    input_tokens = sum(r['usage']['input_tokens'] for r in results)
+    cache_written = sum(r['usage']['cache_creation_input_tokens'] for r in results)
+    cache_read = sum(r['usage']['cache_read_input_tokens'] for r in results)
+    output_tokens = sum(r['usage']['output_tokens'] for r in results)
+
+    print("\n" + "="*60)
+    print("📊 Batch Summary")
+    print("="*60)
+    for r in results:
+        status = "❌" if r['errors'] else "✅"
+        cases = f", {r['test_cases']} test cases" if 'test_cases' in r else ""
+        print(f"{status} {r['project']}: {r.get('pages', 0)} pages{cases}, {r['seconds']:.1f}s")
+        for error in r['errors']:
+            print(f"     ⚠️  {error}")
+    print("-"*60)
+    print(f"PDFs: {len(results)} ({len(succeeded)} succeeded, {len(failed)} failed)")
+    print(f"Test cases: {sum(r.get('test_cases', 0) for r in results)}")
+    print(f"Tokens: {input_tokens} input, {cache_written} written to and {cache_read} read from "
+          f"the prompt cache, {output_tokens} output")
+    print(f"Wall time: {wall_seconds:.1f}s")
+    print(f"📋 Report: {report_path}")
+    print("="*60)
+
+
+def _positive_int(values, name, default):
+    """Integer value of a --name=N option; raises ValueError unless it is at least 1"""
+    value = values.get(name, str(default))
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise ValueError(f"--{name} must be a positive integer, got {value!r}")
+    return number
+
+
+def parse_options(flags):
+    """Read --name=value options; raises ValueError for an invalid --concurrency or --rpm"""
+    values = dict(flag[2:].split('=', 1) for flag in flags if '=' in flag)
+    plan = '--plan' in flags
+    cases = '--cases' in flags
+    return {
+        'plan': plan or not cases,
+        'cases': cases or not plan,
+        'concurrency': _positive_int(values, 'concurrency', DEFAULT_CONCURRENCY),
+        'rpm': _positive_int(values, 'rpm', DEFAULT_REQUESTS_PER_MINUTE),
+        'output_dir': values.get('output-dir', 'batch_output'),
+        'use_cache': '--no-cache' not in flags,
+        'use_response_cache': '--no-response-cache' not in flags,
+    }
+
+
+def print_usage():
+    """Print the command line usage"""
+    print("\n❌ Usage: python3 batch_generate.py <pdf_directory_or_glob> [options]")
+    print("\nExample:")
+    print("  python3 batch_generate.py specs/ --concurrency=6 --rpm=40")
+    print("  python3 batch_generate.py \"specs/release_*.pdf\" --cases")
+    print("\nOptions:")
+    print("  --plan              Generate test plans only")
+    print("  --cases             Generate test cases only")
+    print(f"  --concurrency=N     Claude requests in flight at once (default: {DEFAULT_CONCURRENCY})")
+    print(f"  --rpm=N             Max Claude requests per minute (default: {DEFAULT_REQUESTS_PER_MINUTE})")
+    print("  --output-dir=DIR    Where to write documents (default: batch_output)")
+    print("  --no-cache          Re-extract PDFs instead of reusing the extraction cache")
+    print("  --no-response-cache Call Claude even if an identical request was answered before")
+
+
+def main():
+    """Main function"""
+    print("="*60)
+    print("🚀 Batch QA Documentation Generator")
+    print("="*60)
+
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+
+    if len(args) < 1:
+        print_usage()
+        sys.exit(1)
+
+    try:
+        options = parse_options(flags)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        print_usage()
+        sys.exit(1)
+
+    if not CLAUDE_API_KEY:
+        print("❌ Error: ANTHROPIC_API_KEY environment variable not set!")
+        print("   Set it using: export ANTHROPIC_API_KEY='your-api-key'")
+        sys.exit(1)
+
+    pdf_paths = find_pdfs(args[0])
+    if not pdf_paths:
+        print(f"❌ Error: no PDF files found for: {args[0]}")
+        sys.exit(1)
+
+    output_dir = options['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+
+    print(f"\n📁 {len(pdf_paths)} PDFs, concurrency {options['concurrency']}, {options['rpm']:g} requests/min")
+
+    started = time.perf_counter()
+    client = create_async_client(CLAUDE_API_KEY, options['use_response_cache'])
+    results = asyncio.run(run_batch(pdf_paths, output_dir, options, client))
+    wall_seconds = time.perf_counter() - started
+
+    report_path = os.path.join(output_dir, 'batch_report.json')
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'wall_seconds': wall_seconds, 'results': results}, f, indent=2, ensure_ascii=False)
+
+    print_summary(results, wall_seconds, report_path)
+    print(describe_usage(client))
+    if options['use_response_cache']:
+        print(describe_cache_stats())
+
+    if any(r['errors'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
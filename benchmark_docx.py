@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+DOCX Rendering Benchmark
+Author: Created for QA Team
+Description: Compares the template-based test plan renderer with the previous
+             python-docx renderer on synthetic plans of growing size
+Usage: python3 benchmark_docx.py [--frs=N,N,...] [--repeat=N]
+"""
+
+import io
+import sys
+import time
+
+from docx import Document
+from docx.shared import Pt, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+from document_rendering import render_test_plan
+
+# Configuration
+DEFAULT_FR_COUNTS = [25, 100, 300, 600]
+DEFAULT_REPEAT = 3
+
+
+def synthetic_test_plan(fr_count):
+    """Test plan with fr_count functional requirements and proportionally many roles and activities"""
+    return {
+        'project_name': 'Benchmark Project',
+        'version': '1.0',
+        'description': 'Synthetic plan used to benchmark rendering. ' * 5,
+        'introduction': 'Purpose and scope of testing. ' * 5,
+        'goal': 'Validate every requirement. ' * 3,
+        'test_strategy': [f'Strategy item {i}' for i in range(10)],
+        'in_scope': [f'In-scope feature {i}' for i in range(fr_count // 4 + 1)],
+        'out_of_scope': [f'Out-of-scope item {i}' for i in range(10)],
+        'functional_requirements': [
+            {
+                'id': f'FR-{i:03d}',
+                'title': f'Requirement {i}',
+                'description': f'The system shall support behaviour number {i} for every user role.',
+                'acceptance_criteria': [f'Criterion {i}.{j}' for j in range(4)],
+            }
+            for i in range(1, fr_count + 1)
+        ],
+        'non_functional_requirements': [f'NFR {i}' for i in range(20)],
+        'impact_zones': {zone: [f'{zone} area {i}' for i in range(8)] for zone in ('red', 'yellow', 'green')},
+        'entry_criteria': [f'Entry {i}' for i in range(8)],
+        'exit_criteria': [f'Exit {i}' for i in range(8)],
+        'test_data_requirements': [f'Data {i}' for i in range(10)],
+        'test_environment': [{'name': name, 'purpose': 'Testing'} for name in ('Dev', 'Pre-Prod', 'Production')],
+        'testing_activities': [
+            {'activity': f'Activity {i}', 'details': 'Details', 'duration': '2 days'} for i in range(fr_count // 10 + 5)
+        ],
+        'roles_responsibilities': [
+            {'role': f'Role {i}', 'name': 'TBD', 'responsibilities': 'Execution'} for i in range(fr_count // 10 + 5)
+        ],
+        'risks': [f'Risk {i}' for i in range(10)],
+        'assumptions': [f'Assumption {i}' for i in range(10)],
+        'dependencies': [f'Dependency {i}' for i in range(10)],
+        'defect_management': [f'P{i}: definition' for i in range(1, 5)],
+        'test_metrics': [f'Metric {i}' for i in range(8)],
+        'deliverables': [f'Deliverable {i}' for i in range(8)],
+        'limitations': [f'Limitation {i}' for i in range(5)],
+    }
+
+
+def render_with_python_docx(test_plan, output_path):
+    """The previous renderer: one python-docx call per paragraph, row and cell"""
+    doc = Document()
+    
+    # Set default font
+    style = doc.styles['Normal']
+    font = style.font
+    font.name = 'Arial'
+    font.size = Pt(11)
+    
+    # Title
+    title = doc.add_heading(f"{test_plan.get('project_name', 'Project')} - QA Test Plan", level=0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    
+    # Subtitle
+    subtitle = doc.add_paragraph(f"Version {test_plan.get('version', '1.0')}")
+    subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    subtitle.runs[0].font.size = Pt(14)
+    subtitle.runs[0].font.color.rgb = RGBColor(102, 102, 102)
+    
+    doc.add_paragraph()
+    
+    # Project Information Table
+    table = doc.add_table(rows=5, cols=2)
+    table.style = 'Light Grid Accent 1'
+    
+    info_data = [
+        ('Project Name', test_plan.get('project_name', 'N/A')),
+        ('Document Status', 'DRAFT'),
+        ('Version', test_plan.get('version', '1.0')),
+        ('Team Members', 'QA Team'),
+        ('Test Environment', ', '.join([env['name'] for env in test_plan.get('test_environment', [])]))
+    ]
+    
+    for i, (label, value) in enumerate(info_data):
+        table.rows[i].cells[0].text = label
+        table.rows[i].cells[0].paragraphs[0].runs[0].font.bold = True
+        table.rows[i].cells[1].text = str(value)
+    
+    doc.add_paragraph()
+    
+    # Description Section
+    doc.add_heading('Description', level=1)
+    doc.add_paragraph(test_plan.get('description', 'N/A'))
+    
+    # Introduction Section
+    doc.add_heading('Introduction', level=1)
+    doc.add_paragraph(test_plan.get('introduction', 'N/A'))
+    
+    # Goal Section
+    doc.add_heading('Goal', level=1)
+    doc.add_paragraph(test_plan.get('goal', 'N/A'))
+    
+    # Test Strategy
+    doc.add_heading('Test Strategy', level=1)
+    for strategy in test_plan.get('test_strategy', []):
+        p = doc.add_paragraph(strategy, style='List Bullet')
+    
+    # Test Scope
+    doc.add_heading('Test Scope', level=1)
+    
+    doc.add_heading('In-Scope', level=2)
+    for item in test_plan.get('in_scope', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    doc.add_heading('Out-of-Scope', level=2)
+    for item in test_plan.get('out_of_scope', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    # Functional Requirements
+    doc.add_heading('Functional Requirements', level=1)
+    for idx, req in enumerate(test_plan.get('functional_requirements', []), 1):
+        doc.add_heading(f"{idx}. {req.get('title', 'Requirement')}", level=2)
+        doc.add_paragraph(req.get('description', ''))
+        
+        if req.get('acceptance_criteria'):
+            doc.add_paragraph('Acceptance Criteria:', style='List Bullet')
+            for criteria in req['acceptance_criteria']:
+                p = doc.add_paragraph(criteria, style='List Bullet 2')
+    
+    # Non-Functional Requirements
+    doc.add_heading('Non-Functional Requirements', level=1)
+    for nfr in test_plan.get('non_functional_requirements', []):
+        doc.add_paragraph(nfr, style='List Bullet')
+    
+    # Impact Zones
+    doc.add_heading('Impacted Areas', level=1)
+    
+    impact = test_plan.get('impact_zones', {})
+    
+    doc.add_heading('Red Zones (Critical)', level=2)
+    for item in impact.get('red', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    doc.add_heading('Yellow Zones (Medium Impact)', level=2)
+    for item in impact.get('yellow', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    doc.add_heading('Green Zones (Low Impact)', level=2)
+    for item in impact.get('green', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    # Entry & Exit Criteria
+    doc.add_heading('Entry & Exit Criteria', level=1)
+    
+    doc.add_heading('Entry Criteria', level=2)
+    for item in test_plan.get('entry_criteria', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    doc.add_heading('Exit Criteria', level=2)
+    for item in test_plan.get('exit_criteria', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    # Test Data Requirements
+    doc.add_heading('Test Data Requirements', level=1)
+    for item in test_plan.get('test_data_requirements', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    # Test Environment
+    doc.add_heading('Test Environment', level=1)
+    env_table = doc.add_table(rows=1, cols=2)
+    env_table.style = 'Light Grid Accent 1'
+    
+    hdr_cells = env_table.rows[0].cells
+    hdr_cells[0].text = 'Environment'
+    hdr_cells[1].text = 'Purpose'
+    
+    for env in test_plan.get('test_environment', []):
+        row_cells = env_table.add_row().cells
+        row_cells[0].text = env.get('name', '')
+        row_cells[1].text = env.get('purpose', '')
+    
+    doc.add_paragraph()
+    
+    # Testing Activities
+    doc.add_heading('Testing Activities', level=1)
+    act_table = doc.add_table(rows=1, cols=3)
+    act_table.style = 'Light Grid Accent 1'
+    
+    hdr_cells = act_table.rows[0].cells
+    hdr_cells[0].text = 'Activity'
+    hdr_cells[1].text = 'Details'
+    hdr_cells[2].text = 'Duration'
+    
+    for activity in test_plan.get('testing_activities', []):
+        row_cells = act_table.add_row().cells
+        row_cells[0].text = activity.get('activity', '')
+        row_cells[1].text = activity.get('details', '')
+        row_cells[2].text = activity.get('duration', '')
+    
+    doc.add_paragraph()
+    
+    # Roles & Responsibilities
+    doc.add_heading('Roles & Responsibilities', level=1)
+    role_table = doc.add_table(rows=1, cols=3)
+    role_table.style = 'Light Grid Accent 1'
+    
+    hdr_cells = role_table.rows[0].cells
+    hdr_cells[0].text = 'Role'
+    hdr_cells[1].text = 'Name'
+    hdr_cells[2].text = 'Responsibilities'
+    
+    for role in test_plan.get('roles_responsibilities', []):
+        row_cells = role_table.add_row().cells
+        row_cells[0].text = role.get('role', '')
+        row_cells[1].text = role.get('name', '')
+        row_cells[2].text = role.get('responsibilities', '')
+    
+    doc.add_paragraph()
+    
+    # Risks
+    doc.add_heading('Risks', level=1)
+    for risk in test_plan.get('risks', []):
+        doc.add_paragraph(risk, style='List Bullet')
+    
+    # Assumptions & Dependencies
+    doc.add_heading('Assumptions & Dependencies', level=1)
+    
+    doc.add_heading('Assumptions', level=2)
+    for item in test_plan.get('assumptions', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    doc.add_heading('Dependencies', level=2)
+    for item in test_plan.get('dependencies', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    # Defect Management
+    doc.add_heading('Defect Management Process', level=1)
+    for item in test_plan.get('defect_management', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    # Test Metrics
+    doc.add_heading('Test Metrics & KPIs', level=1)
+    for metric in test_plan.get('test_metrics', []):
+        doc.add_paragraph(metric, style='List Bullet')
+    
+    # Deliverables
+    doc.add_heading('Deliverables', level=1)
+    for item in test_plan.get('deliverables', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    # Limitations
+    doc.add_heading('Limitations & Exclusions', level=1)
+    for item in test_plan.get('limitations', []):
+        doc.add_paragraph(item, style='List Bullet')
+    
+    # Approval Section
+    doc.add_heading('Approval', level=1)
+    approval_table = doc.add_table(rows=1, cols=3)
+    approval_table.style = 'Light Grid Accent 1'
+    
+    hdr_cells = approval_table.rows[0].cells
+    hdr_cells[0].text = 'Role'
+    hdr_cells[1].text = 'Name'
+    hdr_cells[2].text = 'Signature / Date'
+    
+    approval_roles = [
+        ('QA Lead', 'TBD', ''),
+        ('Product Manager', 'TBD', '')
+    ]
+    
+    for role_data in approval_roles:
+        row_cells = approval_table.add_row().cells
+        row_cells[0].text = role_data[0]
+        row_cells[1].text = role_data[1]
+        row_cells[2].text = role_data[2]
+    
+    # Save document
+    doc.save(output_path)
+
+
+def best_time(render, test_plan, repeat):
+    """Fastest of repeat renders into memory, in seconds"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(test_plan, io.BytesIO())
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    """Main function"""
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    fr_counts = [int(n) for n in options['frs'].split(',')] if 'frs' in options else DEFAULT_FR_COUNTS
+    repeat = int(options.get('repeat', DEFAULT_REPEAT))
+
+    print("="*60)
+    print("⏱️  Test Plan DOCX Rendering Benchmark")
+    print("="*60)
+    print(f"{'FRs':>6} {'python-docx':>14} {'template':>12} {'speedup':>9}")
+    for fr_count in fr_counts:
+        test_plan = synthetic_test_plan(fr_count)
+        classic = best_time(render_with_python_docx, test_plan, repeat)
+        template = best_time(render_test_plan, test_plan, repeat)
+        print(f"{fr_count:>6} {classic * 1000:>12.0f}ms {template * 1000:>10.0f}ms {classic / template:>8.1f}x")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Web UI Startup Benchmark
+Author: Created for QA Team
+Description: Measures how long the web UI takes to import in a fresh
+             interpreter, which heavy libraries that import pulls in, what
+             those libraries would add if they were imported eagerly, and how
+             long a first script run and a rerun take
+Usage: python3 benchmark_startup.py [--repeat=N] [--no-script-runs]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Configuration
+DEFAULT_REPEAT = 5
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web_ui_app.py')
+HEAVY_MODULES = ['anthropic', 'docx', 'openpyxl', 'pdfplumber']
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+print(json.dumps({{'seconds': seconds, 'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def cold_import(module, repeat):
+    """Fastest import of module across repeat fresh interpreters; returns (seconds, heavy modules it loaded)"""
+    best = None
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=os.path.dirname(APP_PATH), capture_output=True, text=True, check=True
+        ).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        if best is None or probe['seconds'] < best:
+            best = probe['seconds']
+        loaded = probe['loaded']
+    return best, loaded
+
+
+def script_runs(repeat):
+    """First run of the app script and the fastest of repeat reruns, as Streamlit executes them"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=60)
+    started = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - started
+
+    reruns = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        app.run()
+        reruns.append(time.perf_counter() - started)
+    return first, min(reruns)
+
+
+def main():
+    """Main function"""
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    repeat = int(options.get('repeat', DEFAULT_REPEAT))
+
+    print("="*60)
+    print("⏱️  Web UI Startup Benchmark")
+    print("="*60)
+
+    app_seconds, loaded = cold_import('web_ui_app', repeat)
+    print(f"Cold import (fresh interpreter, best of {repeat}):")
+    print(f"  {'web_ui_app':<12} {app_seconds * 1000:>8.0f}ms   heavy modules loaded: {', '.join(loaded) or 'none'}")
+
+    deferred = 0.0
+    for module in HEAVY_MODULES:
+        if module in loaded:
+            continue
+        seconds, _ = cold_import(module, repeat)
+        deferred += seconds
+        print(f"  {module:<12} {seconds * 1000:>8.0f}ms   deferred to first use")
+    print(f"  Saved at startup: ~{deferred * 1000:.0f}ms")
+
+    if '--no-script-runs' not in sys.argv:
+        first, rerun = script_runs(repeat)
+        print(f"\nScript runs (streamlit AppTest):")
+        print(f"  first run    {first * 1000:>8.0f}ms")
+        print(f"  rerun        {rerun * 1000:>8.0f}ms   (best of {repeat})")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Claude Client Factory
+Author: Created for QA Team
+Description: Builds the Anthropic clients used by the generators. The wrapped
+             messages resource serves repeated requests from the response
+             cache, retries transient API errors with jittered backoff and
+             tracks token usage, including prompt-cache savings.
+"""
+
+import asyncio
+import copy
+import itertools
+import random
+import threading
+import time
+
+from anthropic import Anthropic, AsyncAnthropic, APIConnectionError, APIStatusError, BadRequestError
+from anthropic.types import Message
+
+from response_cache import get_response_cache
+from response_parsing import JsonArrayStreamParser
+
+# Configuration
+PROMPT_CACHE_MIN_CHARS = 4096   # About 1024 tokens, the smallest prefix Claude will cache
+CACHE_READ_PRICE = 0.1          # Cache reads are billed at 10% of the base input price
+CACHE_WRITE_PRICE = 1.25        # Cache writes are billed at 125% of the base input price
+RETRY_ATTEMPTS = 5              # Tries per request, including the first
+RETRY_BASE_DELAY = 1.0          # Seconds; doubles per attempt before jitter
+RETRY_MAX_DELAY = 30.0
+RETRY_BUDGET = 20               # Retries per client across all requests, so an outage fails fast
+MAX_CONTINUATIONS = 3           # Follow-up requests for a response cut off at max_tokens
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+def requirements_messages(requirements_text, instructions):
+    """
+    Build the user message with the requirements document as a cacheable
+    prefix, followed by the call-specific instructions. Plan and case calls
+    share the same prefix, so the second call and later regenerations read
+    the requirements from Claude's prompt cache instead of reprocessing them.
+    """
+    requirements_block = {"type": "text", "text": f"REQUIREMENTS DOCUMENT:\n{requirements_text}"}
+    if len(requirements_text) >= PROMPT_CACHE_MIN_CHARS:
+        requirements_block["cache_control"] = {"type": "ephemeral"}
+    return [
+        {"role": "user", "content": [requirements_block, {"type": "text", "text": instructions}]}
+    ]
+
+
+def is_transient(error):
+    """True for API errors worth retrying: timeouts, dropped connections, rate limits and overload"""
+    if isinstance(error, APIConnectionError):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in RETRYABLE_STATUS_CODES
+
+
+def _retry_after(error):
+    """Seconds the API asked us to wait, if it sent a retry-after header"""
+    response = getattr(error, 'response', None)
+    try:
+        return float(response.headers.get('retry-after'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff with a retry budget shared by every request of one client"""
+
+    def __init__(self, attempts=RETRY_ATTEMPTS, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY, budget=RETRY_BUDGET):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def should_retry(self, error, attempt):
+        """Take one retry from the budget if error is transient and attempt was not the last"""
+        if attempt + 1 >= self.attempts or not is_transient(error):
+            return False
+        with self._lock:
+            if self.retries >= self.budget:
+                return False
+            self.retries += 1
+        return True
+
+    def delay(self, error, attempt):
+        """Seconds to wait before the next attempt ("full jitter" backoff unless the API said otherwise)"""
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+def _announce_retry(error, delay):
+    print(f"⏳ Claude API error ({error.__class__.__name__}), retrying in {delay:.1f}s...")
+
+
+def _message_text(message):
+    """Concatenated text blocks of a response"""
+    return "".join(block.text for block in message.content if block.type == 'text')
+
+
+def continuation_request(request, partial_text):
+    """
+    Request that makes Claude carry on exactly where partial_text stops, by
+    sending it back as the start of the assistant turn.
+    """
+    partial_text = partial_text.rstrip()   # The API rejects prefills ending in whitespace
+    if not partial_text:
+        return request
+    request = dict(request)
+    request['messages'] = list(request['messages']) + [{"role": "assistant", "content": partial_text}]
+    return request
+
+
+def _is_complete(message):
+    """Only finished responses are worth replaying; truncated ones must be regenerated"""
+    return message.stop_reason in ('end_turn', 'stop_sequence')
+
+
+class UsageTracker:
+    """Thread-safe token and latency totals for one client"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.response_cache_hits = 0
+        self.retries = 0
+        self.input_tokens = 0
+        self.cache_creation_input_tokens = 0
+        self.cache_read_input_tokens = 0
+        self.output_tokens = 0
+        self.api_seconds = 0.0
+
+    def record(self, message, seconds):
+        """Add the usage of one API response"""
+        usage = message.usage
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += usage.input_tokens or 0
+            self.cache_creation_input_tokens += getattr(usage, 'cache_creation_input_tokens', None) or 0
+            self.cache_read_input_tokens += getattr(usage, 'cache_read_input_tokens', None) or 0
+            self.output_tokens += usage.output_tokens or 0
+            self.api_seconds += seconds
+
+    def record_response_cache_hit(self):
+        """Count a request answered from the response cache without calling the API"""
+        with self._lock:
+            self.response_cache_hits += 1
+
+    def record_retry(self):
+        """Count a request retried after a transient error"""
+        with self._lock:
+            self.retries += 1
+
+    def summary(self):
+        """Totals plus the input tokens saved by prompt caching, in base-price token equivalents"""
+        total_input = self.input_tokens + self.cache_creation_input_tokens + self.cache_read_input_tokens
+        saved = (self.cache_read_input_tokens * (1 - CACHE_READ_PRICE)
+                 - self.cache_creation_input_tokens * (CACHE_WRITE_PRICE - 1))
+        return {
+            'calls': self.calls,
+            'response_cache_hits': self.response_cache_hits,
+            'retries': self.retries,
+            'input_tokens': total_input,
+            'cache_read_input_tokens': self.cache_read_input_tokens,
+            'cache_creation_input_tokens': self.cache_creation_input_tokens,
+            'output_tokens': self.output_tokens,
+            'saved_input_tokens': saved,
+            'saved_percent': 100 * saved / total_input if total_input else 0.0,
+            'api_seconds': self.api_seconds,
+        }
+
+
+class _ReplayStream:
+    """Stands in for a MessageStream when the response comes from the cache"""
+
+    def __init__(self, message):
+        self._message = message
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    @property
+    def text_stream(self):
+        for block in self._message.content:
+            if block.type == 'text':
+                yield block.text
+
+    def get_final_message(self):
+        return self._message
+
+
+class _RecordingStream:
+    """
+    Opens a MessageStreamManager, retrying transient errors until the stream
+    starts; records usage and caches the final message once it completes.
+    """
+
+    def __init__(self, open_stream, cache, request, usage, retry):
+        self._open_stream = open_stream
+        self._cache = cache
+        self._request = request
+        self._usage = usage
+        self._retry = retry
+        self._manager = None
+        self._stream = None
+        self._started = None
+
+    def __enter__(self):
+        for attempt in itertools.count():
+            self._started = time.perf_counter()
+            self._manager = self._open_stream()
+            try:
+                self._stream = self._manager.__enter__()
+                return self
+            except Exception as e:
+                if not self._retry.should_retry(e, attempt):
+                    raise
+                delay = self._retry.delay(e, attempt)
+                self._usage.record_retry()
+                _announce_retry(e, delay)
+                time.sleep(delay)
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                message = self._stream.get_final_message()
+                self._usage.record(message, time.perf_counter() - self._started)
+                if self._cache and _is_complete(message):
+                    self._cache.put(self._request, message.model_dump_json())
+        finally:
+            suppress = self._manager.__exit__(exc_type, exc, tb)
+        return suppress
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class MessagesProxy:
+    """
+    messages resource that serves identical requests from the response cache,
+    retries transient errors and records usage
+    """
+
+    def __init__(self, messages, cache, usage, retry):
+        self._messages = messages
+        self._cache = cache
+        self._usage = usage
+        self._retry = retry
+
+    def _cached(self, request):
+        """Return the cached Message for request, if any"""
+        cached = self._cache.get(request) if self._cache else None
+        if not cached:
+            return None
+        self._usage.record_response_cache_hit()
+        return Message.model_validate_json(cached)
+
+    def _store(self, request, message, started):
+        """Record usage and cache a complete response"""
+        self._usage.record(message, time.perf_counter() - started)
+        if self._cache and _is_complete(message):
+            self._cache.put(request, message.model_dump_json())
+
+    def _backoff(self, error, attempt):
+        """Seconds to wait before retrying error, or None if it should be raised"""
+        if not self._retry.should_retry(error, attempt):
+            return None
+        delay = self._retry.delay(error, attempt)
+        self._usage.record_retry()
+        _announce_retry(error, delay)
+        return delay
+
+    def create(self, **request):
+        message = self._cached(request)
+        if message:
+            return message
+        for attempt in itertools.count():
+            started = time.perf_counter()
+            try:
+                message = self._messages.create(**request)
+                break
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+        self._store(request, message, started)
+        return message
+
+    def stream(self, **request):
+        message = self._cached(request)
+        if message:
+            return _ReplayStream(message)
+        return _RecordingStream(lambda: self._messages.stream(**request), self._cache, request,
+                                self._usage, self._retry)
+
+    def __getattr__(self, name):
+        return getattr(self._messages, name)
+
+
+class AsyncMessagesProxy(MessagesProxy):
+    """
+    Async variant of MessagesProxy; streams are passed through untracked.
+    before_request, if set, is awaited before every API request, retries and
+    continuations included (e.g. a rate limiter's acquire)
+    """
+
+    before_request = None
+
+    async def create(self, **request):
+        message = self._cached(request)
+        if message:
+            return message
+        for attempt in itertools.count():
+            if self.before_request:
+                await self.before_request()
+            started = time.perf_counter()
+            try:
+                message = await self._messages.create(**request)
+                break
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+        self._store(request, message, started)
+        return message
+
+    def stream(self, **request):
+        return self._messages.stream(**request)
+
+
+class ClaudeClient:
+    """Anthropic client proxy with response caching, retries and usage tracking on its messages resource"""
+
+    def __init__(self, client, cache=None, messages_class=MessagesProxy, retry=None):
+        self.raw = client
+        self.cache = cache
+        self.usage = UsageTracker()
+        self.retry = retry or RetryPolicy()
+        self.messages = messages_class(client.messages, cache, self.usage, self.retry)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+def create_anthropic_client(api_key):
+    """Plain Anthropic client; retries are left to ClaudeClient so they share one budget and backoff policy"""
+    return Anthropic(api_key=api_key, max_retries=0)
+
+
+def create_client(api_key, use_response_cache=True, shared_client=None):
+    """
+    Anthropic client, served from the response cache unless disabled.
+    shared_client (from create_anthropic_client) reuses a long-lived
+    connection pool; usage and the retry budget are still per call site.
+    """
+    cache = get_response_cache() if use_response_cache else None
+    return ClaudeClient(shared_client or create_anthropic_client(api_key), cache)
+
+
+def create_async_client(api_key, use_response_cache=True):
+    """AsyncAnthropic client, served from the response cache unless disabled"""
+    cache = get_response_cache() if use_response_cache else None
+    return ClaudeClient(AsyncAnthropic(api_key=api_key, max_retries=0), cache, AsyncMessagesProxy)
+
+
+def create_complete(client, request, max_continuations=MAX_CONTINUATIONS):
+    """
+    Send request and, while the response stops at max_tokens, ask Claude to
+    continue from where it stopped instead of regenerating from scratch.
+    Returns the joined text and the list of responses; the last response's
+    stop_reason is still 'max_tokens' if the continuations ran out.
+    """
+    responses = [client.messages.create(**request)]
+    text = _message_text(responses[0])
+    while responses[-1].stop_reason == 'max_tokens' and len(responses) <= max_continuations:
+        print(f"⏩ Response truncated after {len(text)} characters, requesting a continuation...")
+        text = text.rstrip()
+        try:
+            responses.append(client.messages.create(**continuation_request(request, text)))
+        except BadRequestError as e:
+            print(f"⚠️  Continuation rejected: {e}")
+            break
+        text += _message_text(responses[-1])
+    return text, responses
+
+
+async def create_complete_async(client, request, max_continuations=MAX_CONTINUATIONS):
+    """Async variant of create_complete"""
+    responses = [await client.messages.create(**request)]
+    text = _message_text(responses[0])
+    while responses[-1].stop_reason == 'max_tokens' and len(responses) <= max_continuations:
+        print(f"⏩ Response truncated after {len(text)} characters, requesting a continuation...")
+        text = text.rstrip()
+        try:
+            responses.append(await client.messages.create(**continuation_request(request, text)))
+        except BadRequestError as e:
+            print(f"⚠️  Continuation rejected: {e}")
+            break
+        text += _message_text(responses[-1])
+    return text, responses
+
+
+def stream_json_array(client, request, max_continuations=MAX_CONTINUATIONS):
+    """
+    Stream a JSON array response, yielding each element as soon as it is
+    complete. A stream cut off at max_tokens, or dropped by a transient error,
+    is resumed from the text received so far rather than restarted.
+    """
+    parser = JsonArrayStreamParser()
+    text = ""
+    current = request
+    for resume in itertools.count():
+        try:
+            with client.messages.stream(**current) as stream:
+                for chunk in stream.text_stream:
+                    text += chunk
+                    yield from parser.feed(chunk)
+                    if parser.finished:
+                        break
+                message = stream.get_final_message()
+        except Exception as e:
+            if resume >= max_continuations or not client.retry.should_retry(e, resume):
+                raise
+            delay = client.retry.delay(e, resume)
+            client.usage.record_retry()
+            _announce_retry(e, delay)
+            time.sleep(delay)
+        else:
+            if parser.finished or message.stop_reason != 'max_tokens' or resume >= max_continuations:
+                break
+            print(f"⏩ Stream truncated after {len(text)} characters, requesting a continuation...")
+        text = text.rstrip()
+        current = continuation_request(request, text)
+
+    if parser.error:
+        raise parser.error
+
+
+def _priming_request(client, requests):
+    """
+    Build a 1-token request that writes the shared requirements prefix to
+    Claude's prompt cache, or None when priming would not pay off: fewer than
+    two requests will reach the API, or the prefix is too short to cache.
+    """
+    requests = [request for request in requests if not (client.cache and client.cache.contains(request))]
+    if len(requests) < 2:
+        return None
+
+    request = copy.deepcopy(requests[0])
+    content = request['messages'][0]['content']
+    if 'cache_control' not in content[0]:
+        return None
+    request['messages'][0]['content'] = [content[0], {"type": "text", "text": "Reply with OK."}]
+    request['max_tokens'] = 1
+    return request
+
+
+def prime_prompt_cache(client, requests):
+    """
+    Write the shared requirements prefix to Claude's prompt cache before
+    requests that will run concurrently, so all of them read it instead of
+    each paying to process it.
+    """
+    request = _priming_request(client, requests)
+    if request:
+        started = time.perf_counter()
+        # Bypass the response cache: the point is to reach the API
+        message = client.raw.messages.create(**request)
+        client.usage.record(message, time.perf_counter() - started)
+
+
+async def prime_prompt_cache_async(client, requests):
+    """Async variant of prime_prompt_cache"""
+    request = _priming_request(client, requests)
+    if request:
+        started = time.perf_counter()
+        message = await client.raw.messages.create(**request)
+        client.usage.record(message, time.perf_counter() - started)
+
+
+def describe_cache_stats(cache=None):
+    """One-line hit/miss summary for the response cache"""
+    stats = (cache or get_response_cache()).stats()
+    return (f"♻️  Response cache: {stats['hits']} hits, {stats['misses']} misses this run "
+            f"({stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB)")
+
+
+def describe_usage(client):
+    """One-line token usage summary, including prompt-cache savings"""
+    usage = client.usage.summary()
+    return (f"📈 Claude usage: {usage['calls']} calls, {usage['input_tokens']} input tokens "
+            f"({usage['cache_read_input_tokens']} read from prompt cache, "
+            f"{usage['cache_creation_input_tokens']} written), {usage['output_tokens']} output tokens, "
+            f"~{usage['saved_input_tokens']:.0f} input tokens saved ({usage['saved_percent']:.0f}%), "
+            f"{usage['api_seconds']:.1f}s API time, {usage['retries']} retries")
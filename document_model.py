@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+QA Document Model
+Author: Created for QA Team
+Description: Typed test plan and test case objects shared by the CLI, batch
+             runner and web UI. from_dict() accepts both the CLI and the web
+             UI JSON layouts (metrics vs test_metrics, roles vs
+             roles_responsibilities, project_info, nested scope, ...), so
+             every entry point renders through the same code.
+"""
+
+from datetime import datetime
+
+STRATEGY_LABELS = {
+    'functional': 'Functional',
+    'integration': 'Integration',
+    'ui_ux': 'UI/UX',
+    'performance': 'Performance',
+    'security': 'Security',
+    'cross_platform': 'Cross-Platform',
+    'regression': 'Regression',
+}
+
+
+def _text(value, default=''):
+    """Value as display text; lists become one item per line"""
+    if value is None:
+        return default
+    if isinstance(value, list):
+        return "\n".join(_text(item) for item in value)
+    if isinstance(value, dict):
+        return "; ".join(f"{key}: {_text(item)}" for key, item in value.items())
+    return str(value)
+
+
+def _text_list(value):
+    """Value as a list of display strings (a single string becomes one item)"""
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    return [_text(item) for item in value if item not in (None, '')]
+
+
+def _labelled(value, labels=None):
+    """A {key: text} mapping (web layout) or list of strings (CLI layout) as a list of strings"""
+    if isinstance(value, dict):
+        return [f"{(labels or {}).get(key, key.replace('_', ' ').title())}: {_text(text)}"
+                for key, text in value.items()]
+    return _text_list(value)
+
+
+class FunctionalRequirement:
+    """One functional requirement with its acceptance criteria"""
+    __slots__ = ('id', 'title', 'description', 'acceptance_criteria')
+
+    def __init__(self, id='', title='', description='', acceptance_criteria=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.acceptance_criteria = acceptance_criteria or []
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            return cls(title=_text(data))
+        description = _text(data.get('description'))
+        req_id = _text(data.get('id') or data.get('req_id'))
+        title = _text(data.get('title')) or (description[:60] + ('...' if len(description) > 60 else ''))
+        return cls(req_id, title or req_id or 'Requirement', description,
+                   _text_list(data.get('acceptance_criteria')))
+
+    def to_dict(self):
+        return {'id': self.id, 'title': self.title, 'description': self.description,
+                'acceptance_criteria': list(self.acceptance_criteria)}
+
+
+class Environment:
+    """A test environment and what it is used for"""
+    __slots__ = ('name', 'purpose')
+
+    def __init__(self, name='', purpose=''):
+        self.name = name
+        self.purpose = purpose
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, dict):
+            return cls(_text(data.get('name')), _text(data.get('purpose')))
+        return cls(_text(data))
+
+    def to_dict(self):
+        return {'name': self.name, 'purpose': self.purpose}
+
+
+class Activity:
+    """A testing activity (the web layout's phase/activity/timeline maps to activity/details/duration)"""
+    __slots__ = ('activity', 'details', 'duration')
+
+    def __init__(self, activity='', details='', duration=''):
+        self.activity = activity
+        self.details = details
+        self.duration = duration
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            return cls(_text(data))
+        if 'phase' in data:
+            return cls(_text(data.get('phase')), _text(data.get('activity')), _text(data.get('timeline')))
+        return cls(_text(data.get('activity')), _text(data.get('details')), _text(data.get('duration')))
+
+    def to_dict(self):
+        return {'activity': self.activity, 'details': self.details, 'duration': self.duration}
+
+
+class Role:
+    """A team role, who fills it and what they are responsible for"""
+    __slots__ = ('role', 'name', 'responsibilities')
+
+    def __init__(self, role='', name='TBD', responsibilities=''):
+        self.role = role
+        self.name = name
+        self.responsibilities = responsibilities
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            return cls(_text(data))
+        return cls(_text(data.get('role')), _text(data.get('name'), 'TBD'),
+                   _text(data.get('responsibilities') or data.get('responsibility')))
+
+    def to_dict(self):
+        return {'role': self.role, 'name': self.name, 'responsibilities': self.responsibilities}
+
+
+class Risk:
+    """A risk and, if given, its mitigation"""
+    __slots__ = ('risk', 'mitigation')
+
+    def __init__(self, risk='', mitigation=''):
+        self.risk = risk
+        self.mitigation = mitigation
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, dict):
+            return cls(_text(data.get('risk') or data.get('description')), _text(data.get('mitigation')))
+        return cls(_text(data))
+
+    def to_dict(self):
+        return {'risk': self.risk, 'mitigation': self.mitigation}
+
+
+class TestPlan:
+    """A complete test plan, normalised from either JSON layout"""
+    __slots__ = (
+        'project_name', 'version', 'prepared_by', 'date', 'description', 'introduction', 'goal',
+        'test_strategy', 'in_scope', 'out_of_scope', 'functional_requirements',
+        'non_functional_requirements', 'impact_zones', 'entry_criteria', 'exit_criteria', 'test_data',
+        'test_environment', 'testing_activities', 'roles', 'risks', 'assumptions', 'dependencies',
+        'defect_management', 'metrics', 'deliverables', 'limitations',
+    )
+
+    def __init__(self, **sections):
+        for name in self.__slots__:
+            setattr(self, name, sections.get(name))
+
+    @classmethod
+    def from_dict(cls, data, project_name="Project"):
+        """Build a TestPlan from Claude's JSON in the CLI or web UI layout"""
+        info = data.get('project_info') or {}
+        scope = data.get('scope') or {}
+        impact = data.get('impact_zones') or {}
+        environments = data.get('test_environment') or info.get('test_environment') or []
+
+        def first(*keys, source=data):
+            for key in keys:
+                if source.get(key) not in (None, '', [], {}):
+                    return source[key]
+            return None
+
+        return cls(
+            project_name=_text(first('project_name') or info.get('name'), project_name),
+            version=_text(first('version') or info.get('version'), '1.0'),
+            prepared_by=_text(info.get('prepared_by'), 'QA Team'),
+            date=_text(info.get('date'), datetime.now().strftime('%Y-%m-%d')),
+            description=_text(data.get('description'), 'N/A'),
+            introduction=_text(data.get('introduction'), 'N/A'),
+            goal=_text(data.get('goal'), 'N/A'),
+            test_strategy=_labelled(data.get('test_strategy'), STRATEGY_LABELS),
+            in_scope=_text_list(first('in_scope') or scope.get('in_scope')),
+            out_of_scope=_text_list(first('out_of_scope') or scope.get('out_of_scope')),
+            functional_requirements=[FunctionalRequirement.from_dict(req)
+                                     for req in data.get('functional_requirements') or []],
+            non_functional_requirements=[
+                f"{_text(nfr.get('category'))}: {_text(nfr.get('requirement'))}" if isinstance(nfr, dict) else _text(nfr)
+                for nfr in data.get('non_functional_requirements') or []
+            ],
+            impact_zones={zone: _text_list(impact.get(zone)) for zone in ('red', 'yellow', 'green')},
+            entry_criteria=_text_list(data.get('entry_criteria')),
+            exit_criteria=_text_list(data.get('exit_criteria')),
+            test_data=_text_list(first('test_data_requirements', 'test_data')),
+            test_environment=[Environment.from_dict(env) for env in environments],
+            testing_activities=[Activity.from_dict(a) for a in data.get('testing_activities') or []],
+            roles=[Role.from_dict(r) for r in first('roles_responsibilities', 'roles') or []],
+            risks=[Risk.from_dict(r) for r in data.get('risks') or []],
+            assumptions=_text_list(data.get('assumptions')),
+            dependencies=_text_list(data.get('dependencies')),
+            defect_management=_labelled(data.get('defect_management'),
+                                        {f'p{n}': f'P{n}' for n in range(1, 5)}),
+            metrics=_text_list(first('test_metrics', 'metrics')),
+            deliverables=_text_list(data.get('deliverables')),
+            limitations=_text_list(data.get('limitations')),
+        )
+
+    def to_dict(self):
+        """Canonical JSON layout (the CLI one)"""
+        data = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, list):
+                value = [item.to_dict() if hasattr(item, 'to_dict') else item for item in value]
+            data[name] = value
+        data['test_data_requirements'] = data.pop('test_data')
+        data['roles_responsibilities'] = data.pop('roles')
+        data['test_metrics'] = data.pop('metrics')
+        return data
+
+
+class TestCase:
+    """One test case row"""
+    __slots__ = ('id', 'module', 'title', 'description', 'preconditions', 'steps', 'expected',
+                 'priority', 'type', 'platform')
+
+    DEFAULTS = {'priority': 'P2', 'type': 'Functional', 'platform': 'Both'}
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name) or self.DEFAULTS.get(name, ''))
+
+    @classmethod
+    def from_dict(cls, data, number=1):
+        """Build a TestCase from a JSON object; a missing ID becomes TC_<number>"""
+        if isinstance(data, cls):
+            return data
+        fields = {name: _text(data.get(name)) for name in cls.__slots__}
+        fields['id'] = fields['id'] or f"TC_{number:03d}"
+        return cls(**fields)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Document Rendering
+Author: Created for QA Team
+Description: The one place test plans and test cases are rendered, for the CLI,
+             batch runner and web UI alike.
+             Test plans go into a pre-styled .docx template: fonts, table
+             styles and borders live in the template, and the body is built as
+             WordprocessingML text inserted with a single XML parse instead of
+             one python-docx call (and style lookup) per paragraph and cell.
+             Test cases go through an openpyxl write-only worksheet with shared
+             named styles, so memory stays flat for any number of rows and
+             they can come straight from a generator.
+"""
+
+import os
+import re
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Pt
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from document_model import TestCase, TestPlan
+
+# Configuration
+TEMPLATE_PATH = os.getenv(
+    'QA_DOCS_PLAN_TEMPLATE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates', 'test_plan_template.docx')
+)
+BODY_PLACEHOLDER = '{{TEST_PLAN_BODY}}'
+TABLE_STYLE = 'Light Grid Accent 1'
+
+# (header, TestCase attribute, column width)
+TEST_CASE_COLUMNS = [
+    ('Test Case ID', 'id', 15),
+    ('Module', 'module', 25),
+    ('Test Case Title', 'title', 35),
+    ('Description', 'description', 40),
+    ('Pre-conditions', 'preconditions', 30),
+    ('Test Steps', 'steps', 50),
+    ('Expected Results', 'expected', 50),
+    ('Priority', 'priority', 10),
+    ('Test Type', 'type', 15),
+    ('Platform', 'platform', 12),
+]
+HEADER_STYLE = 'Test Case Header'
+CELL_STYLE = 'Test Case Cell'
+GAP_STYLE = 'Coverage Gap Cell'
+# (header, column width) of the traceability sheet, one row per functional requirement
+TRACEABILITY_COLUMNS = [
+    ('Requirement ID', 15),
+    ('Requirement', 45),
+    ('Test Cases', 60),
+    ('Count', 8),
+    ('Status', 14),
+]
+
+# Characters XML 1.0 cannot carry; Claude output occasionally contains them
+INVALID_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def create_template(path=TEMPLATE_PATH):
+    """
+    Write a starter template: python-docx's default styles with Arial 11 body
+    text and the body placeholder. Restyle it in Word to change every plan.
+    """
+    doc = Document()
+    font = doc.styles['Normal'].font
+    font.name = 'Arial'
+    font.size = Pt(11)
+    doc.add_paragraph(BODY_PLACEHOLDER)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    doc.save(path)
+    return path
+
+
+def load_template(path=TEMPLATE_PATH):
+    """Open the template, or python-docx's default document if there is none"""
+    if path and os.path.exists(path):
+        return Document(path)
+    doc = Document()
+    font = doc.styles['Normal'].font
+    font.name = 'Arial'
+    font.size = Pt(11)
+    return doc
+
+
+def _runs(text, bold=False, size=None, color=None):
+    """Run XML for text; newlines and tabs become breaks and tabs as python-docx does"""
+    text = INVALID_XML_CHARS.sub('', str(text))
+    properties = ''
+    if bold:
+        properties += '<w:b/>'
+    if color:
+        properties += f'<w:color w:val="{color}"/>'
+    if size:
+        properties += f'<w:sz w:val="{size * 2}"/>'
+    run_start = f'<w:r><w:rPr>{properties}</w:rPr>' if properties else '<w:r>'
+
+    content = []
+    for line_number, line in enumerate(text.split('\n')):
+        if line_number:
+            content.append('<w:br/>')
+        for part_number, part in enumerate(line.split('\t')):
+            if part_number:
+                content.append('<w:tab/>')
+            if part:
+                content.append(f'<w:t xml:space="preserve">{escape(part)}</w:t>')
+    return f"{run_start}{''.join(content)}</w:r>"
+
+
+class DocxBuilder:
+    """Collects body blocks as WordprocessingML strings and inserts them into a document in bulk"""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self._parts = []
+        self._style_ids = {}
+        section = doc.sections[0]
+        # Text width in twips (1 twip = 635 EMU), split evenly between table columns as python-docx does
+        self._text_width = (section.page_width - section.left_margin - section.right_margin) // 635
+
+    def _style_id(self, name):
+        """Resolve a style name to its id once per document"""
+        if name not in self._style_ids:
+            self._style_ids[name] = self.doc.styles[name].style_id
+        return self._style_ids[name]
+
+    def _paragraph_xml(self, text, style=None, center=False, **run_format):
+        properties = ''
+        if style:
+            properties += f'<w:pStyle w:val="{self._style_id(style)}"/>'
+        if center:
+            properties += '<w:jc w:val="center"/>'
+        properties = f'<w:pPr>{properties}</w:pPr>' if properties else ''
+        runs = _runs(text, **run_format) if text not in (None, '') else ''
+        return f'<w:p>{properties}{runs}</w:p>'
+
+    def paragraph(self, text='', style=None, center=False, bold=False, size=None, color=None):
+        self._parts.append(self._paragraph_xml(text, style, center, bold=bold, size=size, color=color))
+
+    def heading(self, text, level=1, center=False):
+        self.paragraph(text, 'Title' if level == 0 else f'Heading {level}', center)
+
+    def bullets(self, items, style='List Bullet'):
+        self._parts.extend(self._paragraph_xml(item, style) for item in items)
+
+    def table(self, rows, header=None, bold_first_column=False, style=TABLE_STYLE):
+        """Add a table; rows are sequences of cell values, header an optional first row"""
+        rows = ([header] if header else []) + [list(row) for row in rows]
+        if not rows:
+            return
+        columns = len(rows[0])
+        width = self._text_width // columns
+        grid = ''.join(f'<w:gridCol w:w="{width}"/>' for _ in range(columns))
+        cell_start = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>'
+
+        xml = [
+            f'<w:tbl><w:tblPr><w:tblStyle w:val="{self._style_id(style)}"/>'
+            '<w:tblW w:type="auto" w:w="0"/>'
+            '<w:tblLook w:val="04A0" w:firstRow="1" w:lastRow="0" w:firstColumn="1" '
+            'w:lastColumn="0" w:noHBand="0" w:noVBand="1"/></w:tblPr>'
+            f'<w:tblGrid>{grid}</w:tblGrid>'
+        ]
+        for row in rows:
+            xml.append('<w:tr>')
+            for col, value in enumerate(row):
+                bold = bold_first_column and col == 0
+                xml.append(f'{cell_start}{self._paragraph_xml(value, bold=bold)}</w:tc>')
+            xml.append('</w:tr>')
+        xml.append('</w:tbl>')
+        self._parts.append(''.join(xml))
+
+    def insert(self):
+        """
+        Parse all collected blocks at once and put them where the template's
+        placeholder paragraph is (or at the end of the body), then reset
+        """
+        fragment = parse_xml(f'<w:body {nsdecls("w")}>{"".join(self._parts)}</w:body>')
+        body = self.doc.element.body
+
+        anchor = None
+        for paragraph in self.doc.paragraphs:
+            if paragraph.text.strip() == BODY_PLACEHOLDER:
+                anchor = paragraph._p
+                break
+        if anchor is None:
+            anchor = body.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}sectPr')
+
+        for element in list(fragment):
+            if anchor is not None:
+                anchor.addprevious(element)
+            else:
+                body.append(element)
+        if anchor is not None and anchor.tag.endswith('}p'):
+            body.remove(anchor)
+        self._parts = []
+
+
+def render_test_plan(test_plan, output, template_path=TEMPLATE_PATH):
+    """
+    Render a TestPlan (or test plan JSON in either layout) to output, a path
+    or binary file object, from the template
+    """
+    plan = test_plan if isinstance(test_plan, TestPlan) else TestPlan.from_dict(test_plan)
+    doc = load_template(template_path)
+    b = DocxBuilder(doc)
+
+    b.heading(f"{plan.project_name} - QA Test Plan", level=0, center=True)
+    b.paragraph(f"Version {plan.version}", center=True, size=14, color='666666')
+    b.paragraph()
+
+    b.table([
+        ('Project Name', plan.project_name),
+        ('Document Status', 'DRAFT'),
+        ('Version', plan.version),
+        ('Prepared By', plan.prepared_by),
+        ('Date', plan.date),
+        ('Test Environment', ', '.join(env.name for env in plan.test_environment)),
+    ], bold_first_column=True)
+    b.paragraph()
+
+    for title, text in (('Description', plan.description), ('Introduction', plan.introduction),
+                        ('Goal', plan.goal)):
+        b.heading(title)
+        b.paragraph(text)
+
+    b.heading('Test Strategy')
+    b.bullets(plan.test_strategy)
+
+    b.heading('Test Scope')
+    b.heading('In-Scope', level=2)
+    b.bullets(plan.in_scope)
+    b.heading('Out-of-Scope', level=2)
+    b.bullets(plan.out_of_scope)
+
+    b.heading('Functional Requirements')
+    for idx, req in enumerate(plan.functional_requirements, 1):
+        b.heading(f"{idx}. {req.title}", level=2)
+        b.paragraph(req.description)
+        if req.acceptance_criteria:
+            b.paragraph('Acceptance Criteria:', 'List Bullet')
+            b.bullets(req.acceptance_criteria, 'List Bullet 2')
+
+    b.heading('Non-Functional Requirements')
+    b.bullets(plan.non_functional_requirements)
+
+    b.heading('Impacted Areas')
+    for title, zone in (('Red Zones (Critical)', 'red'), ('Yellow Zones (Medium Impact)', 'yellow'),
+                        ('Green Zones (Low Impact)', 'green')):
+        b.heading(title, level=2)
+        b.bullets(plan.impact_zones.get(zone, []))
+
+    b.heading('Entry & Exit Criteria')
+    b.heading('Entry Criteria', level=2)
+    b.bullets(plan.entry_criteria)
+    b.heading('Exit Criteria', level=2)
+    b.bullets(plan.exit_criteria)
+
+    b.heading('Test Data Requirements')
+    b.bullets(plan.test_data)
+
+    b.heading('Test Environment')
+    b.table([(env.name, env.purpose) for env in plan.test_environment], header=('Environment', 'Purpose'))
+    b.paragraph()
+
+    b.heading('Testing Activities')
+    b.table([(a.activity, a.details, a.duration) for a in plan.testing_activities],
+            header=('Activity', 'Details', 'Duration'))
+    b.paragraph()
+
+    b.heading('Roles & Responsibilities')
+    b.table([(r.role, r.name, r.responsibilities) for r in plan.roles],
+            header=('Role', 'Name', 'Responsibilities'))
+    b.paragraph()
+
+    b.heading('Risks')
+    for risk in plan.risks:
+        b.paragraph(risk.risk, 'List Bullet')
+        if risk.mitigation:
+            b.paragraph(f"Mitigation: {risk.mitigation}", 'List Bullet 2')
+
+    b.heading('Assumptions & Dependencies')
+    b.heading('Assumptions', level=2)
+    b.bullets(plan.assumptions)
+    b.heading('Dependencies', level=2)
+    b.bullets(plan.dependencies)
+
+    for title, items in (('Defect Management Process', plan.defect_management),
+                         ('Test Metrics & KPIs', plan.metrics),
+                         ('Deliverables', plan.deliverables),
+                         ('Limitations & Exclusions', plan.limitations)):
+        b.heading(title)
+        b.bullets(items)
+
+    b.heading('Approval')
+    b.table([('QA Lead', 'TBD', ''), ('Product Manager', 'TBD', '')],
+            header=('Role', 'Name', 'Signature / Date'))
+
+    b.insert()
+    doc.save(output)
+
+
+def _named_styles(borders):
+    """Header and body styles, registered once per workbook instead of built per cell"""
+    side = Side(style='thin') if borders else Side()
+    border = Border(left=side, right=side, top=side, bottom=side)
+    header = NamedStyle(
+        name=HEADER_STYLE,
+        font=Font(bold=True, color='FFFFFF', size=11),
+        fill=PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid'),
+        alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+        border=border,
+    )
+    cell = NamedStyle(
+        name=CELL_STYLE,
+        alignment=Alignment(wrap_text=True, vertical='top'),
+        border=border,
+    )
+    gap = NamedStyle(
+        name=GAP_STYLE,
+        fill=PatternFill(start_color='F8CBAD', end_color='F8CBAD', fill_type='solid'),
+        alignment=Alignment(wrap_text=True, vertical='top'),
+        border=border,
+    )
+    return header, cell, gap
+
+
+def _styled_row(sheet, values, style):
+    """Write-only cells carrying a named style"""
+    row = []
+    for value in values:
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.style = style
+        row.append(cell)
+    return row
+
+
+def _sheet(wb, title, widths):
+    """Write-only sheet with its column widths and header row frozen (set before the first row)"""
+    sheet = wb.create_sheet(title)
+    for col, width in enumerate(widths, 1):
+        sheet.column_dimensions[get_column_letter(col)].width = width
+    sheet.freeze_panes = 'A2'
+    return sheet
+
+
+def render_test_cases(test_cases, output, sheet_title="Test Cases", borders=True, traceability=None):
+    """
+    Write test cases (TestCase objects or JSON dicts, from any iterable
+    including a stream) to output, a path or binary file object. With a
+    traceability matrix, a second sheet lists each functional requirement's
+    test cases with uncovered requirements highlighted. Returns the number
+    of test cases written.
+    """
+    wb = Workbook(write_only=True)
+    for style in _named_styles(borders):
+        wb.add_named_style(style)
+
+    sheet = _sheet(wb, sheet_title, [width for _, _, width in TEST_CASE_COLUMNS])
+    sheet.append(_styled_row(sheet, [header for header, _, _ in TEST_CASE_COLUMNS], HEADER_STYLE))
+
+    total = 0
+    for total, tc in enumerate(test_cases, start=1):
+        tc = TestCase.from_dict(tc, total)
+        sheet.append(_styled_row(sheet, [getattr(tc, attribute) for _, attribute, _ in TEST_CASE_COLUMNS], CELL_STYLE))
+
+    if traceability:
+        sheet = _sheet(wb, "Traceability", [width for _, width in TRACEABILITY_COLUMNS])
+        sheet.append(_styled_row(sheet, [header for header, _ in TRACEABILITY_COLUMNS], HEADER_STYLE))
+        for requirement in traceability['requirements']:
+            case_ids = requirement['test_cases']
+            sheet.append(_styled_row(
+                sheet,
+                [requirement['id'], requirement['title'], ', '.join(case_ids), len(case_ids),
+                 'Covered' if case_ids else 'Not covered'],
+                CELL_STYLE if case_ids else GAP_STYLE
+            ))
+
+    wb.save(output)
+    return total
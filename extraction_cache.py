@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+PDF Extraction Cache
+Author: Created for QA Team
+Description: Content-addressed on-disk cache of per-page PDF text with
+             size-bounded LRU eviction
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+# Configuration
+CACHE_DIR = os.getenv(
+    'QA_DOCS_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'qa-docs-generator', 'extraction')
+)
+CACHE_MAX_BYTES = int(os.getenv('QA_DOCS_EXTRACTION_CACHE_MB', '256')) * 1024 * 1024
+
+
+def cache_key(pdf_bytes, extractor_version):
+    """SHA-256 of the PDF bytes, salted with the extractor version"""
+    digest = hashlib.sha256()
+    digest.update(f"extractor-v{extractor_version}\0".encode('utf-8'))
+    digest.update(pdf_bytes)
+    return digest.hexdigest()
+
+
+def _entry_path(key, cache_dir):
+    """Path of the cache entry for key"""
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+def load_pages(key, cache_dir=CACHE_DIR):
+    """Return the cached page texts for key, or None on a miss"""
+    path = _entry_path(key, cache_dir)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # Bump the modification time so eviction treats this entry as recently used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return entry.get('pages')
+
+
+def store_pages(key, pages, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """Write page texts for key atomically, then evict down to max_bytes"""
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    except OSError:
+        # A read-only or full cache directory must never break extraction
+        return
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'pages': pages}, f, ensure_ascii=False)
+        os.replace(tmp_path, _entry_path(key, cache_dir))
+    except (OSError, TypeError, ValueError):
+        # Same policy as above, but do not leave the half-written file behind
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return
+    evict(cache_dir, max_bytes)
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+    """Delete least recently used entries until the cache fits in max_bytes"""
+    entries = []
+    total = 0
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+    except OSError:
+        return
+
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
@@ -7,7 +7,107 @@ Usage: python3 generate_complete_qa_docs.py requirements.pdf "Project Name"
 
 import os
 import sys
+import json
+import time
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import generate_test_plan
+import generate_test_cases
+from claude_client import create_client, describe_cache_stats, describe_usage, prime_prompt_cache
+from token_budget import plan_test_cases
+
+# Configuration
+CLAUDE_API_KEY = os.getenv('ANTHROPIC_API_KEY')
+
+
+def run_generation_steps(pdf_path, project_name, generate_plan, generate_cases,
+                         use_cache=True, stream=False, chunked=False, use_response_cache=True, incremental=False,
+                         parallel_plan=False, fill_gaps=False):
+    """
+    Extract the PDF once and run test plan and test case generation concurrently
+    in this process, sharing the requirements text and one Anthropic client.
+    When both succeed, the test cases are traced to the plan's functional
+    requirements (and, with fill_gaps, generated for uncovered ones).
+    Returns the list of generated files.
+    """
+    print("\n" + "="*60)
+    print("STEP 1: Reading Requirements")
+    print("="*60)
+    requirements_text = generate_test_plan.read_pdf(pdf_path, use_cache=use_cache)
+    
+    if not CLAUDE_API_KEY:
+        print("❌ Error: ANTHROPIC_API_KEY environment variable not set!")
+        print("   Set it using: export ANTHROPIC_API_KEY='your-api-key'")
+        sys.exit(1)
+    
+    client = create_client(CLAUDE_API_KEY, use_response_cache)
+    output_name = project_name.replace(' ', '_')
+    
+    steps = []
+    if generate_plan:
+        steps.append(('Test Plan', generate_test_plan.build_test_plan,
+                      (requirements_text, project_name, output_name, client, parallel_plan)))
+    if generate_cases:
+        steps.append(('Test Cases', generate_test_cases.build_test_cases,
+                      (requirements_text, project_name, client, stream, chunked, incremental)))
+    if not steps:
+        return []
+    
+    print("\n" + "="*60)
+    print(f"STEP 2: Generating {' and '.join(name for name, _, _ in steps)}")
+    print("="*60)
+    
+    generated_files = []
+    json_outputs = {}
+    started = time.perf_counter()
+    
+    if generate_plan and generate_cases and not (chunked or incremental):
+        # Both calls start with the same requirements block; cache it once so they run concurrently on a warm prefix
+        try:
+            prime_prompt_cache(client, [
+                generate_test_plan.build_test_plan_request(requirements_text, project_name),
+                generate_test_cases.build_test_cases_request(
+                    requirements_text, plan_test_cases(requirements_text, stream)['case_range'], streaming=stream
+                ),
+            ])
+        except Exception as e:
+            print(f"⚠️  Prompt cache priming skipped: {e}")
+    
+    with ThreadPoolExecutor(max_workers=len(steps)) as pool:
+        futures = [(name, pool.submit(func, *func_args)) for name, func, func_args in steps]
+        
+        for name, future in futures:
+            try:
+                # The generators exit on fatal errors; keep the other step's output
+                document_file, json_outputs[name] = future.result()
+            except (Exception, SystemExit) as e:
+                print(f"\n❌ Error generating {name.lower()}: {e}")
+                continue
+            
+            if os.path.exists(document_file):
+                generated_files.append(document_file)
+                print(f"\n✅ {name} generated successfully!")
+    
+    if len(json_outputs) == 2:
+        print("\n" + "="*60)
+        print("STEP 3: Tracing Test Cases to Requirements")
+        print("="*60)
+        try:
+            with open(json_outputs['Test Plan'], 'r', encoding='utf-8') as f:
+                test_plan = json.load(f)
+            generated_files.append(generate_test_cases.trace_requirements(
+                requirements_text, project_name, test_plan, client, fill_gaps
+            ))
+        except (Exception, SystemExit) as e:
+            print(f"\n⚠️  Traceability skipped: {e}")
+    
+    print(f"\n⏱️  Generation took {time.perf_counter() - started:.1f}s")
+    print(describe_usage(client))
+    if use_response_cache:
+        print(describe_cache_stats())
+    return generated_files
+
 
 def main():
     print("="*60)
@@ -16,8 +116,11 @@ def main():
     print("="*60)
     
     # Check arguments
-    if len(sys.argv) < 2:
-        print("\n❌ Usage: python3 generate_complete_qa_docs.py <requirements.pdf> [project_name]")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    
+    if len(args) < 1:
+        print("\n❌ Usage: python3 generate_complete_qa_docs.py <requirements.pdf> [project_name] [--no-cache] [--no-response-cache] [--stream] [--chunked] [--incremental] [--parallel-plan] [--fill-gaps]")
         print("\nExample:")
         print("  python3 generate_complete_qa_docs.py requirements.pdf \"My Project\"")
         print("\nWhat this generates:")
@@ -26,8 +129,8 @@ def main():
         print("  ✅ Optional: Confluence upload")
         sys.exit(1)
     
-    pdf_path = sys.argv[1]
-    project_name = sys.argv[2] if len(sys.argv) > 2 else "Test Project"
+    pdf_path = args[0]
+    project_name = args[1] if len(args) > 1 else "Test Project"
     
     # Check if PDF exists
     if not os.path.exists(pdf_path):
@@ -60,56 +163,24 @@ def main():
     print("Starting generation...")
     print("="*60)
     
-    generated_files = []
-    
-    # Generate Test Plan
-    if choice in ['1', '3']:
-        print("\n" + "="*60)
-        print("STEP 1: Generating Test Plan")
-        print("="*60)
-        
-        try:
-            subprocess.run([
-                'python3',
-                'generate_test_plan.py',
-                pdf_path,
-                project_name
-            ], check=True)
-            
-            docx_file = f"{project_name.replace(' ', '_')}_Test_Plan.docx"
-            if os.path.exists(docx_file):
-                generated_files.append(docx_file)
-                print("\n✅ Test Plan generated successfully!")
-            
-        except subprocess.CalledProcessError as e:
-            print(f"\n❌ Error generating test plan: {e}")
-    
-    # Generate Test Cases
-    if choice in ['2', '3']:
-        print("\n" + "="*60)
-        print(f"STEP {'2' if choice == '3' else '1'}: Generating Test Cases")
-        print("="*60)
-        
-        try:
-            subprocess.run([
-                'python3',
-                'generate_test_cases.py',
-                pdf_path,
-                project_name
-            ], check=True)
-            
-            xlsx_file = f"{project_name.replace(' ', '_')}_Test_Cases.xlsx"
-            if os.path.exists(xlsx_file):
-                generated_files.append(xlsx_file)
-                print("\n✅ Test Cases generated successfully!")
-            
-        except subprocess.CalledProcessError as e:
-            print(f"\n❌ Error generating test cases: {e}")
+    generated_files = run_generation_steps(
+        pdf_path,
+        project_name,
+        generate_plan=choice in ['1', '3'],
+        generate_cases=choice in ['2', '3'],
+        use_cache='--no-cache' not in flags,
+        stream='--stream' in flags,
+        chunked='--chunked' in flags,
+        use_response_cache='--no-response-cache' not in flags,
+        incremental='--incremental' in flags,
+        parallel_plan='--parallel-plan' in flags,
+        fill_gaps='--fill-gaps' in flags
+    )
     
     # Upload to Confluence
     if upload_to_confluence and generated_files:
         print("\n" + "="*60)
-        print(f"STEP 3: Uploading to Confluence")
+        print(f"STEP 4: Uploading to Confluence")
         print("="*60)
         
         for file in generated_files:
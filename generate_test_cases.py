@@ -8,34 +8,60 @@ Description: Takes requirement PDF, generates comprehensive test cases using Cla
 import os
 import sys
 import json
-import PyPDF2
-from anthropic import Anthropic
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+import sqlite3
+import time
+
+from claude_client import (
+    create_client, create_complete, describe_cache_stats, describe_usage, prime_prompt_cache, requirements_messages,
+    stream_json_array
+)
+from document_rendering import render_test_cases
+from incremental_generation import (
+    case_range_for, describe_diff, diff_sections, load_section_map, prune_section_map, regenerate_test_cases,
+    save_section_map, section_instructions, section_units,
+)
+from pdf_extraction import extract_pdf_text
+from response_parsing import ResponseParseError, describe_parse_stats, normalize_test_case, parse_test_cases
+from test_case_dedup import NearDuplicateIndex, describe_dedup, remove_near_duplicates
+from test_case_stats import TestCaseStats
+from test_case_store import get_test_case_store
+from token_budget import describe_budget, plan_test_cases, test_cases_max_tokens
+from traceability import build_traceability, describe_traceability, fill_coverage_gaps, gap_case_range, gap_instructions
+from requirements_chunking import (
+    CHUNK_CASE_RANGE,
+    MAX_CHUNK_CHARS,
+    describe_chunk_failures,
+    label_chunk,
+    map_reduce_test_cases,
+    renumber_test_cases,
+    split_requirements,
+)
 
 # Configuration
 CLAUDE_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 MODEL_NAME = "claude-sonnet-4-20250514"
+SUMMARY_SECTIONS = (('priority', "Priority Distribution"), ('type', "Test Type Distribution"), ('module', "Module Coverage"))
 
 
-def read_pdf(pdf_path):
+def read_pdf(pdf_path, use_cache=True):
     """Extract text from PDF file"""
     print(f"📄 Reading PDF: {pdf_path}")
-    text = ""
     
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            num_pages = len(pdf_reader.pages)
-            print(f"   Total pages: {num_pages}")
-            
-            for page_num in range(num_pages):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
-                print(f"   Extracted page {page_num + 1}/{num_pages}")
+        text, stats = extract_pdf_text(
+            pdf_path,
+            progress_callback=lambda done, total: print(f"   Extracted page {done}/{total}"),
+            use_cache=use_cache
+        )
         
-        print(f"✅ Successfully extracted {len(text)} characters")
+        if stats['cached']:
+            print(f"   ♻️  Loaded {stats['pages']} pages from extraction cache")
+        else:
+            print(f"   Total pages: {stats['pages']} ({stats['pages_per_sec']:.1f} pages/sec)")
+        print(f"✅ Successfully extracted {len(text)} characters "
+              f"({stats['headings']} headings, {stats['tables']} tables)")
+        if stats['boilerplate_lines']:
+            print(f"   🧹 Dropped {stats['boilerplate_lines']} repeated header/footer lines")
         return text
     
     except Exception as e:
@@ -43,21 +69,9 @@ def read_pdf(pdf_path):
         sys.exit(1)
 
 
-def generate_test_cases_with_claude(requirements_text, project_name="Project"):
-    """Generate test cases using Claude API"""
-    print(f"\n🤖 Calling Claude API to generate test cases...")
-    
-    if not CLAUDE_API_KEY:
-        print("❌ Error: ANTHROPIC_API_KEY environment variable not set!")
-        print("   Set it using: export ANTHROPIC_API_KEY='your-api-key'")
-        sys.exit(1)
-    
-    client = Anthropic(api_key=CLAUDE_API_KEY)
-    
-    prompt = f"""You are a professional QA Test Case writer. Based on the following requirements document, create comprehensive test cases.
-
-REQUIREMENTS DOCUMENT:
-{requirements_text}
+def build_test_cases_instructions(case_range="40-60"):
+    """Build the test case instructions that follow the requirements document in the prompt"""
+    return f"""You are a professional QA Test Case writer. Based on the requirements document above, create comprehensive test cases.
 
 Please generate detailed test cases in JSON format. Each test case should cover:
 1. Functional testing
@@ -87,7 +101,7 @@ Return ONLY a JSON array with this exact structure (no markdown, no code blocks)
 ]
 
 Guidelines:
-- Generate 40-60 comprehensive test cases
+- Generate {case_range} comprehensive test cases
 - Cover ALL requirements mentioned in the document
 - Use clear, professional language
 - Make test cases actionable and specific
@@ -98,158 +112,382 @@ Guidelines:
 
 CRITICAL: Return ONLY the JSON array. No markdown formatting, no ```json blocks, just pure JSON."""
 
+
+def build_test_cases_request(requirements_text, case_range="40-60", section=None, streaming=False, requirements=None):
+    """
+    Build the messages.create payload for test cases (only for one section
+    unit, or only for a list of uncovered functional requirements, if given),
+    with max_tokens sized to the number of test cases
+    """
+    instructions = build_test_cases_instructions(case_range)
+    if section:
+        instructions = section_instructions(instructions, section)
+    if requirements:
+        instructions = gap_instructions(instructions, requirements)
+    return {
+        "model": MODEL_NAME,
+        "max_tokens": test_cases_max_tokens(case_range, streaming),
+        "temperature": 0.3,
+        "messages": requirements_messages(requirements_text, instructions),
+    }
+
+
+def generate_test_cases_with_claude(requirements_text, project_name="Project", client=None, case_range="40-60"):
+    """Generate test cases using Claude API (pass client to reuse an existing Anthropic client)"""
+    print(f"\n🤖 Calling Claude API to generate test cases...")
+    
+    if not CLAUDE_API_KEY:
+        print("❌ Error: ANTHROPIC_API_KEY environment variable not set!")
+        print("   Set it using: export ANTHROPIC_API_KEY='your-api-key'")
+        sys.exit(1)
+    
+    client = client or create_client(CLAUDE_API_KEY)
+    
+    request = build_test_cases_request(requirements_text, case_range)
+
+    # Transient API errors are retried by the client; anything left is raised to the caller
+    response_text, responses = create_complete(client, request)
+    print(f"✅ Received response from Claude ({len(responses)} part{'s' if len(responses) > 1 else ''})")
+    
     try:
-        response = client.messages.create(
-            model=MODEL_NAME,
-            max_tokens=16000,
-            temperature=0.3,
-            messages=[
-                {"role": "user", "content": prompt}
-            ]
+        # Keeps every complete test case if the array was cut off or broken part-way
+        test_cases, stats = parse_test_cases(response_text)
+    except ResponseParseError as e:
+        print(f"❌ Error parsing JSON: {e}")
+        print(f"Response text: {response_text[:500]}...")
+        raise
+    
+    print(describe_parse_stats(stats, f"{len(test_cases)} test cases"))
+    return test_cases
+
+
+def generate_test_cases_chunked(requirements_text, project_name="Project", client=None):
+    """
+    Generate test cases chunk by chunk for large requirement documents.
+    Chunks are split at section headings, generated concurrently and merged
+    with renumbered TC_### IDs.
+    """
+    chunks = split_requirements(requirements_text)
+    if len(chunks) == 1:
+        return generate_test_cases_with_claude(
+            requirements_text, project_name, client, plan_test_cases(requirements_text)['case_range']
         )
+    
+    print(f"\n🧩 Split requirements into {len(chunks)} chunks (max {MAX_CHUNK_CHARS} characters each)")
+    
+    if not CLAUDE_API_KEY:
+        print("❌ Error: ANTHROPIC_API_KEY environment variable not set!")
+        print("   Set it using: export ANTHROPIC_API_KEY='your-api-key'")
+        sys.exit(1)
+    
+    client = client or create_client(CLAUDE_API_KEY)
+    
+    def generate_chunk(chunk_text, chunk_index):
+        return generate_test_cases_with_claude(
+            label_chunk(chunk_text, chunk_index, len(chunks)), project_name, client, CHUNK_CASE_RANGE
+        )
+    
+    failures = []
+    
+    def show_progress(done, total, chunk_index, chunk_cases):
+        if failures and failures[-1][0] == chunk_index:
+            print(f"   ❌ Chunk {chunk_index + 1}/{total} failed ({done}/{total} done)")
+        else:
+            print(f"   ✅ Chunk {chunk_index + 1}/{total}: {len(chunk_cases)} test cases ({done}/{total} done)")
+    
+    test_cases = map_reduce_test_cases(chunks, generate_chunk, progress_callback=show_progress, failures=failures)
+    if len(failures) == len(chunks):
+        raise failures[0][1]
+    if failures:
+        # Keep what the other chunks produced; rerun to cover the failed ranges
+        print(f"⚠️  {len(failures)} of {len(chunks)} chunks failed, their test cases are missing:")
+        for line in describe_chunk_failures(chunks, failures):
+            print(line)
+    print(f"✅ Merged {len(test_cases)} test cases from {len(chunks) - len(failures)} chunks")
+    return test_cases
+
+
+def generate_test_cases_incremental(requirements_text, project_name="Project", client=None, section_map_path=None):
+    """
+    Diff the requirements against the section map saved by the previous run
+    and regenerate test cases only for added and changed sections; unchanged
+    sections keep their test cases and IDs. Returns (test_cases, section_map).
+    """
+    units = section_units(requirements_text)
+    previous_map = load_section_map(section_map_path) if section_map_path else None
+    diff = diff_sections(previous_map, units)
+    
+    if previous_map is None:
+        print(f"\n🔁 No previous section map; generating test cases for all {len(units)} sections")
+    else:
+        print(f"\n{describe_diff(diff)}")
+    
+    pending = diff['changed'] + diff['added']
+    if pending:
+        if not CLAUDE_API_KEY:
+            print("❌ Error: ANTHROPIC_API_KEY environment variable not set!")
+            print("   Set it using: export ANTHROPIC_API_KEY='your-api-key'")
+            sys.exit(1)
         
-        response_text = response.content[0].text
-        print("✅ Received response from Claude")
-        
-        # Clean response if it has markdown code blocks
-        if response_text.strip().startswith('```'):
-            response_text = response_text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            elif response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-        
-        # Parse JSON
-        test_cases = json.loads(response_text)
-        print(f"✅ Successfully parsed {len(test_cases)} test cases")
+        client = client or create_client(CLAUDE_API_KEY)
+        requests = {unit['key']: build_test_cases_request(requirements_text, case_range_for(unit), unit)
+                    for unit in pending}
+        try:
+            # Every section call shares the whole document as its prefix
+            prime_prompt_cache(client, list(requests.values()))
+        except Exception as e:
+            print(f"⚠️  Prompt cache priming skipped: {e}")
+    
+    def generate_section(unit, unit_index):
+        response_text, _ = create_complete(client, requests[unit['key']])
+        test_cases, _ = parse_test_cases(response_text)
         return test_cases
     
-    except json.JSONDecodeError as e:
-        print(f"❌ Error parsing JSON: {e}")
-        print(f"Response text: {response_text[:500]}...")
+    generated = []
+    
+    def show_progress(done, total, unit_index, unit_cases):
+        generated.extend(unit_cases)
+        print(f"   ✅ {units[unit_index]['heading']}: {len(unit_cases)} test cases ({done}/{total} done)")
+    
+    test_cases, section_map = regenerate_test_cases(
+        project_name, units, diff, previous_map, generate_section, progress_callback=show_progress
+    )
+    print(f"✅ {len(test_cases)} test cases: {len(test_cases) - len(generated)} kept, {len(generated)} generated "
+          f"for {len(pending)} of {len(units)} sections")
+    return test_cases, section_map
+
+
+def stream_test_cases_with_claude(requirements_text, project_name="Project", client=None, case_range="40-60"):
+    """Stream test cases from Claude API, yielding each one as soon as it is complete"""
+    print(f"\n🤖 Streaming test cases from Claude API...")
+    
+    if not CLAUDE_API_KEY:
+        print("❌ Error: ANTHROPIC_API_KEY environment variable not set!")
+        print("   Set it using: export ANTHROPIC_API_KEY='your-api-key'")
         sys.exit(1)
     
+    client = client or create_client(CLAUDE_API_KEY)
+    request = build_test_cases_request(requirements_text, case_range, streaming=True)
+    
+    started = time.perf_counter()
+    count = 0
+    
+    try:
+        # Truncated or dropped streams are resumed from where they stopped
+        for test_case in stream_json_array(client, request):
+            test_case = normalize_test_case(test_case, count + 1)
+            if test_case is None:
+                continue
+            count += 1
+            if count == 1:
+                print(f"⚡ First test case after {time.perf_counter() - started:.1f}s")
+            print(f"   🧪 {test_case.get('id', f'TC_{count:03d}')}: {test_case.get('title', '')}")
+            yield test_case
+    
     except Exception as e:
-        print(f"❌ Error calling Claude API: {e}")
-        sys.exit(1)
+        if count == 0:
+            raise
+        # Keep the test cases already written rather than discarding them
+        print(f"⚠️  Stream failed after {count} test cases, keeping them: {e}")
+    
+    if count == 0:
+        raise ValueError("no test cases found in the response")
+    
+    print(f"✅ Successfully streamed {count} test cases in {time.perf_counter() - started:.1f}s")
 
 
-def create_excel_file(test_cases, output_path, project_name):
-    """Create Excel file with test cases"""
+def create_excel_file(test_cases, output_path, project_name, traceability=None):
+    """
+    Create Excel file with test cases (any iterable, including a stream of test cases),
+    plus a Traceability sheet when a traceability matrix is given
+    """
     print(f"\n📝 Creating Excel file...")
     
-    wb = Workbook()
-    sheet = wb.active
-    sheet.title = "Test Cases"
-    
-    # Styling
-    header_font = Font(bold=True, color='FFFFFF', size=11)
-    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-    header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-    
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    # Write-only workbook: rows go straight to disk, so memory stays flat for any number of test cases
+    total = render_test_cases(test_cases, output_path, traceability=traceability)
     
-    # Headers
-    headers = [
-        'Test Case ID',
-        'Module',
-        'Test Case Title',
-        'Description',
-        'Pre-conditions',
-        'Test Steps',
-        'Expected Results',
-        'Priority',
-        'Test Type',
-        'Platform'
-    ]
-    
-    # Column widths
-    column_widths = [15, 25, 35, 40, 30, 50, 50, 10, 15, 12]
-    for i, width in enumerate(column_widths, 1):
-        sheet.column_dimensions[get_column_letter(i)].width = width
-    
-    # Write headers
-    for col, header in enumerate(headers, 1):
-        cell = sheet.cell(row=1, column=col)
-        cell.value = header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_alignment
-        cell.border = thin_border
-    
-    # Freeze first row
-    sheet.freeze_panes = 'A2'
-    
-    # Write test cases
-    for idx, tc in enumerate(test_cases, start=2):
-        row = idx
-        sheet[f'A{row}'] = tc.get('id', f'TC_{idx-1:03d}')
-        sheet[f'B{row}'] = tc.get('module', '')
-        sheet[f'C{row}'] = tc.get('title', '')
-        sheet[f'D{row}'] = tc.get('description', '')
-        sheet[f'E{row}'] = tc.get('preconditions', '')
-        sheet[f'F{row}'] = tc.get('steps', '')
-        sheet[f'G{row}'] = tc.get('expected', '')
-        sheet[f'H{row}'] = tc.get('priority', 'P2')
-        sheet[f'I{row}'] = tc.get('type', 'Functional')
-        sheet[f'J{row}'] = tc.get('platform', 'Both')
-        
-        # Apply borders and wrapping
-        for col in range(1, 11):
-            cell = sheet.cell(row=row, column=col)
-            cell.border = thin_border
-            cell.alignment = Alignment(wrap_text=True, vertical='top')
-    
-    # Save
-    wb.save(output_path)
     print(f"✅ Excel file created: {output_path}")
-    print(f"   Total test cases: {len(test_cases)}")
+    print(f"   Total test cases: {total}")
 
 
 def generate_summary_stats(test_cases):
-    """Generate statistics about test cases"""
+    """Print the priority, type and module distributions and the module × priority cross-tab"""
+    stats = TestCaseStats.from_test_cases(test_cases)
+    
     print("\n📊 Test Cases Summary:")
     print("="*60)
     
-    # Count by priority
-    priorities = {}
-    for tc in test_cases:
-        priority = tc.get('priority', 'P2')
-        priorities[priority] = priorities.get(priority, 0) + 1
+    for number, (field, title) in enumerate(SUMMARY_SECTIONS):
+        if number:
+            print()
+        print(f"{title}:")
+        for value, count in sorted(stats.distributions[field].items()):
+            print(f"   {value}: {count} test cases")
+    
+    table = stats.table('module', 'priority')
+    if table:
+        priorities = list(next(iter(table.values())))
+        width = max(len(module) for module in table)
+        print("\nModule × Priority:")
+        print(f"   {'':<{width}}  " + "  ".join(f"{priority:>4}" for priority in priorities))
+        for module, counts in table.items():
+            print(f"   {module:<{width}}  " + "  ".join(f"{counts[priority]:>4}" for priority in priorities))
     
-    print("Priority Distribution:")
-    for priority in sorted(priorities.keys()):
-        print(f"   {priority}: {priorities[priority]} test cases")
+    print("="*60)
+    return stats
+
+
+def build_test_cases(requirements_text, project_name, client=None, stream=False, chunked=False, incremental=False):
+    """
+    Generate test cases and write their Excel and JSON files; returns both paths.
+    With stream, each test case is written to the worksheet as soon as Claude finishes it.
+    With chunked, large documents are generated section by section (takes precedence over stream);
+    otherwise chunking is switched on when the token budget says one call cannot hold the answer.
+    With incremental, only sections changed since the last incremental run are
+    regenerated, using the section map saved next to the JSON (takes precedence over both).
+    Near-duplicate test cases are merged into the first case like them before the Excel file is written.
+    """
+    output_xlsx = f"{project_name.replace(' ', '_')}_Test_Cases.xlsx"
     
-    # Count by type
-    types = {}
-    for tc in test_cases:
-        test_type = tc.get('type', 'Functional')
-        types[test_type] = types.get(test_type, 0) + 1
+    # Size the single call to the document; chunk it when one call cannot hold the answer
+    budget = plan_test_cases(requirements_text, streaming=stream)
+    if not (incremental or chunked):
+        print(f"\n{describe_budget(budget)}")
+        chunked = budget['chunked']
+    streamed = stream and not (incremental or chunked)
+    
+    if incremental:
+        # Keep the test cases of unchanged sections, regenerate the rest
+        section_map_path = f"{project_name.replace(' ', '_')}_Sections.json"
+        test_cases, section_map = generate_test_cases_incremental(
+            requirements_text, project_name, client, section_map_path
+        )
+    elif chunked:
+        # Generate test cases per requirements chunk and merge them
+        test_cases = generate_test_cases_chunked(requirements_text, project_name, client)
+    elif streamed:
+        test_cases = []
+        duplicates = NearDuplicateIndex()
+        
+        def collect():
+            for tc in stream_test_cases_with_claude(requirements_text, project_name, client, budget['case_range']):
+                # Near-duplicates of an earlier case never reach the worksheet
+                if duplicates.add(tc):
+                    test_cases.append(tc)
+                    yield tc
+        
+        # Stream test cases from Claude straight into the Excel file
+        create_excel_file(collect(), output_xlsx, project_name)
+        for line in describe_dedup(duplicates.report()):
+            print(line)
+    else:
+        # Generate test cases using Claude
+        test_cases = generate_test_cases_with_claude(requirements_text, project_name, client, budget['case_range'])
+    
+    if not streamed:
+        # Merge near-duplicates, then create the Excel file
+        test_cases, dedup_report = remove_near_duplicates(test_cases)
+        for line in describe_dedup(dedup_report):
+            print(line)
+        if chunked and not incremental and dedup_report['removed']:
+            # Chunked IDs are synthetic already; close the gaps the merged cases left
+            renumber_test_cases(test_cases)
+        create_excel_file(test_cases, output_xlsx, project_name)
+    
+    if incremental:
+        # Saved after dedup so the map lists exactly the test cases that were written
+        save_section_map(section_map_path, prune_section_map(section_map, test_cases))
+        print(f"🗺️  Section map saved: {section_map_path}")
+    
+    # Generate summary
+    generate_summary_stats(test_cases)
     
-    print("\nTest Type Distribution:")
-    for test_type in sorted(types.keys()):
-        print(f"   {test_type}: {types[test_type]} test cases")
+    # Save JSON for reference
+    json_output = f"{project_name.replace(' ', '_')}_Test_Cases.json"
+    with open(json_output, 'w', encoding='utf-8') as f:
+        json.dump(test_cases, f, indent=2, ensure_ascii=False)
+    print(f"✅ JSON saved: {json_output}")
     
-    # Count by module
-    modules = {}
-    for tc in test_cases:
-        module = tc.get('module', 'General')
-        modules[module] = modules.get(module, 0) + 1
+    # Index the suite in the local test case store so it can be searched later
+    try:
+        stored = get_test_case_store().save_suite(project_name, test_cases, source='cli')
+        print(f"🗄️  {stored} test cases indexed in {get_test_case_store().path}")
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️  Test case store not updated: {e}")
     
-    print("\nModule Coverage:")
-    for module in sorted(modules.keys()):
-        print(f"   {module}: {modules[module]} test cases")
+    return output_xlsx, json_output
+
+
+def generate_coverage_gaps(requirements_text, test_plan, test_cases, traceability, client=None):
+    """
+    Generate test cases only for the functional requirements the
+    traceability matrix reports as uncovered, a few requirements per call,
+    and append them. Returns (test_cases, traceability, added test cases).
+    """
+    print(f"\n🎯 Generating test cases for {len(traceability['uncovered'])} uncovered requirements...")
     
-    print("="*60)
+    if not CLAUDE_API_KEY:
+        print("❌ Error: ANTHROPIC_API_KEY environment variable not set!")
+        print("   Set it using: export ANTHROPIC_API_KEY='your-api-key'")
+        sys.exit(1)
+    
+    client = client or create_client(CLAUDE_API_KEY)
+    
+    def generate_group(requirements, group_index):
+        request = build_test_cases_request(requirements_text, gap_case_range(requirements), requirements=requirements)
+        response_text, _ = create_complete(client, request)
+        group_cases, _ = parse_test_cases(response_text)
+        return group_cases
+    
+    def show_progress(done, total, group_index, group_cases):
+        print(f"   ✅ Requirement group {group_index + 1}/{total}: {len(group_cases)} test cases ({done}/{total} done)")
+    
+    test_cases, traceability, added = fill_coverage_gaps(
+        test_plan, test_cases, traceability, generate_group, progress_callback=show_progress
+    )
+    print(f"✅ Added {len(added)} test cases for uncovered requirements")
+    return test_cases, traceability, added
+
+
+def trace_requirements(requirements_text, project_name, test_plan, client=None, fill_gaps=False):
+    """
+    Link the saved test cases of project_name to the test plan's functional
+    requirements and write the traceability JSON and the Excel file again
+    with a Traceability sheet. With fill_gaps, test cases are generated for
+    uncovered requirements first. Returns the traceability JSON path.
+    """
+    file_stem = project_name.replace(' ', '_')
+    json_output = f"{file_stem}_Test_Cases.json"
+    with open(json_output, 'r', encoding='utf-8') as f:
+        test_cases = json.load(f)
+    
+    traceability = build_traceability(test_plan, test_cases)
+    print()
+    for line in describe_traceability(traceability):
+        print(line)
+    
+    if fill_gaps and traceability['uncovered']:
+        test_cases, traceability, added = generate_coverage_gaps(
+            requirements_text, test_plan, test_cases, traceability, client
+        )
+        for line in describe_traceability(traceability):
+            print(line)
+        if added:
+            with open(json_output, 'w', encoding='utf-8') as f:
+                json.dump(test_cases, f, indent=2, ensure_ascii=False)
+            print(f"✅ JSON saved: {json_output}")
+            try:
+                get_test_case_store().save_suite(project_name, test_cases, source='cli')
+            except (sqlite3.Error, OSError) as e:
+                print(f"⚠️  Test case store not updated: {e}")
+    
+    create_excel_file(test_cases, f"{file_stem}_Test_Cases.xlsx", project_name, traceability)
+    
+    traceability_output = f"{file_stem}_Traceability.json"
+    with open(traceability_output, 'w', encoding='utf-8') as f:
+        json.dump(traceability, f, indent=2, ensure_ascii=False)
+    print(f"✅ Traceability matrix saved: {traceability_output}")
+    return traceability_output
 
 
 def main():
@@ -259,43 +497,77 @@ def main():
     print("="*60)
     
     # Check arguments
-    if len(sys.argv) < 2:
-        print("\n❌ Usage: python3 generate_test_cases.py <requirements_pdf_path> [project_name]")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    flags = {arg for arg in sys.argv[1:] if arg.startswith('--')}
+    
+    if len(args) < 1:
+        print("\n❌ Usage: python3 generate_test_cases.py <requirements_pdf_path> [project_name] [--no-cache] [--no-response-cache] [--stream] [--chunked] [--incremental] [--plan=<Test_Plan.json>] [--fill-gaps]")
         print("\nExample:")
         print("  python3 generate_test_cases.py requirements.pdf \"My Project\"")
+        print("\nOptions:")
+        print("  --no-cache            Re-extract the PDF instead of reusing the extraction cache")
+        print("  --no-response-cache   Call Claude even if an identical request was answered before")
+        print("  --stream              Write each test case as soon as Claude generates it")
+        print("  --chunked             Generate large documents section by section, in parallel")
+        print("  --incremental         Regenerate only the sections changed since the last --incremental run")
+        print("  --plan=FILE           Trace the test cases to this test plan's functional requirements")
+        print("  --fill-gaps           With --plan, generate test cases only for requirements that have none")
         sys.exit(1)
     
-    pdf_path = sys.argv[1]
-    project_name = sys.argv[2] if len(sys.argv) > 2 else "Project"
+    pdf_path = args[0]
+    project_name = args[1] if len(args) > 1 else "Project"
+    use_cache = '--no-cache' not in flags
+    use_response_cache = '--no-response-cache' not in flags
+    stream = '--stream' in flags
+    chunked = '--chunked' in flags
+    incremental = '--incremental' in flags
+    fill_gaps = '--fill-gaps' in flags
+    plan_path = dict(flag[2:].split('=', 1) for flag in flags if '=' in flag).get('plan')
     
     # Check if PDF exists
     if not os.path.exists(pdf_path):
         print(f"❌ Error: PDF file not found: {pdf_path}")
         sys.exit(1)
     
-    # Step 1: Read PDF
-    requirements_text = read_pdf(pdf_path)
-    
-    # Step 2: Generate test cases using Claude
-    test_cases = generate_test_cases_with_claude(requirements_text, project_name)
-    
-    # Step 3: Create Excel file
-    output_xlsx = f"{project_name.replace(' ', '_')}_Test_Cases.xlsx"
-    create_excel_file(test_cases, output_xlsx, project_name)
+    test_plan = None
+    if plan_path:
+        try:
+            with open(plan_path, 'r', encoding='utf-8') as f:
+                test_plan = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ Error reading test plan: {e}")
+            sys.exit(1)
+    elif fill_gaps:
+        print("❌ Error: --fill-gaps needs the test plan to trace against (--plan=<Test_Plan.json>)")
+        sys.exit(1)
     
-    # Step 4: Generate summary
-    generate_summary_stats(test_cases)
+    # Step 1: Read PDF
+    requirements_text = read_pdf(pdf_path, use_cache=use_cache)
     
-    # Save JSON for reference
-    json_output = f"{project_name.replace(' ', '_')}_Test_Cases.json"
-    with open(json_output, 'w', encoding='utf-8') as f:
-        json.dump(test_cases, f, indent=2, ensure_ascii=False)
-    print(f"✅ JSON saved: {json_output}")
+    # Step 2-4: Generate test cases using Claude, create Excel file and summary
+    client = create_client(CLAUDE_API_KEY, use_response_cache) if CLAUDE_API_KEY else None
+    try:
+        output_xlsx, json_output = build_test_cases(
+            requirements_text, project_name, client, stream=stream, chunked=chunked, incremental=incremental
+        )
+        # Step 5: Link the test cases to the plan's requirements and fill coverage gaps
+        traceability_output = trace_requirements(
+            requirements_text, project_name, test_plan, client, fill_gaps
+        ) if test_plan else None
+    except Exception as e:
+        print(f"❌ Error generating test cases: {e}")
+        sys.exit(1)
     
     print("\n" + "="*60)
     print("✅ Test Cases Generation Complete!")
     print(f"📄 Excel File: {output_xlsx}")
     print(f"📋 JSON File: {json_output}")
+    if traceability_output:
+        print(f"🔗 Traceability: {traceability_output}")
+    if client:
+        print(describe_usage(client))
+    if use_response_cache:
+        print(describe_cache_stats())
     print("="*60)
 
 
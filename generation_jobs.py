@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Generation Job Queue
+Author: Created for QA Team
+Description: Runs documentation generation on a shared thread pool instead of
+             the Streamlit script thread. The job table lives for the whole
+             server process, so a rerun, a browser refresh or another user's
+             request never interrupts a job; the UI submits a job, polls its
+             progress and shows the results once it has finished.
+"""
+
+import itertools
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# Configuration
+JOB_WORKERS = int(os.getenv('QA_DOCS_JOB_WORKERS', '4'))            # Jobs running at once; the rest wait in the queue
+JOB_RETENTION_SECONDS = float(os.getenv('QA_DOCS_JOB_RETENTION_HOURS', '24')) * 3600
+MAX_JOBS_PER_OWNER = 20       # Finished jobs kept per workspace; older ones are dropped first
+MAX_LOG_LINES = 200
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+_default_queue = None
+_default_queue_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's worker when the job was cancelled from the UI"""
+
+
+class Job:
+    """
+    One generation job. The worker thread reports through update(), log()
+    and partial; the UI only reads the attributes, so a rerun can render the
+    job at any point without locking.
+    """
+
+    def __init__(self, job_id, owner, label):
+        self.id = job_id
+        self.owner = owner
+        self.label = label
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "⏳ Waiting for a free worker..."
+        self.logs = []          # (level, text) lines, shown as captions/warnings/errors
+        self.partial = []       # Items produced so far, e.g. streamed test cases
+        self.result = {}
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_requested = False
+        self._future = None
+
+    @property
+    def is_finished(self):
+        return self.status in FINISHED_STATES
+
+    @property
+    def seconds(self):
+        """Run time so far, or in total once finished"""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def check_cancelled(self):
+        """Stop the worker at the next checkpoint if the job was cancelled"""
+        if self.cancel_requested:
+            raise JobCancelled()
+
+    def update(self, progress=None, message=None):
+        """Report progress (0-1) and/or a status message; also a cancellation checkpoint"""
+        if progress is not None:
+            self.progress = max(0.0, min(1.0, progress))
+        if message is not None:
+            self.message = message
+        self.check_cancelled()
+
+    def log(self, text, level='info'):
+        """Add a line to the job log (level: info, success, warning or error)"""
+        if len(self.logs) < MAX_LOG_LINES:
+            self.logs.append((level, text))
+
+
+class JobQueue:
+    """Thread pool plus the process-wide job table"""
+
+    def __init__(self, max_workers=JOB_WORKERS, retention_seconds=JOB_RETENTION_SECONDS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='qa-docs-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self.max_workers = max_workers
+        self.retention_seconds = retention_seconds
+
+    def submit(self, owner, label, target, *args, **kwargs):
+        """
+        Queue target(job, *args, **kwargs) and return the Job at once. The
+        target's return value becomes job.result.
+        """
+        job = Job(f"{next(self._sequence):04d}-{uuid.uuid4().hex[:8]}", owner, label)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job._future = self._pool.submit(self._run, job, target, args, kwargs)
+        return job
+
+    def _run(self, job, target, args, kwargs):
+        """Worker thread body: run the target and record how it ended"""
+        if job.cancel_requested:
+            job.status = CANCELLED
+            job.finished = time.time()
+            return
+        job.status = RUNNING
+        job.started = time.time()
+        job.message = "🚀 Starting..."
+        try:
+            job.result = target(job, *args, **kwargs) or {}
+            job.status = DONE
+            job.progress = 1.0
+        except JobCancelled:
+            job.status = CANCELLED
+            job.message = "🛑 Cancelled"
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e) or type(e).__name__
+            job.message = f"❌ {job.error}"
+            traceback.print_exc()  # Full trace in the server log
+        finally:
+            job.finished = time.time()
+
+    def get(self, job_id):
+        """Job with this ID, or None if it is unknown or expired"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs_for(self, owner):
+        """Jobs submitted by owner, newest first"""
+        with self._lock:
+            jobs = [job for job in self._jobs.values() if job.owner == owner]
+        return sorted(jobs, key=lambda job: job.created, reverse=True)
+
+    def position(self, job):
+        """1-based place of a queued job in the line, or 0 once it is running or finished"""
+        if job.status != QUEUED:
+            return 0
+        with self._lock:
+            waiting = [other for other in self._jobs.values() if other.status == QUEUED]
+        return sorted(waiting, key=lambda other: other.created).index(job) + 1 if job in waiting else 0
+
+    def cancel(self, job_id):
+        """Cancel a queued job, or ask a running one to stop at its next checkpoint"""
+        job = self.get(job_id)
+        if job is None or job.is_finished:
+            return
+        job.cancel_requested = True
+        if job._future is not None and job._future.cancel():
+            job.status = CANCELLED
+            job.message = "🛑 Cancelled"
+            job.finished = time.time()
+
+    def remove(self, job_id):
+        """Drop a finished job from the table (running jobs are cancelled first)"""
+        self.cancel(job_id)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.is_finished:
+                del self._jobs[job_id]
+
+    def stats(self):
+        """Queue depth across every user"""
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            'queued': statuses.count(QUEUED),
+            'running': statuses.count(RUNNING),
+            'workers': self.max_workers,
+            'jobs': len(statuses),
+        }
+
+    def _prune(self):
+        """Expire old finished jobs and cap each owner's history (caller holds the lock)"""
+        now = time.time()
+        per_owner = {}
+        for job in sorted(self._jobs.values(), key=lambda job: job.created, reverse=True):
+            if not job.is_finished or job.finished is None:
+                continue
+            kept = per_owner.get(job.owner, 0)
+            if now - job.finished > self.retention_seconds or kept >= MAX_JOBS_PER_OWNER:
+                del self._jobs[job.id]
+            else:
+                per_owner[job.owner] = kept + 1
+
+
+def get_job_queue():
+    """Process-wide job queue, created on first use and shared by every session"""
+    global _default_queue
+    with _default_queue_lock:
+        if _default_queue is None:
+            _default_queue = JobQueue()
+        return _default_queue
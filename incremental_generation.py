@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Incremental Test Case Regeneration
+Author: Created for QA Team
+Description: Fingerprints every section of a requirements document and diffs a
+             revised version against the section map saved by the previous
+             run. Only added and changed sections go back to Claude; the test
+             cases of unchanged sections are kept with their TC_### IDs, and
+             new test cases get IDs after the highest one ever issued.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+from requirements_chunking import CHUNK_CASE_RANGE, MAX_PARALLEL_CHUNKS, PAGE_MARKER_PATTERN, map_chunks, split_sections
+
+# Configuration
+SECTION_MAP_VERSION = 1
+MIN_SECTION_CHARS = 200     # Shorter sections (a bare chapter heading) are merged into the next one
+SECTION_CASE_RANGES = (     # Test cases asked for per section, by section length in characters
+    (2000, "3-5"),
+    (8000, "5-10"),
+    (20000, "10-15"),
+)
+
+WHITESPACE = re.compile(r'\s+')
+TEST_CASE_NUMBER = re.compile(r'^TC_(\d+)$')
+
+
+def _fingerprint(text):
+    """
+    SHA-256 of the text with whitespace collapsed and page markers dropped, so
+    re-wrapped lines or a section moving to another page do not count as a change
+    """
+    text = PAGE_MARKER_PATTERN.sub('', text)
+    return hashlib.sha256(WHITESPACE.sub(' ', text).strip().encode('utf-8')).hexdigest()
+
+
+def _heading(text):
+    """First non-blank line of a section, without page markers or Markdown heading marks"""
+    for line in PAGE_MARKER_PATTERN.sub('', text).splitlines():
+        if line.strip():
+            return WHITESPACE.sub(' ', line.strip().lstrip('#')).strip()[:100]
+    return ''
+
+
+def section_units(text):
+    """
+    Split requirements text into the sections that are diffed and regenerated
+    on their own. Returns a list of dicts with key (heading, numbered when it
+    repeats), heading, hash, chars and text.
+    """
+    merged = []
+    carry = ''
+    for section in split_sections(text):
+        carry += section
+        if len(carry.strip()) >= MIN_SECTION_CHARS:
+            merged.append(carry)
+            carry = ''
+    if carry.strip():
+        if merged:
+            merged[-1] += carry
+        else:
+            merged.append(carry)
+
+    units = []
+    seen = {}
+    for section in merged:
+        heading = _heading(section)
+        seen[heading] = seen.get(heading, 0) + 1
+        key = heading if seen[heading] == 1 else f"{heading} #{seen[heading]}"
+        units.append({
+            'key': key,
+            'heading': heading,
+            'hash': _fingerprint(section),
+            'chars': len(section),
+            'text': section,
+        })
+    return units
+
+
+def case_range_for(unit):
+    """Test case range to ask for, scaled to the section's length"""
+    for max_chars, case_range in SECTION_CASE_RANGES:
+        if unit['chars'] <= max_chars:
+            return case_range
+    return CHUNK_CASE_RANGE
+
+
+def section_instructions(instructions, unit):
+    """
+    Narrow test case instructions to one section. The whole document stays
+    in the cacheable prefix, so Claude sees the context and every section
+    call reads the same cached prompt.
+    """
+    return (f"{instructions}\n\n"
+            "SCOPE: Other sections already have test cases. Write test cases ONLY for this section "
+            "of the requirements document:\n"
+            f"<section>\n{unit['text'].strip()}\n</section>")
+
+
+def load_section_map(path):
+    """Section map saved by a previous run, or None if there is none or it is unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            section_map = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(section_map, dict) or section_map.get('version') != SECTION_MAP_VERSION:
+        return None
+    return section_map
+
+
+def save_section_map(path, section_map):
+    """Write a section map atomically"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(section_map, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def diff_sections(previous_map, units):
+    """
+    Match the new sections against the previous map: identical content is
+    unchanged (even if it moved), a known heading with new content is
+    changed, anything else is added or removed. Returns a dict with the
+    unchanged, changed and added units, 'replaced' (the previous version of
+    each changed unit), the removed previous sections and 'previous', mapping
+    a unit's index to its previous section.
+    """
+    previous_sections = list((previous_map or {}).get('sections', []))
+    unmatched = dict(enumerate(previous_sections))
+    by_hash = {}
+    for index, section in unmatched.items():
+        by_hash.setdefault(section['hash'], []).append(index)
+
+    diff = {'unchanged': [], 'changed': [], 'replaced': [], 'added': [], 'removed': [], 'previous': {}}
+    pending = []
+    for index, unit in enumerate(units):
+        candidates = [i for i in by_hash.get(unit['hash'], []) if i in unmatched]
+        if candidates:
+            diff['previous'][index] = unmatched.pop(candidates[0])
+            diff['unchanged'].append(unit)
+        else:
+            pending.append(index)
+
+    by_key = {section['key']: i for i, section in unmatched.items()}
+    for index in pending:
+        unit = units[index]
+        previous_index = by_key.pop(unit['key'], None)
+        if previous_index is not None and previous_index in unmatched:
+            diff['previous'][index] = unmatched.pop(previous_index)
+            diff['changed'].append(unit)
+            diff['replaced'].append(diff['previous'][index])
+        else:
+            diff['added'].append(unit)
+
+    diff['removed'] = list(unmatched.values())
+    return diff
+
+
+def describe_diff(diff):
+    """Summary line followed by one line per added, changed and removed section"""
+    lines = [f"🔁 Sections: {len(diff['unchanged'])} unchanged, {len(diff['changed'])} changed, "
+             f"{len(diff['added'])} added, {len(diff['removed'])} removed"]
+    for unit, previous in zip(diff['changed'], diff['replaced']):
+        lines.append(f"   ✏️  {unit['heading']} ({previous['chars']} → {unit['chars']} characters, "
+                     f"replaces {len(previous['test_cases'])} test cases)")
+    for unit in diff['added']:
+        lines.append(f"   ➕ {unit['heading']} ({unit['chars']} characters)")
+    for section in diff['removed']:
+        lines.append(f"   ➖ {section['heading']} (drops {len(section['test_cases'])} test cases)")
+    return "\n".join(lines)
+
+
+def _next_id(previous_map):
+    """First TC_### number never issued by the previous runs"""
+    next_id = int((previous_map or {}).get('next_id', 1))
+    for section in (previous_map or {}).get('sections', []):
+        for test_case in section['test_cases']:
+            match = TEST_CASE_NUMBER.match(str(test_case.get('id', '')))
+            if match:
+                next_id = max(next_id, int(match.group(1)) + 1)
+    return next_id
+
+
+def regenerate_test_cases(project_name, units, diff, previous_map, generate_section,
+                          max_workers=MAX_PARALLEL_CHUNKS, progress_callback=None):
+    """
+    Keep the test cases of unchanged sections and run
+    generate_section(unit, unit_index) concurrently for the changed and added
+    ones. New test cases are numbered in document order after the highest ID
+    issued so far; IDs of removed or replaced test cases are never reused.
+
+    progress_callback(done, total, unit_index, unit_cases) is called from the
+    calling thread as sections finish.
+    Returns (test_cases in document order, new section map).
+    """
+    pending = [index for index, unit in enumerate(units) if unit not in diff['unchanged']]
+
+    def show_progress(done, total, position, unit_cases):
+        if progress_callback:
+            progress_callback(done, total, pending[position], unit_cases)
+    
+    results = map_chunks(pending, lambda index, _: generate_section(units[index], index), max_workers, show_progress)
+    generated = dict(zip(pending, results))
+
+    next_id = _next_id(previous_map)
+    sections = []
+    test_cases = []
+    for index, unit in enumerate(units):
+        if index in generated:
+            unit_cases = generated[index]
+            for test_case in unit_cases:
+                test_case['id'] = f"TC_{next_id:03d}"
+                next_id += 1
+        else:
+            unit_cases = diff['previous'][index]['test_cases']
+        sections.append({key: unit[key] for key in ('key', 'heading', 'hash', 'chars')})
+        sections[-1]['test_cases'] = unit_cases
+        test_cases.extend(unit_cases)
+
+    section_map = {
+        'version': SECTION_MAP_VERSION,
+        'project_name': project_name,
+        'next_id': next_id,
+        'sections': sections,
+    }
+    return test_cases, section_map
+
+
+def prune_section_map(section_map, test_cases):
+    """
+    Drop test cases that are no longer in test_cases (e.g. merged as
+    near-duplicates) from the section map, so the map matches the suite that
+    was written and the next run does not bring them back
+    """
+    kept = {str(test_case.get('id', '')) for test_case in test_cases}
+    for section in section_map['sections']:
+        section['test_cases'] = [test_case for test_case in section['test_cases']
+                                 if str(test_case.get('id', '')) in kept]
+    return section_map
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Shared PDF Text Extraction
+Author: Created for QA Team
+Description: Extracts requirement PDFs page by page across a process pool,
+             used by the CLI generators and the web UI. Pages are read
+             layout-aware with pdfplumber: headings (by font size and weight)
+             become Markdown headings, tables become pipe-separated rows,
+             every page starts with a [Page N] marker, and headers and footers
+             repeated across pages are dropped so they are not sent to Claude
+             once per page.
+"""
+
+import io
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+import pdfplumber
+
+import extraction_cache
+
+# Configuration
+EXTRACTOR_VERSION = "4"  # Bump whenever page layout output changes so cached entries are not reused
+MAX_WORKERS = os.cpu_count() or 1
+PARALLEL_PAGE_THRESHOLD = 16  # Smaller PDFs are faster to extract serially than to start a pool
+BATCHES_PER_WORKER = 4        # More batches than workers keeps the pool balanced on uneven pages
+X_TOLERANCE = 1.5             # Letter gap (points) still read as one word; pdfplumber's default 3 glues tightly set words
+
+HEADING_SIZE_RATIOS = ((1.5, 1), (1.15, 2))  # Font size relative to body text -> Markdown heading level
+BOLD_HEADING_LEVEL = 3        # Short bold lines in body size
+MAX_HEADING_CHARS = 100
+EDGE_LINES = 2                # Lines at the top and bottom of a page that may be a header or footer
+EDGE_MARGIN = 0.1             # ...and only inside this share of the page height
+REPEAT_MIN_PAGES = 3          # A header or footer must repeat on at least this many pages
+REPEAT_SHARE = 0.5            # ...and on at least this share of all pages
+PAGE_MARKER = "[Page {}]"     # Matched by requirements_chunking.PAGE_MARKER_PATTERN
+
+WHITESPACE = re.compile(r'\s+')
+DIGITS = re.compile(r'\d+')
+DOT_LEADER = re.compile(r'(?:\.\s*){4,}|…{2,}|_{4,}')  # "Introduction ........ 1" in a table of contents
+TRAILING_PAGE_NUMBER = re.compile(r'\s(?:\d{1,4}|[ivxlc]{1,6})$', re.IGNORECASE)
+CAPTION = re.compile(r'^(?:Table|Figure|Fig\.|Diagram)\s+\d', re.IGNORECASE)
+
+# Opened once per worker process by _init_worker so the PDF is neither pickled
+# nor parsed again for every batch; closed when the worker process exits
+_worker_pdf = None
+
+
+def _open_pdf(source):
+    """Open a pdfplumber PDF over a file path or raw PDF bytes"""
+    if isinstance(source, (bytes, bytearray)):
+        return pdfplumber.open(io.BytesIO(source))
+    return pdfplumber.open(source)
+
+
+def _init_worker(source):
+    """Open the PDF in the worker process"""
+    global _worker_pdf
+    _worker_pdf = _open_pdf(source)
+
+
+def _clean(text):
+    """Text with runs of whitespace (including line breaks in table cells) collapsed"""
+    return WHITESPACE.sub(' ', str(text or '')).strip()
+
+
+def _heading_level(line, body_size):
+    """Markdown heading level of a text line, or None for body text"""
+    chars = [char for char in line['chars'] if not char['text'].isspace()]
+    if not chars or not body_size or len(line['text']) > MAX_HEADING_CHARS:
+        return None
+    text = line['text'].strip()
+    if DOT_LEADER.search(text):
+        return None
+    size = Counter(round(char['size'], 1) for char in chars).most_common(1)[0][0]
+    for ratio, level in HEADING_SIZE_RATIOS:
+        if size >= body_size * ratio:
+            return level
+    # Bold labels, table/figure captions and contents entries ("1 Introduction 1")
+    # are set bold in body size too and are not section boundaries
+    if (size >= body_size and all('bold' in char.get('fontname', '').lower() for char in chars)
+            and not text.endswith(('.', ',', ';', ':'))
+            and not TRAILING_PAGE_NUMBER.search(text) and not CAPTION.match(text)):
+        return BOLD_HEADING_LEVEL
+    return None
+
+
+def _page_layout(page):
+    """
+    Layout of one page as JSON-serializable blocks in reading order:
+    {'kind': 'heading' | 'text' | 'table', 'text' or 'rows', 'level' for
+    headings, 'top', 'bottom'}, plus the page height
+    """
+    # Tables are found from ruling lines, so pages without any skip the table search
+    tables = page.find_tables() if page.edges else []
+    body = page
+    for table in tables:
+        body = body.outside_bbox(table.bbox)
+    lines = body.extract_text_lines(x_tolerance=X_TOLERANCE)
+    sizes = Counter(round(char['size'], 1) for line in lines for char in line['chars'] if not char['text'].isspace())
+    body_size = sizes.most_common(1)[0][0] if sizes else 0
+
+    blocks = []
+    for line in lines:
+        text = _clean(line['text'])
+        if not text:
+            continue
+        level = _heading_level(line, body_size)
+        block = {'kind': 'heading' if level else 'text', 'text': text, 'top': line['top'], 'bottom': line['bottom']}
+        if level:
+            block['level'] = level
+        blocks.append(block)
+    for table in tables:
+        rows = [[_clean(cell) for cell in row] for row in table.extract()]
+        rows = [row for row in rows if any(row)]
+        if rows:
+            blocks.append({'kind': 'table', 'rows': rows, 'top': table.bbox[1], 'bottom': table.bbox[3]})
+    blocks.sort(key=lambda block: block['top'])
+    return {'height': float(page.height), 'blocks': blocks}
+
+
+def _extract_page_range(start, stop):
+    """Extract the layout of pages [start, stop) inside a worker process"""
+    return start, [_extract_page(_worker_pdf, i) for i in range(start, stop)]
+
+
+def _extract_page(pdf, page_num):
+    """Layout of one page, releasing pdfplumber's per-page object cache afterwards"""
+    page = pdf.pages[page_num]
+    try:
+        return _page_layout(page)
+    finally:
+        page.close()
+
+
+def _normalize_source(pdf_source):
+    """Return a file path or the PDF bytes for paths, bytes and file-like objects"""
+    if isinstance(pdf_source, (str, os.PathLike)):
+        return os.fspath(pdf_source)
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return bytes(pdf_source)
+    # File-like object (e.g. Streamlit UploadedFile)
+    pdf_source.seek(0)
+    return pdf_source.read()
+
+
+def _page_batches(num_pages, workers):
+    """Split page indexes into contiguous (start, stop) batches"""
+    batch_size = max(1, -(-num_pages // (workers * BATCHES_PER_WORKER)))
+    return [(start, min(start + batch_size, num_pages)) for start in range(0, num_pages, batch_size)]
+
+
+def _extract_serial(pdf, num_pages, progress_callback):
+    """Extract pages one after another in the current process"""
+    pages = []
+    for page_num in range(num_pages):
+        pages.append(_extract_page(pdf, page_num))
+        if progress_callback:
+            progress_callback(page_num + 1, num_pages)
+    return pages
+
+
+def _extract_parallel(source, num_pages, workers, progress_callback):
+    """Fan page batches out over a process pool and reassemble them in page order"""
+    pages = [None] * num_pages
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(source,)) as pool:
+        futures = [pool.submit(_extract_page_range, start, stop) for start, stop in _page_batches(num_pages, workers)]
+        for future in as_completed(futures):
+            start, layouts = future.result()
+            pages[start:start + len(layouts)] = layouts
+            done += len(layouts)
+            if progress_callback:
+                progress_callback(done, num_pages)
+    return pages
+
+
+def _source_bytes(source):
+    """Read the raw PDF bytes for hashing"""
+    if isinstance(source, bytes):
+        return source
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+def _edge_blocks(layout):
+    """Indexes of the text lines at the top and bottom edge of a page that could be a header or footer"""
+    height = layout['height']
+    blocks = layout['blocks']
+    edges = set(range(min(EDGE_LINES, len(blocks)))) | set(range(max(0, len(blocks) - EDGE_LINES), len(blocks)))
+    return [
+        index for index in sorted(edges)
+        if blocks[index]['kind'] == 'text'
+        and (blocks[index]['top'] < height * EDGE_MARGIN or blocks[index]['bottom'] > height * (1 - EDGE_MARGIN))
+    ]
+
+
+def _boilerplate_key(text):
+    """Header/footer text compared with numbers ignored, so "Page 3 of 40" matches "Page 4 of 40" """
+    return DIGITS.sub('#', text.lower())
+
+
+def strip_repeated_lines(layouts):
+    """
+    Drop header and footer lines: text at the top or bottom edge of a page
+    that repeats, numbers aside, on at least REPEAT_SHARE of the pages.
+    Returns (page layouts without them, number of lines dropped).
+    """
+    edges = [_edge_blocks(layout) for layout in layouts]
+    counts = Counter(key for layout, indexes in zip(layouts, edges)
+                     for key in {_boilerplate_key(layout['blocks'][index]['text']) for index in indexes})
+    needed = max(REPEAT_MIN_PAGES, len(layouts) * REPEAT_SHARE)
+    repeated = {key for key, count in counts.items() if count >= needed}
+    if not repeated:
+        return layouts, 0
+
+    stripped = []
+    dropped = 0
+    for layout, indexes in zip(layouts, edges):
+        drop = {index for index in indexes if _boilerplate_key(layout['blocks'][index]['text']) in repeated}
+        dropped += len(drop)
+        stripped.append({**layout, 'blocks': [block for index, block in enumerate(layout['blocks'])
+                                              if index not in drop]})
+    return stripped, dropped
+
+
+def render_page(number, layout):
+    """
+    Compact text of one page: a [Page N] marker, Markdown headings, table
+    rows as "| a | b |" and a blank line wherever the layout has a
+    paragraph gap
+    """
+    lines = [PAGE_MARKER.format(number)]
+    previous = None
+    for block in layout['blocks']:
+        if previous is not None and (block['kind'] != 'text' or previous['kind'] == 'table'
+                                     or block['top'] - previous['bottom'] > block['bottom'] - block['top']):
+            lines.append('')
+        if block['kind'] == 'heading':
+            lines.append(f"{'#' * block['level']} {block['text']}")
+        elif block['kind'] == 'table':
+            lines.extend(f"| {' | '.join(row)} |" for row in block['rows'])
+        else:
+            lines.append(block['text'])
+        previous = block
+    return '\n'.join(lines) + '\n'
+
+
+def _build_stats(layouts, pages, started, cached, boilerplate_lines):
+    """Summarize an extraction run"""
+    seconds = time.perf_counter() - started
+    kinds = Counter(block['kind'] for layout in layouts for block in layout['blocks'])
+    return {
+        'pages': len(pages),
+        'chars': sum(len(page) for page in pages),
+        'headings': kinds['heading'],
+        'tables': kinds['table'],
+        'boilerplate_lines': boilerplate_lines,
+        'seconds': seconds,
+        'pages_per_sec': len(pages) / seconds if seconds > 0 else float(len(pages)),
+        'cached': cached,
+    }
+
+
+def extract_pdf_layout(pdf_source, progress_callback=None, max_workers=None, use_cache=True):
+    """
+    Extract the layout of every page of a PDF, in page order, before
+    headers and footers are stripped (see _page_layout for the format).
+
+    pdf_source may be a file path, raw bytes or a binary file-like object.
+    progress_callback(done_pages, total_pages) is called from the calling thread.
+    With use_cache, page layouts are looked up in and stored to the extraction
+    cache keyed by the SHA-256 of the PDF bytes.
+    Returns (layouts, cached).
+    """
+    source = _normalize_source(pdf_source)
+
+    key = None
+    if use_cache:
+        key = extraction_cache.cache_key(_source_bytes(source), EXTRACTOR_VERSION)
+        layouts = extraction_cache.load_pages(key)
+        if layouts is not None:
+            return layouts, True
+
+    with _open_pdf(source) as pdf:
+        num_pages = len(pdf.pages)
+        workers = min(max_workers or MAX_WORKERS, num_pages)
+
+        layouts = None
+        if workers > 1 and num_pages >= PARALLEL_PAGE_THRESHOLD:
+            try:
+                layouts = _extract_parallel(source, num_pages, workers, progress_callback)
+            except (BrokenProcessPool, OSError):
+                # Sandboxed hosts may refuse to fork; fall back to a single core
+                layouts = None
+        if layouts is None:
+            layouts = _extract_serial(pdf, num_pages, progress_callback)
+
+    if key:
+        extraction_cache.store_pages(key, layouts)
+    return layouts, False
+
+
+def extract_pdf_pages(pdf_source, progress_callback=None, max_workers=None, use_cache=True):
+    """
+    Extract the compact text of every page of a PDF, in page order, with
+    repeated headers and footers removed. Arguments as for extract_pdf_layout.
+    Returns (pages, stats) where stats holds pages, chars, headings, tables,
+    boilerplate_lines, seconds, pages_per_sec and cached.
+    """
+    started = time.perf_counter()
+    layouts, cached = extract_pdf_layout(pdf_source, progress_callback, max_workers, use_cache)
+    layouts, boilerplate_lines = strip_repeated_lines(layouts)
+    pages = [render_page(number, layout) for number, layout in enumerate(layouts, start=1)]
+    return pages, _build_stats(layouts, pages, started, cached, boilerplate_lines)
+
+
+def extract_pdf_text(pdf_source, progress_callback=None, max_workers=None, use_cache=True):
+    """Extract the full PDF text joined once in page order; returns (text, stats)"""
+    pages, stats = extract_pdf_pages(pdf_source, progress_callback, max_workers, use_cache)
+    return "\n".join(pages), stats
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Requirements Chunking
+Author: Created for QA Team
+Description: Splits large requirement documents at section headings and
+             map-reduces test case generation over the chunks
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Configuration
+MAX_CHUNK_CHARS = 40000      # Roughly 10k input tokens per chunk
+CHUNK_CASE_RANGE = "15-25"   # Test cases requested per chunk instead of 40-60 for the whole document
+MAX_PARALLEL_CHUNKS = 4
+
+# Markdown headings from layout-aware PDF extraction ("## 3.2 Login"), numbered
+# headings ("3.2 Login"), keyword headings ("Section 4: Payments") and short
+# ALL-CAPS lines ("ORDER TRACKING"). A [Page N] marker right before a heading
+# starts the section with it, so page breaks do not split a heading from its text.
+PAGE_MARKER_PATTERN = re.compile(r"^\[Page \d+\]\n", re.MULTILINE)
+PAGE_NUMBER_PATTERN = re.compile(r"^\[Page (\d+)\]$", re.MULTILINE)
+HEADING_PATTERN = re.compile(
+    r"^(?:\[Page \d+\]\n+)?\s*(?:"
+    r"#{1,3}[ \t]+\S[^\n]{0,100}"
+    r"|\d+(?:\.\d+)*\.?\s+[A-Z][^\n]{0,100}"
+    r"|(?:Section|Chapter|Module|Feature|Epic|User Story)\b[^\n]{0,100}"
+    r"|[A-Z][A-Z0-9 &/()\-]{3,80}"
+    r")\s*$",
+    re.MULTILINE
+)
+
+
+def split_sections(text):
+    """Split text into sections, each starting at a heading line"""
+    starts = [match.start() for match in HEADING_PATTERN.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:]) if text[start:end].strip()]
+
+
+def _split_oversized(section, max_chars):
+    """Split a section longer than max_chars at paragraph, then line boundaries"""
+    pieces = []
+    remaining = section
+    while len(remaining) > max_chars:
+        cut = remaining.rfind('\n\n', 0, max_chars)
+        if cut <= 0:
+            cut = remaining.rfind('\n', 0, max_chars)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(remaining[:cut])
+        remaining = remaining[cut:]
+    if remaining.strip():
+        pieces.append(remaining)
+    return pieces
+
+
+def split_requirements(text, max_chars=MAX_CHUNK_CHARS):
+    """
+    Split requirements text into chunks of at most max_chars, packing whole
+    sections together and only breaking inside a section when it is too long
+    on its own.
+    """
+    chunks = []
+    current = ""
+    for section in split_sections(text):
+        for piece in _split_oversized(section, max_chars):
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current)
+                current = ""
+            current += piece
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def label_chunk(chunk_text, chunk_index, total):
+    """Prefix a chunk with its place in the document so Claude knows it sees only part of it"""
+    return f"[Part {chunk_index + 1} of {total} of the requirements document]\n{chunk_text}"
+
+
+def renumber_test_cases(test_cases, start=1):
+    """Assign sequential TC_### IDs in list order"""
+    for number, test_case in enumerate(test_cases, start=start):
+        test_case['id'] = f"TC_{number:03d}"
+    return test_cases
+
+
+def map_chunks(chunks, generate_chunk, max_workers=MAX_PARALLEL_CHUNKS, progress_callback=None, failures=None):
+    """
+    Run generate_chunk(chunk, chunk_index) concurrently for every chunk and
+    return the results in chunk order (None results become empty lists).
+
+    progress_callback(done_chunks, total_chunks, chunk_index, chunk_result) is
+    called from the calling thread as chunks finish.
+    With a failures list, a chunk that raises does not abort the others: its
+    result is an empty list and (chunk_index, exception) is appended to
+    failures. Without one, the first exception is raised.
+    """
+    results = [None] * len(chunks)
+    if not chunks:
+        return results
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as pool:
+        futures = {pool.submit(generate_chunk, chunk, index): index for index, chunk in enumerate(chunks)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                results[index] = future.result() or []
+            except Exception as e:
+                if failures is None:
+                    raise
+                failures.append((index, e))
+                results[index] = []
+            if progress_callback:
+                progress_callback(done, len(chunks), index, results[index])
+    if failures:
+        failures.sort(key=lambda failure: failure[0])
+    return results
+
+
+def map_reduce_test_cases(chunks, generate_chunk, max_workers=MAX_PARALLEL_CHUNKS, progress_callback=None,
+                          failures=None):
+    """
+    Map: run generate_chunk(chunk_text, chunk_index) concurrently for every chunk.
+    Reduce: merge the per-chunk lists in document order and renumber the IDs.
+
+    progress_callback(done_chunks, total_chunks, chunk_index, chunk_cases) is
+    called from the calling thread as chunks finish. failures works as in
+    map_chunks: failed chunks are skipped and recorded instead of aborting.
+    """
+    results = map_chunks(chunks, generate_chunk, max_workers, progress_callback, failures)
+    merged = [test_case for chunk_cases in results for test_case in chunk_cases]
+    return renumber_test_cases(merged)
+
+
+def chunk_span(chunk_text):
+    """Where a chunk sits in the document: its page range if it has page markers, else its first heading"""
+    pages = [int(number) for number in PAGE_NUMBER_PATTERN.findall(chunk_text)]
+    if pages:
+        return f"page {pages[0]}" if pages[0] == pages[-1] else f"pages {pages[0]}-{pages[-1]}"
+    match = HEADING_PATTERN.search(chunk_text)
+    heading = (match.group(0) if match else chunk_text).strip().splitlines()
+    return f"\"{heading[0][:60]}\"" if heading else "empty chunk"
+
+
+def describe_chunk_failures(chunks, failures):
+    """One line per failed chunk: its number, span and error"""
+    return [f"   ❌ Chunk {index + 1}/{len(chunks)} ({chunk_span(chunks[index])}): {error}"
+            for index, error in failures]
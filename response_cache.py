@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Claude Response Cache
+Author: Created for QA Team
+Description: Persistent SQLite cache of Claude responses keyed by a fingerprint
+             of the full request payload, with TTL and size-based eviction
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# Configuration
+CACHE_PATH = os.getenv(
+    'QA_DOCS_RESPONSE_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'qa-docs-generator', 'responses.sqlite3')
+)
+CACHE_TTL_SECONDS = float(os.getenv('QA_DOCS_RESPONSE_CACHE_TTL_HOURS', '168')) * 3600
+CACHE_MAX_BYTES = int(os.getenv('QA_DOCS_RESPONSE_CACHE_MB', '128')) * 1024 * 1024
+
+_default_cache = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def request_fingerprint(request):
+    """SHA-256 of the canonical JSON form of a messages.create payload"""
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed response store. Every operation opens its own short-lived
+    connection, so one cache can be shared by worker threads. Storage errors
+    are treated as misses so a broken cache never breaks generation.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl_seconds=CACHE_TTL_SECONDS, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed"""
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self._ready:
+                conn.executescript(SCHEMA)
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _count(self, conn, name):
+        """Increment a lifetime counter"""
+        conn.execute(
+            "INSERT INTO counters (name, value) VALUES (?, 1) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,)
+        )
+
+    def get(self, request):
+        """Return the cached response JSON for request, or None on a miss"""
+        key = request_fingerprint(request)
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+                if row and now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                if row:
+                    conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                self._count(conn, 'hits' if row else 'misses')
+        except (sqlite3.Error, OSError):
+            row = None
+
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return row[0] if row else None
+
+    def contains(self, request):
+        """True if a fresh response for request is cached (does not touch counters or recency)"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT 1 FROM responses WHERE key = ? AND created >= ?",
+                    (request_fingerprint(request), time.time() - self.ttl_seconds)
+                ).fetchone()
+        except (sqlite3.Error, OSError):
+            return False
+        return row is not None
+
+    def put(self, request, response_json):
+        """Store the response JSON for request, then evict expired and least recently used entries"""
+        key = request_fingerprint(request)
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                    (key, response_json, len(response_json.encode('utf-8')), now, now)
+                )
+                self._evict(conn, now)
+        except (sqlite3.Error, OSError):
+            pass
+
+    def _evict(self, conn, now):
+        """Drop expired entries, then the least recently used until under max_bytes"""
+        conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def stats(self):
+        """Hit/miss counters for this process plus lifetime totals and current size"""
+        stats = {'hits': self.hits, 'misses': self.misses,
+                 'lifetime_hits': 0, 'lifetime_misses': 0, 'entries': 0, 'bytes': 0}
+        try:
+            with self._connect() as conn:
+                for name, value in conn.execute("SELECT name, value FROM counters"):
+                    stats[f'lifetime_{name}'] = value
+                stats['entries'], stats['bytes'] = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+        except (sqlite3.Error, OSError):
+            pass
+        return stats
+
+
+def get_response_cache():
+    """Process-wide response cache, created on first use"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache()
+    return _default_cache
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Claude Response Parsing
+Author: Created for QA Team
+Description: Finds, parses and validates the JSON that Claude returns for test
+             plans and test cases, including arrays that are still being
+             streamed or were cut off part-way
+"""
+
+import json
+import re
+import time
+
+from document_model import TestCase
+
+# Configuration
+TEST_CASE_FIELDS = TestCase.__slots__
+TEST_PLAN_TEXT_FIELDS = ('description', 'introduction', 'goal')
+TEST_PLAN_LIST_FIELDS = (
+    'in_scope', 'out_of_scope', 'functional_requirements', 'non_functional_requirements',
+    'entry_criteria', 'exit_criteria', 'test_data_requirements', 'test_data', 'test_environment',
+    'testing_activities', 'roles_responsibilities', 'roles', 'risks', 'assumptions',
+    'dependencies', 'test_metrics', 'metrics', 'deliverables', 'limitations',
+)
+
+JSON_START = re.compile(r'[\[{]')
+_decoder = json.JSONDecoder()
+
+
+class ResponseParseError(ValueError):
+    """Claude's response did not contain the expected JSON"""
+
+
+def extract_json(response_text, expected_type=None, accept=None):
+    """
+    Return the first JSON value of expected_type (dict or list) in the text
+    that accept(value) approves (any, if accept is None), ignoring leading
+    prose, markdown fences and trailing commentary.
+
+    Each '{' or '[' is tried in order with raw_decode, which stops at the end
+    of the value, so well-formed responses are parsed in one pass. A value
+    that decodes but is rejected (e.g. "[2]" in "see section [2] below") is
+    skipped whole, nested values included. A candidate that breaks is
+    skipped up to where it broke; the first such error is reported only if
+    no later candidate is accepted, since it is then most likely the
+    payload itself, truncated or malformed.
+    """
+    openers = {dict: '{', list: '['}.get(expected_type, '[{')
+    error = None
+    rejected = False
+    match = JSON_START.search(response_text)
+    while match:
+        start = match.start()
+        if response_text[start] in openers:
+            try:
+                value, end = _decoder.raw_decode(response_text, start)
+            except json.JSONDecodeError as e:
+                if e.pos > start + 1:
+                    error = error or ResponseParseError(f"invalid JSON at character {e.pos}: {e.msg}")
+                    match = JSON_START.search(response_text, e.pos)
+                    continue
+            else:
+                if (expected_type is None or isinstance(value, expected_type)) and (accept is None or accept(value)):
+                    return value
+                rejected = True
+                match = JSON_START.search(response_text, end)
+                continue
+        match = JSON_START.search(response_text, start + 1)
+    if error:
+        raise error
+    kind = {dict: 'object', list: 'array'}.get(expected_type, 'value')
+    raise ResponseParseError(f"no {'usable ' if rejected else ''}JSON {kind} found in the response")
+
+
+def has_test_cases(value):
+    """Whether a JSON array holds at least one usable test case"""
+    return any(normalize_test_case(item, number) is not None for number, item in enumerate(value, start=1))
+
+
+def has_test_plan_sections(value):
+    """
+    Whether a JSON object holds a test plan section; a description alone
+    does not count, since every functional requirement object has one too
+    """
+    return any(key in value for key in TEST_PLAN_TEXT_FIELDS + TEST_PLAN_LIST_FIELDS if key != 'description')
+
+
+def normalize_test_case(test_case, number):
+    """
+    Return test_case with every field as text (lists of steps are joined one
+    per line), or None if it is not a usable test case
+    """
+    if not isinstance(test_case, dict) or not (test_case.get('title') or test_case.get('steps')):
+        return None
+    normalized = {}
+    for key, value in test_case.items():
+        if isinstance(value, list):
+            value = "\n".join(str(item) for item in value)
+        elif value is not None and not isinstance(value, str):
+            value = str(value)
+        normalized[key] = value if value is not None else ""
+    normalized.setdefault('id', f"TC_{number:03d}")
+    return normalized
+
+
+def validate_test_cases(test_cases):
+    """Check a parsed test case array; returns (usable test cases, list of problems)"""
+    if not isinstance(test_cases, list):
+        raise ResponseParseError(f"expected a JSON array of test cases, got {type(test_cases).__name__}")
+    valid = []
+    problems = []
+    for number, test_case in enumerate(test_cases, start=1):
+        normalized = normalize_test_case(test_case, number)
+        if normalized is None:
+            problems.append(f"test case {number} dropped: no title or steps")
+            continue
+        missing = [field for field in TEST_CASE_FIELDS if field not in normalized]
+        if missing:
+            problems.append(f"{normalized['id']} missing {', '.join(missing)}")
+        valid.append(normalized)
+    if test_cases and not valid:
+        raise ResponseParseError("no usable test cases in the response")
+    return valid, problems
+
+
+def validate_test_plan(test_plan):
+    """Check a parsed test plan, wrapping single strings given for list sections; returns a list of problems"""
+    if not isinstance(test_plan, dict):
+        raise ResponseParseError(f"expected a JSON object for the test plan, got {type(test_plan).__name__}")
+    known = set(TEST_PLAN_TEXT_FIELDS) | set(TEST_PLAN_LIST_FIELDS)
+    if not known & test_plan.keys():
+        raise ResponseParseError("the JSON object has none of the test plan sections")
+
+    problems = []
+    for field in TEST_PLAN_TEXT_FIELDS:
+        if field not in test_plan:
+            problems.append(f"missing section: {field}")
+    for field in TEST_PLAN_LIST_FIELDS:
+        value = test_plan.get(field)
+        if isinstance(value, str):
+            test_plan[field] = [value]
+            problems.append(f"{field} was text, not a list")
+        elif value is not None and not isinstance(value, list):
+            problems.append(f"{field} has unexpected type {type(value).__name__}")
+    if 'functional_requirements' not in test_plan:
+        problems.append("missing section: functional_requirements")
+    return problems
+
+
+def parse_test_plan(response_text):
+    """
+    Extract and validate the test plan JSON object. Returns (test_plan, stats)
+    where stats has chars, seconds, complete and problems; raises
+    ResponseParseError.
+    """
+    started = time.perf_counter()
+    test_plan = extract_json(response_text, dict, has_test_plan_sections)
+    problems = validate_test_plan(test_plan)
+    return test_plan, {
+        'chars': len(response_text),
+        'seconds': time.perf_counter() - started,
+        'complete': True,
+        'problems': problems,
+    }
+
+
+def parse_test_cases(response_text):
+    """
+    Extract and validate the test case array. If the array was cut off or
+    breaks part-way, every complete test case before the damage is kept and
+    stats['complete'] is False. Returns (test_cases, stats); raises
+    ResponseParseError if no test cases could be recovered.
+    """
+    started = time.perf_counter()
+    complete = True
+    try:
+        test_cases = extract_json(response_text, list, has_test_cases)
+    except ResponseParseError:
+        test_cases = salvage_test_cases(response_text)
+        if not test_cases:
+            raise
+        complete = False
+    test_cases, problems = validate_test_cases(test_cases)
+    return test_cases, {
+        'chars': len(response_text),
+        'seconds': time.perf_counter() - started,
+        'complete': complete,
+        'problems': problems,
+    }
+
+
+def salvage_test_cases(response_text):
+    """
+    Complete test cases from the first array in a cut-off or broken response
+    that yields any; arrays in the prose before it (e.g. "[2]") are passed over
+    """
+    start = response_text.find('[')
+    while start != -1:
+        elements = JsonArrayStreamParser().feed(response_text[start:])
+        if has_test_cases(elements):
+            return elements
+        start = response_text.find('[', start + 1)
+    return []
+
+
+def describe_parse_stats(stats, what):
+    """Parse summary line followed by the first few validation problems"""
+    milliseconds = stats['seconds'] * 1000
+    if stats['complete']:
+        lines = [f"✅ Parsed {what} in {milliseconds:.1f} ms ({stats['chars']} characters)"]
+    else:
+        lines = [f"⚠️  Response was incomplete; salvaged {what} in {milliseconds:.1f} ms"]
+    lines += [f"   ⚠️  {problem}" for problem in stats['problems'][:5]]
+    if len(stats['problems']) > 5:
+        lines.append(f"   ⚠️  ...and {len(stats['problems']) - 5} more")
+    return "\n".join(lines)
+
+
+class JsonArrayStreamParser:
+    """
+    Incrementally parse the elements of a top-level JSON array.
+
+    Feed text chunks as they arrive; every element whose closing bracket has
+    been seen is returned by feed(). Text before the opening '[' (such as a
+    ```json fence) is skipped. An element that is not valid JSON stops the
+    parser: feed() returns the elements before it and the error is kept in
+    the error attribute.
+    """
+
+    def __init__(self):
+        self._pending = ""      # Unconsumed text, starting at the current element
+        self._scan_pos = 0      # Position in _pending up to which text has been scanned
+        self._depth = 0         # Nesting depth inside the current element
+        self._in_string = False
+        self._escape = False
+        self._started = False   # Seen the opening '[' of the array
+        self.finished = False   # Seen the closing ']' of the array, or a broken element
+        self.error = None
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return the list of newly completed elements"""
+        if self.finished:
+            return []
+
+        self._pending += chunk
+        elements = []
+        text = self._pending
+        pos = self._scan_pos
+        element_start = 0 if self._depth else None
+
+        while pos < len(text):
+            char = text[pos]
+
+            if not self._started:
+                if char == '[':
+                    self._started = True
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if self._depth == 0:
+                    element_start = pos
+                self._depth += 1
+            elif char in '}]':
+                if self._depth == 0:
+                    # Closing bracket of the top-level array
+                    self.finished = True
+                    pos += 1
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        elements.append(json.loads(text[element_start:pos + 1]))
+                    except json.JSONDecodeError as e:
+                        self.error = e
+                        self.finished = True
+                        break
+                    element_start = None
+            pos += 1
+
+        # Keep only the unfinished element so the buffer never grows past one test case
+        if element_start is not None:
+            self._pending = text[element_start:]
+            self._scan_pos = pos - element_start
+        else:
+            self._pending = ""
+            self._scan_pos = 0
+        return elements
+
+
+def iter_json_array(text_chunks):
+    """Yield elements of a streamed JSON array as soon as each one is complete"""
+    parser = JsonArrayStreamParser()
+    for chunk in text_chunks:
+        yield from parser.feed(chunk)
+        if parser.finished:
+            break
+    if parser.error:
+        raise parser.error
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Test Case Detection
+Author: Created for QA Team
+Description: Finds test cases that differ only in wording (common in large,
+             chunked or incremental suites) using word shingles, MinHash
+             signatures and LSH banding. Each case is compared only with the
+             few earlier cases that share a band, not with every other case,
+             and every near-duplicate is merged into the first case like it.
+"""
+
+import hashlib
+import os
+import random
+import re
+
+# Configuration
+SIMILARITY_THRESHOLD = float(os.getenv('QA_DOCS_DEDUP_THRESHOLD', '0.7'))  # Shingle overlap (Jaccard) that counts as a duplicate
+SHINGLE_WORDS = 2
+LSH_BANDS = 16
+LSH_ROWS = 4                 # Signature length is LSH_BANDS * LSH_ROWS; ~0.5 overlap already makes a candidate
+DEDUP_FIELDS = ('title', 'description', 'steps', 'expected')
+MINHASH_SEED = 1729          # Fixed so the same suite always dedups the same way
+# Filler words that rewording adds or drops; negations ("not", "no", "invalid") are kept on purpose
+STOP_WORDS = frozenset(
+    "a an the to on of in at for with by from is are be been can should will "
+    "that this it its then and or user verify check ensure validate able using".split()
+)
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+STEP_NUMBER_PATTERN = re.compile(r'^\s*\d+[.)]\s*', re.MULTILINE)
+
+_random = random.Random(MINHASH_SEED)
+MINHASH_MASKS = tuple(_random.getrandbits(64) for _ in range(LSH_BANDS * LSH_ROWS))
+
+
+def shingles(test_case):
+    """
+    Set of SHINGLE_WORDS-word sequences in a test case's text, ignoring
+    case, punctuation, step numbers and filler words
+    """
+    text = '\n'.join(str(test_case.get(field) or '') for field in DEDUP_FIELDS)
+    words = [word for word in WORD_PATTERN.findall(STEP_NUMBER_PATTERN.sub('', text.lower()))
+             if word not in STOP_WORDS]
+    if len(words) <= SHINGLE_WORDS:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash(shingle_set):
+    """MinHash signature: per mask, the smallest shingle hash XORed with it"""
+    hashes = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+              for shingle in shingle_set]
+    return tuple(min(value ^ mask for value in hashes) for mask in MINHASH_MASKS)
+
+
+def jaccard(first, second):
+    """Share of shingles two sets have in common"""
+    return len(first & second) / len(first | second) if first or second else 1.0
+
+
+def _platform(test_case):
+    """Platform compared case-insensitively; Android and iOS variants of a case are not duplicates"""
+    return str(test_case.get('platform') or '').strip().lower()
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over the test cases kept so far. add() either keeps a case or
+    merges it into an earlier one whose shingle overlap reaches the
+    threshold, so cases can be checked one at a time as they stream in.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.kept = []          # (test case, shingles)
+        self.buckets = {}       # (band, band of the signature) -> indexes into kept
+        self.duplicates = {}    # index into kept -> [(merged test case, similarity)]
+        self.comparisons = 0
+
+    def add(self, test_case):
+        """Index test_case; returns False if it was merged as a near-duplicate of a kept case"""
+        case_shingles = shingles(test_case)
+        keys = []
+        if case_shingles:
+            signature = minhash(case_shingles)
+            keys = [(band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]) for band in range(LSH_BANDS)]
+            match, similarity = self._best_match(test_case, case_shingles, keys)
+            if match is not None:
+                self.duplicates.setdefault(match, []).append((test_case, similarity))
+                return False
+
+        index = len(self.kept)
+        self.kept.append((test_case, case_shingles))
+        for key in keys:
+            self.buckets.setdefault(key, []).append(index)
+        return True
+
+    def _best_match(self, test_case, case_shingles, keys):
+        """Most similar kept case among those sharing a band, if it reaches the threshold"""
+        candidates = {index for key in keys for index in self.buckets.get(key, ())}
+        best, best_similarity = None, 0.0
+        for index in sorted(candidates):
+            kept_case, kept_shingles = self.kept[index]
+            if _platform(kept_case) != _platform(test_case):
+                continue
+            self.comparisons += 1
+            similarity = jaccard(case_shingles, kept_shingles)
+            if similarity >= self.threshold and similarity > best_similarity:
+                best, best_similarity = index, similarity
+        return best, best_similarity
+
+    def report(self):
+        """
+        What was merged: {'cases', 'removed', 'comparisons', 'clusters'}, where
+        each cluster is {'kept': id, 'title': title, 'merged': [(id, similarity)]}
+        """
+        clusters = [
+            {
+                'kept': self.kept[index][0].get('id', ''),
+                'title': self.kept[index][0].get('title', ''),
+                'merged': [(duplicate.get('id', ''), round(similarity, 2)) for duplicate, similarity in merged],
+            }
+            for index, merged in sorted(self.duplicates.items())
+        ]
+        removed = sum(len(cluster['merged']) for cluster in clusters)
+        return {
+            'cases': len(self.kept) + removed,
+            'removed': removed,
+            'comparisons': self.comparisons,
+            'clusters': clusters,
+        }
+
+
+def remove_near_duplicates(test_cases, threshold=SIMILARITY_THRESHOLD):
+    """
+    Drop test cases that are near-duplicates of an earlier case, keeping the
+    order and IDs of the rest. Returns (kept test cases, report).
+    """
+    index = NearDuplicateIndex(threshold)
+    kept = [test_case for test_case in test_cases if index.add(test_case)]
+    return kept, index.report()
+
+
+def describe_dedup(report, max_clusters=10):
+    """Summary lines of a dedup report: what was merged into what"""
+    if not report['removed']:
+        return [f"🧹 No near-duplicate test cases among {report['cases']}"]
+    pairs = report['cases'] * (report['cases'] - 1) // 2
+    lines = [f"🧹 Merged {report['removed']} near-duplicate test case{'s' if report['removed'] != 1 else ''} "
+             f"into {len(report['clusters'])} ({report['comparisons']} comparisons instead of {pairs})"]
+    for cluster in report['clusters'][:max_clusters]:
+        merged = ', '.join(f"{case_id} ({similarity:.0%})" for case_id, similarity in cluster['merged'])
+        lines.append(f"   {cluster['kept']} {cluster['title']} ← {merged}")
+    if len(report['clusters']) > max_clusters:
+        lines.append(f"   ... and {len(report['clusters']) - max_clusters} more")
+    return lines
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test Case Statistics
+Author: Created for QA Team
+Description: Shared summary statistics for test case suites. The cases are
+             read once into columns, every distribution and cross-tab is
+             counted from those columns, and summaries of many suites combine
+             by adding counts, so dashboards never re-read the test cases.
+"""
+
+from collections import Counter
+
+# Configuration
+STAT_FIELDS = ('priority', 'type', 'module', 'platform')
+FIELD_DEFAULTS = {'priority': 'P2', 'type': 'Functional', 'module': 'General', 'platform': 'Both'}
+CROSS_TABS = (('module', 'priority'), ('type', 'platform'), ('type', 'priority'))
+
+
+def _value(test_case, field):
+    """Field value as a category label; blank values fall back to the field's default"""
+    value = test_case.get(field) if isinstance(test_case, dict) else getattr(test_case, field, None)
+    return str(value).strip() if value not in (None, '') else FIELD_DEFAULTS[field]
+
+
+class TestCaseStats:
+    """Distributions per field and cross-tabs per field pair for one or more suites"""
+    __slots__ = ('total', 'suites', 'distributions', 'cross_tabs')
+
+    def __init__(self, total=0, suites=0, distributions=None, cross_tabs=None):
+        self.total = total
+        self.suites = suites
+        self.distributions = distributions or {field: Counter() for field in STAT_FIELDS}
+        self.cross_tabs = cross_tabs or {pair: Counter() for pair in CROSS_TABS}
+
+    @classmethod
+    def from_test_cases(cls, test_cases):
+        """Summarize one suite (dicts or TestCase objects, any iterable)"""
+        rows = [tuple(_value(test_case, field) for field in STAT_FIELDS) for test_case in test_cases]
+        columns = dict(zip(STAT_FIELDS, zip(*rows))) if rows else {field: () for field in STAT_FIELDS}
+        return cls(
+            total=len(rows),
+            suites=1,
+            distributions={field: Counter(columns[field]) for field in STAT_FIELDS},
+            cross_tabs={(row, column): Counter(zip(columns[row], columns[column])) for row, column in CROSS_TABS},
+        )
+
+    @classmethod
+    def combine(cls, summaries):
+        """Add up the summaries of many suites without touching their test cases"""
+        combined = cls()
+        for stats in summaries:
+            combined.total += stats.total
+            combined.suites += stats.suites
+            for field, counts in stats.distributions.items():
+                combined.distributions.setdefault(field, Counter()).update(counts)
+            for pair, counts in stats.cross_tabs.items():
+                combined.cross_tabs.setdefault(pair, Counter()).update(counts)
+        return combined
+
+    def count(self, field, value):
+        """Test cases whose field has this value"""
+        return self.distributions.get(field, Counter())[value]
+
+    def table(self, row, column):
+        """Cross-tab as {row value: {column value: count}}, rows and columns sorted"""
+        counts = self.cross_tabs.get((row, column), Counter())
+        columns = sorted({column_value for _, column_value in counts})
+        table = {}
+        for row_value, column_value in sorted(counts):
+            table.setdefault(row_value, dict.fromkeys(columns, 0))[column_value] = counts[(row_value, column_value)]
+        return table
+
+    def to_dict(self):
+        """JSON-safe form, e.g. for a job result"""
+        return {
+            'total': self.total,
+            'suites': self.suites,
+            'distributions': {field: dict(counts) for field, counts in self.distributions.items()},
+            'cross_tabs': {f"{row}/{column}": [[row_value, column_value, n]
+                                               for (row_value, column_value), n in counts.items()]
+                           for (row, column), counts in self.cross_tabs.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a summary saved with to_dict()"""
+        return cls(
+            total=data.get('total', 0),
+            suites=data.get('suites', 1),
+            distributions={field: Counter(counts) for field, counts in data.get('distributions', {}).items()},
+            cross_tabs={tuple(pair.split('/', 1)): Counter({(row_value, column_value): n
+                                                            for row_value, column_value, n in cells})
+                        for pair, cells in data.get('cross_tabs', {}).items()},
+        )
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Test Case Store
+Author: Created for QA Team
+Description: Local SQLite repository of every generated test case suite,
+             written by the CLI, batch runs and the web UI. Cases are indexed
+             by project, module, priority and type, and titles and steps are
+             full-text searchable, so finding an existing case is one query
+             instead of grepping loose JSON files.
+
+Usage:
+    python3 test_case_store.py [search words] [--project=NAME] [--module=NAME]
+                               [--priority=P1] [--type=Security] [--limit=50]
+    python3 test_case_store.py --projects
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Configuration
+STORE_PATH = os.getenv(
+    'QA_DOCS_TEST_CASE_DB',
+    os.path.join(os.path.expanduser('~'), '.local', 'share', 'qa-docs-generator', 'test_cases.sqlite3')
+)
+SEARCH_LIMIT = 50
+FILTER_FIELDS = ('project', 'module', 'priority', 'type')
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS suites (
+    project TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    test_case_count INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_cases (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    case_id TEXT,
+    module TEXT,
+    priority TEXT,
+    type TEXT,
+    platform TEXT,
+    title TEXT,
+    steps TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS test_cases_project ON test_cases (project);
+CREATE INDEX IF NOT EXISTS test_cases_module ON test_cases (module);
+CREATE INDEX IF NOT EXISTS test_cases_priority ON test_cases (priority);
+CREATE INDEX IF NOT EXISTS test_cases_type ON test_cases (type);
+"""
+
+# External-content FTS5 index kept in step with test_cases by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS test_cases_fts USING fts5(
+    title, steps, content='test_cases', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS test_cases_fts_insert AFTER INSERT ON test_cases BEGIN
+    INSERT INTO test_cases_fts (rowid, title, steps) VALUES (new.id, new.title, new.steps);
+END;
+CREATE TRIGGER IF NOT EXISTS test_cases_fts_delete AFTER DELETE ON test_cases BEGIN
+    INSERT INTO test_cases_fts (test_cases_fts, rowid, title, steps) VALUES ('delete', old.id, old.title, old.steps);
+END;
+"""
+
+
+def _text(value):
+    """Column text of a field; lists (e.g. numbered steps) are joined one item per line"""
+    if isinstance(value, (list, tuple)):
+        return '\n'.join(str(item) for item in value)
+    return str(value).strip() if value not in (None, '') else None
+
+
+def _match_query(text):
+    """
+    FTS5 query for free text: every word must match, quoted so punctuation
+    in the search box is never read as query syntax; a trailing * keeps
+    prefix matching (e.g. "login*")
+    """
+    terms = []
+    for word in text.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return ' '.join(terms)
+
+
+class TestCaseStore:
+    """
+    SQLite-backed test case repository holding the latest suite of every
+    project. Every operation opens its own short-lived connection, so one
+    store can be shared by worker threads. Full-text search uses FTS5 when
+    the SQLite build has it and falls back to LIKE matching otherwise.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.full_text = False
+        self._ready = False
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed"""
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            if not self._ready:
+                conn.executescript(SCHEMA)
+                try:
+                    conn.executescript(FTS_SCHEMA)
+                    self.full_text = True
+                except sqlite3.OperationalError:
+                    self.full_text = False   # SQLite built without FTS5
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save_suite(self, project, test_cases, source='cli'):
+        """
+        Store a project's test cases, replacing the suite saved for it
+        before. source records what wrote it (cli, batch, web). Returns the
+        number of test cases stored.
+        """
+        rows = [
+            (project, _text(tc.get('id')), _text(tc.get('module')), _text(tc.get('priority')),
+             _text(tc.get('type')), _text(tc.get('platform')), _text(tc.get('title')),
+             _text(tc.get('steps')), json.dumps(tc, ensure_ascii=False))
+            for tc in test_cases
+        ]
+        with self._connect() as conn:
+            conn.execute("DELETE FROM test_cases WHERE project = ?", (project,))
+            conn.executemany(
+                "INSERT INTO test_cases (project, case_id, module, priority, type, platform, title, steps, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO suites (project, source, test_case_count, updated) VALUES (?, ?, ?, ?)",
+                (project, source, len(rows), time.time())
+            )
+        return len(rows)
+
+    def search(self, text=None, limit=SEARCH_LIMIT, **filters):
+        """
+        Test cases matching every word of text in their title or steps and
+        every given filter (project, module, priority, type), best matches
+        first. Each result is the stored test case dict plus its project.
+        """
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown filter: {', '.join(sorted(unknown))}")
+        where, params = [], []
+        for field, value in filters.items():
+            if value:
+                where.append(f"t.{field} = ?")
+                params.append(value)
+
+        order = "t.project, t.id"
+        source = "test_cases t"
+        with self._connect() as conn:
+            query = _match_query(text or '')
+            if query and self.full_text:
+                source = "test_cases_fts f JOIN test_cases t ON t.id = f.rowid"
+                where.append("test_cases_fts MATCH ?")
+                params.append(query)
+                order = "f.rank"
+            elif query:
+                for word in (text or '').split():
+                    where.append("(t.title LIKE ? OR t.steps LIKE ?)")
+                    params += [f"%{word.rstrip('*')}%"] * 2
+
+            sql = f"SELECT t.project, t.data FROM {source}"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += f" ORDER BY {order} LIMIT ?"
+            rows = conn.execute(sql, params + [limit]).fetchall()
+        return [{'project': project, **json.loads(data)} for project, data in rows]
+
+    def projects(self):
+        """Stored suites, most recently updated first: [{project, source, test_case_count, updated}]"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT project, source, test_case_count, updated FROM suites ORDER BY updated DESC"
+            ).fetchall()
+        return [dict(zip(('project', 'source', 'test_case_count', 'updated'), row)) for row in rows]
+
+    def values(self, field):
+        """Distinct stored values of a filter field, e.g. to fill a dropdown"""
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"unknown filter: {field}")
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT DISTINCT {field} FROM test_cases WHERE {field} IS NOT NULL ORDER BY {field}"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+def get_test_case_store():
+    """Process-wide test case store, created on first use"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = TestCaseStore()
+        return _default_store
+
+
+def main():
+    """Search the store from the command line"""
+    words = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    store = get_test_case_store()
+
+    if '--projects' in sys.argv:
+        suites = store.projects()
+        print(f"🗄️  {len(suites)} projects in {store.path}")
+        for suite in suites:
+            updated = time.strftime('%Y-%m-%d %H:%M', time.localtime(suite['updated']))
+            print(f"   {suite['project']}: {suite['test_case_count']} test cases ({suite['source']}, {updated})")
+        return
+
+    try:
+        limit = options.pop('limit', str(SEARCH_LIMIT))
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValueError(f"--limit must be a positive integer, got {limit!r}")
+        limit = int(limit)
+        results = store.search(' '.join(words), limit=limit, **options)
+    except ValueError as e:
+        print(f"❌ {e}")
+        print(f"   Filters: {', '.join(f'--{field}=...' for field in FILTER_FIELDS)}, --limit=N")
+        sys.exit(1)
+
+    print(f"🔎 {len(results)} test case{'s' if len(results) != 1 else ''} found")
+    for tc in results:
+        print(f"   {tc.get('id', '-')} [{tc.get('priority', '-')}] {tc['project']} › "
+              f"{tc.get('module', '-')}: {tc.get('title', '')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Parallel Test Plan Sections
+Author: Created for QA Team
+Description: Splits a test plan prompt into independent section groups that
+             are generated as concurrent, smaller Claude calls and merged back
+             into one test plan dict, so the wait is set by the slowest group
+             instead of the whole plan's output
+"""
+
+import json
+import time
+
+from response_parsing import ResponseParseError, extract_json, validate_test_plan
+
+# Configuration
+# Keys from both the CLI and the web UI layouts; a group only asks for the keys its prompt has
+PLAN_SECTION_GROUPS = (
+    ('overview', ('project_name', 'version', 'project_info', 'description', 'introduction', 'goal')),
+    ('strategy and scope', ('test_strategy', 'scope', 'in_scope', 'out_of_scope')),
+    ('functional requirements', ('functional_requirements',)),
+    ('quality and criteria', ('non_functional_requirements', 'impact_zones', 'entry_criteria', 'exit_criteria')),
+    ('environment and activities', ('test_data_requirements', 'test_data', 'test_environment',
+                                    'testing_activities', 'roles_responsibilities', 'roles')),
+    ('risks and reporting', ('risks', 'assumptions', 'dependencies', 'defect_management',
+                             'test_metrics', 'metrics', 'deliverables', 'limitations')),
+)
+
+# Keys whose content runs longest and grows with the document; every other key weighs 1
+KEY_WEIGHTS = {'functional_requirements': 10, 'non_functional_requirements': 2, 'test_strategy': 2,
+               'testing_activities': 2, 'risks': 2}
+
+
+def outline_text(value):
+    """
+    value escaped for use inside a string of the instructions' JSON outline,
+    so a project name with quotes or backslashes keeps the outline valid JSON
+    """
+    return json.dumps(str(value), ensure_ascii=False)[1:-1]
+
+
+def plan_section_instructions(instructions):
+    """
+    Split full test plan instructions into one prompt per section group.
+    The JSON outline in the instructions is cut down to the group's keys and
+    the text around it is kept, so every group gets the same guidance.
+    Returns a list of (group name, keys, instructions).
+    """
+    start = instructions.index('\n{') + 1
+    outline, end = json.JSONDecoder().raw_decode(instructions, start)
+    prefix, suffix = instructions[:start], instructions[end:]
+
+    groups = []
+    for name, keys in PLAN_SECTION_GROUPS:
+        keys = tuple(key for key in keys if key in outline)
+        if not keys:
+            continue
+        part = json.dumps({key: outline[key] for key in keys}, indent=2, ensure_ascii=False)
+        note = (f"\n\nThis request covers only the {name} part of the test plan; the other sections are "
+                f"written separately. Return a JSON object with exactly these keys: {', '.join(keys)}.")
+        groups.append((name, keys, f"{prefix}{part}{suffix}{note}"))
+    return groups
+
+
+def section_share(keys, groups):
+    """
+    Share of the whole test plan's output that the group with these keys
+    writes, by weighted key count across all groups, so each parallel call
+    reserves max_tokens for its own part only
+    """
+    total = sum(KEY_WEIGHTS.get(key, 1) for _, group_keys, _ in groups for key in group_keys)
+    return sum(KEY_WEIGHTS.get(key, 1) for key in keys) / total if total else 1.0
+
+
+def merge_test_plan_sections(responses):
+    """
+    Parse each group's response and merge them, in group order, into one
+    test plan. responses is a list of (group name, keys, response text); a
+    group that cannot be parsed is reported as a problem instead of failing
+    the others. Returns (test_plan, stats) like parse_test_plan.
+    """
+    started = time.perf_counter()
+    test_plan = {}
+    failed = []
+    for name, keys, response_text in responses:
+        try:
+            part = extract_json(response_text, dict, lambda value: any(key in value for key in keys))
+        except ResponseParseError as e:
+            failed.append(f"{name} sections not generated: {e}")
+            continue
+        for key in keys:
+            if key in part:
+                test_plan[key] = part[key]
+        for key, value in part.items():
+            test_plan.setdefault(key, value)
+
+    if not test_plan:
+        raise ResponseParseError("no test plan sections could be parsed")
+    problems = failed + validate_test_plan(test_plan)
+    return test_plan, {
+        'chars': sum(len(response_text) for _, _, response_text in responses),
+        'seconds': time.perf_counter() - started,
+        'complete': not failed,
+        'problems': problems,
+    }
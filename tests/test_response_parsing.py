@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Claude Response Parsing Tests
+Author: Created for QA Team
+Description: Bracketed prose around the JSON must not be mistaken for the
+             test cases or the test plan
+Usage: python3 -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from response_parsing import ResponseParseError, parse_test_cases, parse_test_plan
+
+TEST_CASES_JSON = '[{"id": "TC_001", "title": "Login works", "steps": ["Open app", "Log in"]}]'
+
+
+def test_test_cases_after_bracketed_section_number():
+    test_cases, stats = parse_test_cases(f"Per section [2] of the spec:\n{TEST_CASES_JSON}")
+    assert [tc['id'] for tc in test_cases] == ['TC_001']
+    assert stats['complete']
+
+
+def test_truncated_test_cases_are_salvaged():
+    response = f'Per section [2]:\n[{TEST_CASES_JSON[1:-1]}, {{"id": "TC_002", "title": "Log'
+    test_cases, stats = parse_test_cases(response)
+    assert [tc['id'] for tc in test_cases] == ['TC_001']
+    assert not stats['complete']
+
+
+def test_test_plan_after_bracketed_object():
+    response = 'Using {"format": "json"} as asked:\n```json\n{"introduction": "Intro", "goal": "Goal"}\n```'
+    test_plan, _ = parse_test_plan(response)
+    assert test_plan['goal'] == 'Goal'
+
+
+def test_truncated_test_plan_is_reported():
+    response = '{"introduction": "Intro", "functional_requirements": [{"id": "FR_1", "description": "x"}, {"id'
+    with pytest.raises(ResponseParseError, match="invalid JSON"):
+        parse_test_plan(response)
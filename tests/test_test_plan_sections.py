@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Parallel Test Plan Sections Tests
+Author: Created for QA Team
+Description: The section groups must be recoverable from the test plan
+             instructions for any project name, including names with quotes
+Usage: python3 -m pytest tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import generate_test_plan
+import web_ui_app
+from test_plan_sections import plan_section_instructions
+
+QUOTED_NAME = 'ACME "Orders" v2 \\ Beta'
+
+
+def test_cli_instructions_split_with_quoted_project_name():
+    groups = plan_section_instructions(generate_test_plan.build_test_plan_instructions(QUOTED_NAME))
+    assert [name for name, _, _ in groups][:3] == ['overview', 'strategy and scope', 'functional requirements']
+    assert 'ACME \\"Orders\\" v2 \\\\ Beta' in groups[0][2]
+
+
+def test_web_instructions_split_with_quoted_project_name():
+    groups = plan_section_instructions(web_ui_app.build_test_plan_instructions(QUOTED_NAME))
+    overview = next(instructions for name, _, instructions in groups if name == 'overview')
+    assert '"name": "ACME \\"Orders\\" v2 \\\\ Beta"' in overview
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Token Budget Estimator
+Author: Created for QA Team
+Description: Pre-flight estimate of a request's input tokens from the
+             extracted text, used to size max_tokens and the number of test
+             cases asked for so the answer fits in one response, and to
+             switch to chunked generation when a single call cannot hold it
+"""
+
+import math
+import re
+
+# Configuration
+CHARS_PER_TOKEN = 3.5              # Conservative for English specs; errs towards more tokens
+INSTRUCTION_TOKENS = 1000          # Prompt instructions around the requirements block
+CONTEXT_WINDOW_TOKENS = 200000
+MAX_OUTPUT_TOKENS = 21000          # Largest max_tokens the SDK accepts for a non-streaming call
+MAX_STREAM_OUTPUT_TOKENS = 64000   # The model's output limit, reachable when streaming
+MIN_OUTPUT_TOKENS = 2000
+OUTPUT_MARGIN = 1.25               # Headroom over the estimate before a response would be cut off
+TOKENS_PER_TEST_CASE = 350         # One test case object with numbered steps and expected results
+TEST_PLAN_BASE_TOKENS = 6000       # A test plan's fixed sections
+TEST_PLAN_TOKENS_PER_INPUT = 0.1   # Longer specs list more requirements, scope items and risks
+CASE_RANGES = (                    # Test cases asked for in one call, by input tokens
+    (3000, "15-25"),
+    (8000, "25-40"),
+)
+DEFAULT_CASE_RANGE = "40-60"
+
+CASE_RANGE_NUMBERS = re.compile(r'\d+')
+
+
+def estimate_tokens(text):
+    """Approximate token count of text"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def case_range_bounds(case_range):
+    """(smallest, largest) test case count of a range such as "40-60" """
+    numbers = [int(number) for number in CASE_RANGE_NUMBERS.findall(case_range)]
+    return min(numbers), max(numbers)
+
+
+def output_budget(expected_tokens, streaming=False):
+    """max_tokens for an expected output size: margin added, rounded up to 1000 and capped"""
+    cap = MAX_STREAM_OUTPUT_TOKENS if streaming else MAX_OUTPUT_TOKENS
+    budget = math.ceil(expected_tokens * OUTPUT_MARGIN / 1000) * 1000
+    return max(MIN_OUTPUT_TOKENS, min(cap, budget))
+
+
+def test_cases_max_tokens(case_range, streaming=False):
+    """max_tokens for a test case array of case_range items"""
+    return output_budget(case_range_bounds(case_range)[1] * TOKENS_PER_TEST_CASE, streaming)
+
+
+def test_plan_max_tokens(requirements_text, streaming=False, share=1.0):
+    """
+    max_tokens for a test plan of this requirements document, or for the
+    share (0-1) of it that one section group writes
+    """
+    expected = TEST_PLAN_BASE_TOKENS + estimate_tokens(requirements_text) * TEST_PLAN_TOKENS_PER_INPUT
+    return output_budget(expected * share, streaming)
+
+
+def plan_test_cases(requirements_text, streaming=False):
+    """
+    Size a single test case call for this document. The test case range
+    grows with the input and is trimmed to what max_tokens can hold. Returns
+    a dict with input_tokens, case_range, max_tokens, and chunked, which is
+    True when even the trimmed range or the input does not fit one call.
+    """
+    input_tokens = estimate_tokens(requirements_text) + INSTRUCTION_TOKENS
+    case_range = DEFAULT_CASE_RANGE
+    for max_input, ranged in CASE_RANGES:
+        if input_tokens <= max_input:
+            case_range = ranged
+            break
+
+    smallest, largest = case_range_bounds(case_range)
+    cap = MAX_STREAM_OUTPUT_TOKENS if streaming else MAX_OUTPUT_TOKENS
+    fitting = int(cap / (TOKENS_PER_TEST_CASE * OUTPUT_MARGIN))
+    if largest > fitting:
+        largest = fitting
+        case_range = f"{smallest}-{largest}"
+    max_tokens = test_cases_max_tokens(case_range, streaming)
+    fits = largest >= smallest and input_tokens + max_tokens <= CONTEXT_WINDOW_TOKENS
+    return {
+        'input_tokens': input_tokens,
+        'case_range': case_range,
+        'max_tokens': max_tokens,
+        'chunked': not fits,
+    }
+
+
+def describe_budget(budget):
+    """One-line summary of a test case budget"""
+    if budget['chunked']:
+        return (f"📏 ~{budget['input_tokens']} input tokens: too large for one call, "
+                f"switching to chunked generation")
+    return (f"📏 ~{budget['input_tokens']} input tokens: asking for {budget['case_range']} test cases "
+            f"with max_tokens={budget['max_tokens']}")
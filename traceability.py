@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Requirement Traceability
+Author: Created for QA Team
+Description: Links every test case to the test plan's functional
+             requirements (FR-###), by requirement IDs named in the case and by
+             TF-IDF word similarity between the case's module, title and
+             description and each requirement. The resulting matrix shows
+             which requirements have no test cases, and gap filling asks Claude
+             for test cases of exactly those requirements instead of
+             regenerating the whole suite.
+"""
+
+import math
+import re
+from collections import Counter
+
+from incremental_generation import TEST_CASE_NUMBER
+from requirements_chunking import MAX_PARALLEL_CHUNKS, map_chunks
+from test_case_dedup import STOP_WORDS, NearDuplicateIndex
+
+# Configuration
+LEXICAL_THRESHOLD = 0.35      # Cosine similarity a word match needs to count as a link
+RELATIVE_CUTOFF = 0.6         # Also link other requirements scoring at least this share of the best one
+MAX_LEXICAL_LINKS = 3
+GAPS_PER_CALL = 8             # Uncovered requirements sent to Claude in one gap filling call
+CASES_PER_GAP = (2, 4)
+
+REQUIREMENT_ID_PATTERN = re.compile(r'\b([A-Z]{1,6})[-_ ]?(\d{1,4}(?:\.\d{1,3})*)\b')
+WORD_PATTERN = re.compile(r'[a-z][a-z0-9]+')
+CASE_TEXT_FIELDS = ('module', 'title', 'description')
+
+
+def _id_key(text):
+    """Comparable form of a requirement ID: "FR-001", "FR 1" and "fr_1" all give ('FR', (1,))"""
+    match = REQUIREMENT_ID_PATTERN.fullmatch(str(text).strip().upper())
+    if not match:
+        return None
+    return match.group(1), tuple(int(part) for part in match.group(2).split('.'))
+
+
+def _words(text):
+    """Content words of text, lower-cased, with a plural 's' dropped"""
+    words = []
+    for word in WORD_PATTERN.findall(str(text).lower()):
+        if word in STOP_WORDS:
+            continue
+        words.append(word[:-1] if len(word) > 3 and word.endswith('s') and not word.endswith('ss') else word)
+    return words
+
+
+def _weights(counts, idf):
+    """TF-IDF vector of word counts, scaled to unit length"""
+    vector = {word: count * idf.get(word, 0.0) for word, count in counts.items()}
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    return {word: weight / norm for word, weight in vector.items()} if norm else {}
+
+
+def plan_requirements(test_plan):
+    """The plan's functional requirements as [{'id', 'title', 'details'}]; missing IDs become FR-###"""
+    requirements = []
+    for number, requirement in enumerate(test_plan.get('functional_requirements') or [], start=1):
+        if isinstance(requirement, dict):
+            criteria = requirement.get('acceptance_criteria') or []
+            if isinstance(criteria, str):
+                criteria = [criteria]
+            requirements.append({
+                'id': str(requirement.get('id') or f"FR-{number:03d}"),
+                'title': str(requirement.get('title') or ''),
+                'details': ' '.join([str(requirement.get('description') or '')] + [str(c) for c in criteria]).strip(),
+            })
+        elif requirement:
+            requirements.append({'id': f"FR-{number:03d}", 'title': str(requirement), 'details': ''})
+    return requirements
+
+
+def build_traceability(test_plan, test_cases):
+    """
+    Link test cases to the plan's functional requirements. A requirement ID
+    anywhere in a test case always links it; otherwise the case links to the
+    requirements most similar to its module, title and description.
+    Returns the traceability matrix:
+      {'requirements': [{'id', 'title', 'test_cases': [ids]}],
+       'test_cases': [{'id', 'title', 'requirements': [{'id', 'match', 'score'}]}],
+       'uncovered': [requirement ids], 'unlinked': [test case ids], 'coverage': 0.0-1.0}
+    """
+    requirements = plan_requirements(test_plan)
+    by_key = {}
+    for requirement in requirements:
+        by_key.setdefault(_id_key(requirement['id']), requirement['id'])
+    by_key.pop(None, None)
+
+    # Requirement vectors weighted by how rare each word is across requirements; the
+    # title counts twice since it names the feature the test cases are about
+    requirement_counts = [Counter(_words(f"{requirement['title']} {requirement['title']} {requirement['details']}"))
+                          for requirement in requirements]
+    document_frequency = Counter(word for counts in requirement_counts for word in counts)
+    idf = {word: math.log((len(requirements) + 1) / (count + 1)) + 1 for word, count in document_frequency.items()}
+    requirement_vectors = [_weights(counts, idf) for counts in requirement_counts]
+
+    linked = {requirement['id']: [] for requirement in requirements}
+    case_rows = []
+    for test_case in test_cases:
+        links = {}
+        text = ' '.join(str(value) for key, value in test_case.items() if key != 'id' and value)
+        for prefix, number in REQUIREMENT_ID_PATTERN.findall(text.upper()):
+            requirement_id = by_key.get(_id_key(f"{prefix}-{number}"))
+            if requirement_id:
+                links[requirement_id] = {'id': requirement_id, 'match': 'id', 'score': 1.0}
+
+        if not links and requirements:
+            vector = _weights(Counter(_words(' '.join(str(test_case.get(field) or '') for field in CASE_TEXT_FIELDS))),
+                              idf)
+            scores = sorted(
+                ((sum(weight * requirement_vector.get(word, 0.0) for word, weight in vector.items()), requirement['id'])
+                 for requirement, requirement_vector in zip(requirements, requirement_vectors)),
+                reverse=True
+            )
+            best = scores[0][0]
+            for score, requirement_id in scores[:MAX_LEXICAL_LINKS]:
+                if score >= LEXICAL_THRESHOLD and score >= best * RELATIVE_CUTOFF:
+                    links[requirement_id] = {'id': requirement_id, 'match': 'lexical', 'score': round(score, 2)}
+
+        case_id = str(test_case.get('id', ''))
+        for requirement_id in links:
+            linked[requirement_id].append(case_id)
+        case_rows.append({'id': case_id, 'title': str(test_case.get('title', '')), 'requirements': list(links.values())})
+
+    uncovered = [requirement['id'] for requirement in requirements if not linked[requirement['id']]]
+    return {
+        'requirements': [{'id': requirement['id'], 'title': requirement['title'],
+                          'test_cases': linked[requirement['id']]} for requirement in requirements],
+        'test_cases': case_rows,
+        'uncovered': uncovered,
+        'unlinked': [row['id'] for row in case_rows if not row['requirements']],
+        'coverage': (len(requirements) - len(uncovered)) / len(requirements) if requirements else 1.0,
+    }
+
+
+def describe_traceability(matrix, max_gaps=10):
+    """Summary lines of a traceability matrix: coverage and the requirements without test cases"""
+    total = len(matrix['requirements'])
+    if not total:
+        return ["🔗 No functional requirements in the test plan to trace"]
+    lines = [f"🔗 {total - len(matrix['uncovered'])}/{total} functional requirements covered "
+             f"({matrix['coverage']:.0%}), {len(matrix['unlinked'])} test cases not linked to any"]
+    titles = {requirement['id']: requirement['title'] for requirement in matrix['requirements']}
+    for requirement_id in matrix['uncovered'][:max_gaps]:
+        lines.append(f"   ❌ {requirement_id} {titles[requirement_id]}")
+    if len(matrix['uncovered']) > max_gaps:
+        lines.append(f"   ... and {len(matrix['uncovered']) - max_gaps} more")
+    return lines
+
+
+def gap_case_range(requirements):
+    """Test cases to ask for when covering these requirements"""
+    return f"{CASES_PER_GAP[0] * len(requirements)}-{CASES_PER_GAP[1] * len(requirements)}"
+
+
+def gap_instructions(instructions, requirements):
+    """
+    Narrow test case instructions to the requirements that have no test
+    cases yet; each case names the requirement it covers so the next trace
+    links it by ID
+    """
+    listed = '\n'.join(f"- {requirement['id']}: {requirement['title']}. {requirement['details']}".rstrip('. ')
+                       for requirement in requirements)
+    return (f"{instructions}\n\n"
+            "SCOPE: The other requirements already have test cases. Write test cases ONLY for these "
+            "requirements, and start each test case title with the ID of the requirement it covers "
+            f"in square brackets, e.g. \"[{requirements[0]['id']}] ...\":\n"
+            f"<requirements>\n{listed}\n</requirements>")
+
+
+def fill_coverage_gaps(test_plan, test_cases, matrix, generate_gaps,
+                       max_workers=MAX_PARALLEL_CHUNKS, progress_callback=None):
+    """
+    Generate test cases for uncovered requirements only, GAPS_PER_CALL at a
+    time. generate_gaps(requirements, group_index) returns the new test cases
+    for one group of requirement dicts (see plan_requirements). New cases that
+    are near-duplicates of existing ones are dropped; the rest get the next
+    free TC_### IDs. Returns (test_cases, matrix, added test cases).
+    """
+    uncovered = set(matrix['uncovered'])
+    gaps = [requirement for requirement in plan_requirements(test_plan) if requirement['id'] in uncovered]
+    if not gaps:
+        return test_cases, matrix, []
+
+    groups = [gaps[start:start + GAPS_PER_CALL] for start in range(0, len(gaps), GAPS_PER_CALL)]
+    results = map_chunks(groups, generate_gaps, max_workers, progress_callback)
+
+    duplicates = NearDuplicateIndex()
+    for test_case in test_cases:
+        duplicates.add(test_case)
+    numbers = [int(match.group(1)) for match in (TEST_CASE_NUMBER.match(str(tc.get('id', ''))) for tc in test_cases)
+               if match]
+    next_number = max(numbers, default=0) + 1
+
+    added = []
+    for test_case in (test_case for group_cases in results for test_case in group_cases):
+        if duplicates.add(test_case):
+            test_case['id'] = f"TC_{next_number:03d}"
+            next_number += 1
+            added.append(test_case)
+
+    test_cases = list(test_cases) + added
+    return test_cases, build_traceability(test_plan, test_cases), added
@@ -9,17 +9,35 @@ import streamlit as st
 import os
 import sys
 import json
-import PyPDF2
-from anthropic import Anthropic
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+import hashlib
+import sqlite3
 import tempfile
+import time
+import uuid
 from datetime import datetime
-import io
+
+# anthropic, python-docx, openpyxl and pdfplumber are imported on first use, not
+# here: Streamlit loads this script for every new session, and those imports
+# cost more than the rest of the page together (see benchmark_startup.py)
+from artifact_store import get_artifact_store
+from document_model import TestPlan
+from generation_jobs import JobCancelled, get_job_queue
+from incremental_generation import (
+    case_range_for, describe_diff, diff_sections, load_section_map, prune_section_map, regenerate_test_cases,
+    section_instructions, section_units,
+)
+from response_cache import get_response_cache
+from response_parsing import normalize_test_case, parse_test_cases, parse_test_plan
+from requirements_chunking import (
+    CHUNK_CASE_RANGE, describe_chunk_failures, label_chunk, map_chunks, map_reduce_test_cases, renumber_test_cases,
+    split_requirements, split_sections,
+)
+from test_case_dedup import describe_dedup, remove_near_duplicates
+from test_case_stats import CROSS_TABS, TestCaseStats
+from test_case_store import get_test_case_store
+from test_plan_sections import merge_test_plan_sections, outline_text, plan_section_instructions, section_share
+from traceability import build_traceability, describe_traceability, fill_coverage_gaps, gap_case_range, gap_instructions
+from token_budget import describe_budget, plan_test_cases, test_cases_max_tokens, test_plan_max_tokens
 
 # Page configuration
 st.set_page_config(
@@ -80,51 +98,103 @@ st.markdown("""
 # Configuration
 CLAUDE_API_KEY = os.getenv('ANTHROPIC_API_KEY')
 MODEL_NAME = "claude-sonnet-4-20250514"
+JOB_POLL_SECONDS = 1.0   # How often the page refreshes a running job's progress
+EXTRACTION_CACHE_ENTRIES = 32   # Extracted uploads kept in memory, shared by all sessions
+ARTIFACT_NAMES = {
+    'test_plan_json': 'Test_Plan.json',
+    'test_cases_json': 'Test_Cases.json',
+    'sections_json': 'Sections.json',   # Section map for incremental updates
+    'traceability_json': 'Traceability.json',
+}
+# Word and Excel files are rendered from the stored JSON on first download
+RENDERED_ARTIFACTS = {
+    'test_plan_docx': ('test_plan_json', 'Test_Plan.docx'),
+    'test_cases_xlsx': ('test_cases_json', 'Test_Cases.xlsx'),
+}
+JOB_STATUS_ICONS = {'queued': '⏳', 'running': '🔄', 'done': '✅', 'failed': '❌', 'cancelled': '🛑'}
+
+
+@st.cache_resource(show_spinner=False)
+def get_anthropic_client():
+    """One Anthropic client, and so one HTTP connection pool, for every session and job"""
+    from claude_client import create_anthropic_client
+    return create_anthropic_client(CLAUDE_API_KEY)
+
+
+@st.cache_resource(show_spinner=False)
+def get_renderers():
+    """The Word/Excel renderers, importing python-docx and openpyxl once on first use"""
+    import document_rendering
+    return document_rendering
+
+
+def upload_hash(uploaded_file):
+    """SHA-256 of an uploaded file, computed once per upload rather than on every rerun"""
+    key = f"upload_hash_{uploaded_file.file_id}"
+    if key not in st.session_state:
+        st.session_state[key] = hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    return st.session_state[key]
 
 
-def read_pdf(pdf_file):
-    """Extract text from uploaded PDF"""
-    text = ""
+def extract_requirements_uncached(pdf_bytes, use_cache=True, progress_callback=None):
+    """Extract the PDF and split it into sections; returns (text, stats)"""
+    from pdf_extraction import extract_pdf_text
+    
+    text, stats = extract_pdf_text(pdf_bytes, progress_callback=progress_callback, use_cache=use_cache)
+    stats['sections'] = len(split_sections(text))
+    stats['chunks'] = len(split_requirements(text))
+    return text, stats
+
+
+@st.cache_data(max_entries=EXTRACTION_CACHE_ENTRIES, show_spinner=False)
+def extract_requirements(pdf_hash, _pdf_bytes):
+    """
+    Extract the uploaded PDF and split it into sections, once per upload hash
+    for every session and rerun. Returns (text, stats).
+    """
+    return extract_requirements_uncached(_pdf_bytes)
+
+
+def read_pdf(uploaded_file, use_cache=True):
+    """
+    Extract text from uploaded PDF. With use_cache off, the PDF is extracted
+    again outside the memoized extract_requirements, with a per-page progress bar.
+    """
     try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        num_pages = len(pdf_reader.pages)
-        
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for page_num in range(num_pages):
-            page = pdf_reader.pages[page_num]
-            text += page.extract_text()
-            progress = (page_num + 1) / num_pages
-            progress_bar.progress(progress)
-            status_text.text(f"📄 Reading page {page_num + 1}/{num_pages}")
-        
-        progress_bar.empty()
-        status_text.empty()
-        return text
+        if use_cache:
+            with st.spinner("📄 Reading PDF..."):
+                text, stats = extract_requirements(upload_hash(uploaded_file), uploaded_file.getvalue())
+        else:
+            progress = st.progress(0.0, text="📄 Reading PDF...")
+            text, stats = extract_requirements_uncached(
+                uploaded_file.getvalue(), use_cache=False,
+                progress_callback=lambda done, total: progress.progress(done / total, text=f"📄 Reading page {done}/{total}")
+            )
+            progress.empty()
     except Exception as e:
         st.error(f"❌ Error reading PDF: {e}")
         return None
-
-
-def generate_test_plan_content(requirements_text, project_name):
-    """Generate test plan using Claude API"""
-    if not CLAUDE_API_KEY:
-        st.error("❌ ANTHROPIC_API_KEY not set in environment variables!")
-        return None
     
-    client = Anthropic(api_key=CLAUDE_API_KEY)
-    
-    prompt = f"""You are a professional QA Test Plan writer. Based on the requirements document below, create a comprehensive test plan for the project "{project_name}".
+    layout = f"{stats['sections']} sections · {stats['tables']} tables"
+    if stats['boilerplate_lines']:
+        layout += f" · {stats['boilerplate_lines']} header/footer lines dropped"
+    if stats['cached']:
+        st.caption(f"♻️ {stats['pages']} pages loaded from extraction cache · {layout}")
+    else:
+        st.caption(f"📄 {stats['pages']} pages extracted at {stats['pages_per_sec']:.1f} pages/sec · {layout}")
+    return text
 
-REQUIREMENTS:
-{requirements_text}
+
+def build_test_plan_instructions(project_name):
+    """Build the test plan instructions that follow the requirements block"""
+    name = outline_text(project_name)
+    return f"""You are a professional QA Test Plan writer. Based on the requirements document above, create a comprehensive test plan for the project "{project_name}".
 
 Generate a detailed test plan in JSON format with these sections (return ONLY JSON, no markdown):
 
 {{
   "project_info": {{
-    "name": "{project_name}",
+    "name": "{name}",
     "version": "1.0",
     "prepared_by": "QA Team",
     "date": "{datetime.now().strftime('%Y-%m-%d')}",
@@ -182,50 +252,77 @@ Generate a detailed test plan in JSON format with these sections (return ONLY JS
   "limitations": ["Testing limitations"]
 }}"""
 
-    try:
-        with st.spinner('🤖 Claude AI is generating test plan...'):
-            response = client.messages.create(
-                model=MODEL_NAME,
-                max_tokens=16000,
-                temperature=0.3,
-                messages=[{"role": "user", "content": prompt}]
-            )
-        
-        response_text = response.content[0].text
-        
-        # Clean response
-        if response_text.strip().startswith('```'):
-            response_text = response_text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            elif response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-        
-        test_plan = json.loads(response_text)
-        return test_plan
+
+def test_plan_request(requirements_text, instructions, share=1.0):
+    """messages.create payload for the test plan or one of its section groups (writing share of the plan)"""
+    from claude_client import requirements_messages
     
-    except Exception as e:
-        st.error(f"❌ Error generating test plan: {e}")
-        return None
+    return {
+        "model": MODEL_NAME,
+        "max_tokens": test_plan_max_tokens(requirements_text, share=share),
+        "temperature": 0.3,
+        "messages": requirements_messages(requirements_text, instructions),
+    }
 
 
-def generate_test_cases_content(requirements_text, project_name):
-    """Generate test cases using Claude API"""
-    if not CLAUDE_API_KEY:
-        st.error("❌ ANTHROPIC_API_KEY not set!")
-        return None
+def request_test_plan(client, requirements_text, project_name):
+    """Call Claude API and parse the test plan (no Streamlit calls, safe in worker threads)"""
+    from claude_client import create_complete
+    
+    instructions = build_test_plan_instructions(project_name)
     
-    client = Anthropic(api_key=CLAUDE_API_KEY)
+    response_text, _ = create_complete(client, test_plan_request(requirements_text, instructions))
     
-    prompt = f"""You are a professional QA Test Case writer. Based on the requirements, create comprehensive test cases for "{project_name}".
+    return parse_test_plan(response_text)
 
-REQUIREMENTS:
-{requirements_text}
 
-Generate 40-60 detailed test cases in JSON format (return ONLY JSON array, no markdown):
+def request_test_plan_parallel(client, requirements_text, project_name, progress_callback=None):
+    """
+    Generate the test plan's section groups as concurrent calls and merge
+    them into one test plan; returns (test_plan, stats) like request_test_plan
+    """
+    from claude_client import create_complete, prime_prompt_cache
+    
+    groups = plan_section_instructions(build_test_plan_instructions(project_name))
+    requests = [test_plan_request(requirements_text, instructions, section_share(keys, groups))
+                for _, keys, instructions in groups]
+    try:
+        # Every group starts with the same requirements block; cache it once before they fan out
+        prime_prompt_cache(client, requests)
+    except Exception:
+        pass   # Only a token saving; the group calls themselves report real API errors
+    
+    response_texts = map_chunks(requests, lambda request, _: create_complete(client, request)[0],
+                                len(requests), progress_callback)
+    return merge_test_plan_sections([
+        (name, keys, response_text) for (name, keys, _), response_text in zip(groups, response_texts)
+    ])
+
+
+def generate_test_plan_content(job, client, requirements_text, project_name, parallel=False, progress_span=0.5):
+    """Generate test plan using Claude API (as concurrent section groups with parallel)"""
+    if parallel:
+        job.update(message='🤖 Claude AI is generating the test plan sections in parallel...')
+        test_plan, stats = request_test_plan_parallel(
+            client, requirements_text, project_name,
+            lambda done, total, index, _: job.update(progress_span * done / total,
+                                                      f"🤖 Test plan sections: {done}/{total} done")
+        )
+    else:
+        job.update(message='🤖 Claude AI is generating test plan...')
+        test_plan, stats = request_test_plan(client, requirements_text, project_name)
+    
+    job.log(f"✅ Parsed test plan in {stats['seconds'] * 1000:.1f} ms")
+    for problem in stats['problems'][:5]:
+        job.log(f"⚠️ {problem}")
+    return test_plan
+
+
+def build_test_cases_instructions(project_name, case_range="40-60"):
+    """Build the test case instructions that follow the requirements block"""
+    return f"""You are a professional QA Test Case writer. Based on the requirements above, create comprehensive test cases for "{project_name}".
+
+Generate {case_range} detailed test cases in JSON format (return ONLY JSON array, no markdown):
 
 [
   {{
@@ -243,338 +340,530 @@ Generate 40-60 detailed test cases in JSON format (return ONLY JSON array, no ma
 ]
 
 Guidelines:
-- Generate 40-60 test cases
+- Generate {case_range} test cases
 - Cover all requirements
 - Include positive, negative, edge cases
 - Priority: P1 (Critical), P2 (High), P3 (Medium)
 - Detailed numbered steps
 - Type coverage: Functional, Integration, UI, Performance, Security"""
 
+
+def test_cases_request(requirements_text, project_name, case_range="40-60", section=None, streaming=False,
+                       requirements=None):
+    """
+    messages.create payload for test cases (only for one section unit, or
+    only for uncovered functional requirements, if given), sized to the case count
+    """
+    from claude_client import requirements_messages
+    
+    instructions = build_test_cases_instructions(project_name, case_range)
+    if section:
+        instructions = section_instructions(instructions, section)
+    if requirements:
+        instructions = gap_instructions(instructions, requirements)
+    return {
+        "model": MODEL_NAME,
+        "max_tokens": test_cases_max_tokens(case_range, streaming),
+        "temperature": 0.3,
+        "messages": requirements_messages(requirements_text, instructions),
+    }
+
+
+def request_test_cases(client, requirements_text, project_name, case_range="40-60", section=None, requirements=None):
+    """Call Claude API and parse the test case array (no Streamlit calls, safe in worker threads)"""
+    from claude_client import create_complete
+    
+    response_text, _ = create_complete(
+        client, test_cases_request(requirements_text, project_name, case_range, section, requirements=requirements)
+    )
+    
+    # Keeps every complete test case if the array was cut off part-way
+    test_cases, _ = parse_test_cases(response_text)
+    return test_cases
+
+
+def generate_test_cases_content(job, client, requirements_text, project_name, case_range="40-60"):
+    """Generate test cases using Claude API"""
+    job.update(message='🤖 Claude AI is generating test cases...')
+    return request_test_cases(client, requirements_text, project_name, case_range)
+
+
+def generate_test_cases_chunked_content(job, client, requirements_text, project_name, progress_start=0.0, progress_span=1.0):
+    """Generate test cases per requirements chunk in parallel and merge them"""
+    chunks = split_requirements(requirements_text)
+    if len(chunks) == 1:
+        return generate_test_cases_content(
+            job, client, requirements_text, project_name, plan_test_cases(requirements_text)['case_range']
+        )
+    
+    job.update(message=f"🧩 Generating test cases for {len(chunks)} requirement chunks...")
+    
+    def generate_chunk(chunk_text, chunk_index):
+        return request_test_cases(client, label_chunk(chunk_text, chunk_index, len(chunks)), project_name, CHUNK_CASE_RANGE)
+    
+    failures = []
+    
+    def show_progress(done, total, chunk_index, chunk_cases):
+        outcome = "failed" if failures and failures[-1][0] == chunk_index else f"{len(chunk_cases)} test cases"
+        job.update(progress_start + progress_span * done / total,
+                   f"🧩 Chunk {chunk_index + 1}/{total}: {outcome} ({done}/{total} done)")
+    
+    test_cases = map_reduce_test_cases(chunks, generate_chunk, progress_callback=show_progress, failures=failures)
+    if len(failures) == len(chunks):
+        raise failures[0][1]
+    if failures:
+        job.log(f"⚠️ {len(failures)} of {len(chunks)} chunks failed, their test cases are missing", 'warning')
+        for line in describe_chunk_failures(chunks, failures):
+            job.log(line.strip(), 'warning')
+    job.log(f"🧩 Merged {len(test_cases)} test cases from {len(chunks) - len(failures)} requirement chunks")
+    return test_cases
+
+
+def generate_test_cases_incremental_content(job, client, requirements_text, project_name, previous_map,
+                                            progress_start=0.0, progress_span=1.0):
+    """
+    Regenerate test cases only for the sections added or changed since the
+    previous job's section map; returns (test_cases, section_map, diff)
+    """
+    from claude_client import prime_prompt_cache
+    
+    units = section_units(requirements_text)
+    diff = diff_sections(previous_map, units)
+    if previous_map is None:
+        job.log(f"🔁 New section map: generating test cases for all {len(units)} sections")
+    else:
+        for line in describe_diff(diff).splitlines():
+            job.log(line.strip())
+    
+    pending = diff['changed'] + diff['added']
+    if pending:
+        job.update(message=f"🔁 Generating test cases for {len(pending)} of {len(units)} sections...")
+        try:
+            # Every section call shares the whole document as its prefix
+            prime_prompt_cache(client, [
+                test_cases_request(requirements_text, project_name, case_range_for(unit), unit) for unit in pending
+            ])
+        except Exception as e:
+            job.log(f"⚠️ Prompt cache priming skipped: {e}", 'warning')
+    
+    def generate_section(unit, unit_index):
+        return request_test_cases(client, requirements_text, project_name, case_range_for(unit), unit)
+    
+    def show_progress(done, total, unit_index, unit_cases):
+        job.update(progress_start + progress_span * done / total,
+                   f"🔁 {units[unit_index]['heading']}: {len(unit_cases)} test cases ({done}/{total} done)")
+    
+    test_cases, section_map = regenerate_test_cases(
+        project_name, units, diff, previous_map, generate_section, progress_callback=show_progress
+    )
+    return test_cases, section_map, diff
+
+
+def stream_test_cases_content(job, client, requirements_text, project_name, case_range="40-60"):
+    """
+    Stream test cases from Claude API, yielding each one as soon as it is
+    complete; each is also appended to job.partial for the live table
+    """
+    from claude_client import stream_json_array
+    
+    started = time.perf_counter()
+    request = test_cases_request(requirements_text, project_name, case_range, streaming=True)
+    job.update(message='🤖 Claude AI is streaming test cases...')
+    
     try:
-        with st.spinner('🤖 Claude AI is generating test cases...'):
-            response = client.messages.create(
-                model=MODEL_NAME,
-                max_tokens=16000,
-                temperature=0.3,
-                messages=[{"role": "user", "content": prompt}]
-            )
-        
-        response_text = response.content[0].text
-        
-        # Clean response
-        if response_text.strip().startswith('```'):
-            response_text = response_text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            elif response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-        
-        test_cases = json.loads(response_text)
-        return test_cases
+        for test_case in stream_json_array(client, request):
+            test_case = normalize_test_case(test_case, len(job.partial) + 1)
+            if test_case is None:
+                continue
+            job.partial.append(test_case)
+            if len(job.partial) == 1:
+                job.log(f"⚡ First test case after {time.perf_counter() - started:.1f}s")
+            job.update(message=f"⚡ {len(job.partial)} test cases so far...")
+            yield test_case
     
+    except JobCancelled:
+        raise
     except Exception as e:
-        st.error(f"❌ Error generating test cases: {e}")
-        return None
+        if not job.partial:
+            raise
+        job.log(f"⚠️ Generation stopped after {len(job.partial)} test cases, keeping them: {e}", 'warning')
+
+
+def generate_coverage_gaps_content(job, client, requirements_text, project_name, test_plan, test_cases, traceability):
+    """
+    Generate test cases only for the functional requirements without any;
+    returns (test_cases, traceability) with the new cases appended
+    """
+    job.update(message=f"🎯 Generating test cases for {len(traceability['uncovered'])} uncovered requirements...")
+    
+    def generate_group(requirements, group_index):
+        return request_test_cases(client, requirements_text, project_name, gap_case_range(requirements),
+                                  requirements=requirements)
+    
+    test_cases, traceability, added = fill_coverage_gaps(test_plan, test_cases, traceability, generate_group)
+    job.log(f"🎯 Added {len(added)} test cases for uncovered requirements")
+    return test_cases, traceability
 
 
-def create_word_document(test_plan, project_name):
+def run_generation_job(job, pdf_text, project_name, options, anthropic_client):
+    """
+    Job body, run on a worker thread: generate what was asked for from the
+    extracted requirements and store the parsed JSON in the artifact store
+    (Word and Excel are rendered later, on download). Reports through the
+    job rather than Streamlit; job.result keeps only file names and stats.
+    """
+    from claude_client import create_client, describe_usage
+    
+    store = get_artifact_store()
+    client = create_client(CLAUDE_API_KEY, options['use_response_cache'], shared_client=anthropic_client)
+    result = {'project_name': project_name, 'files': {}}
+    test_plan = None
+    
+    # Generate Test Plan
+    if options['generate_plan']:
+        try:
+            test_plan = generate_test_plan_content(
+                job, client, pdf_text, project_name, options['parallel_plan'],
+                0.5 if options['generate_cases'] else 0.95
+            )
+            store.write_json(job.owner, job.id, ARTIFACT_NAMES['test_plan_json'], test_plan)
+            result['files']['test_plan_json'] = ARTIFACT_NAMES['test_plan_json']
+            job.log("✅ Test Plan generated successfully!", 'success')
+        except JobCancelled:
+            raise
+        except Exception as e:
+            job.log(f"❌ Error generating test plan: {e}", 'error')
+    
+    # Generate Test Cases
+    if options['generate_cases']:
+        progress_start = 0.5 if options['generate_plan'] else 0.0
+        job.update(progress_start)
+        try:
+            # Size the single call to the document; chunk it when one call cannot hold the answer
+            budget = plan_test_cases(pdf_text, streaming=options['stream_test_cases'])
+            chunked = options['chunk_requirements']
+            if not (options['incremental'] or chunked):
+                job.log(describe_budget(budget))
+                chunked = budget['chunked']
+            
+            if options['incremental']:
+                base_path = options['base_job'] and store.path(job.owner, options['base_job'], ARTIFACT_NAMES['sections_json'])
+                test_cases, section_map, diff = generate_test_cases_incremental_content(
+                    job, client, pdf_text, project_name, load_section_map(base_path) if base_path else None,
+                    progress_start, 0.95 - progress_start
+                )
+                result['section_diff'] = {
+                    name: len(diff[name]) for name in ('unchanged', 'changed', 'added', 'removed')
+                }
+            elif chunked:
+                test_cases = generate_test_cases_chunked_content(
+                    job, client, pdf_text, project_name, progress_start, 0.95 - progress_start
+                )
+            elif options['stream_test_cases']:
+                # Each test case lands in job.partial, which feeds the live table
+                test_cases = job.partial
+                for _ in stream_test_cases_content(job, client, pdf_text, project_name, budget['case_range']):
+                    pass
+            else:
+                test_cases = generate_test_cases_content(job, client, pdf_text, project_name, budget['case_range'])
+            
+            if not test_cases:
+                raise ValueError("no test cases found in the response")
+            
+            test_cases, dedup_report = remove_near_duplicates(test_cases)
+            for line in describe_dedup(dedup_report):
+                job.log(line)
+            if chunked and not options['incremental'] and dedup_report['removed']:
+                # Chunked IDs are synthetic already; close the gaps the merged cases left
+                renumber_test_cases(test_cases)
+            result['duplicates_removed'] = dedup_report['removed']
+            if options['incremental']:
+                # Saved after dedup so the map lists exactly the test cases in this job's files
+                store.write_json(job.owner, job.id, ARTIFACT_NAMES['sections_json'],
+                                 prune_section_map(section_map, test_cases))
+                result['files']['sections_json'] = ARTIFACT_NAMES['sections_json']
+            
+            if test_plan:
+                # Link the test cases to the plan's requirements; optionally cover the gaps
+                traceability = build_traceability(test_plan, test_cases)
+                if options['fill_coverage_gaps'] and traceability['uncovered']:
+                    test_cases, traceability = generate_coverage_gaps_content(
+                        job, client, pdf_text, project_name, test_plan, test_cases, traceability
+                    )
+                for line in describe_traceability(traceability):
+                    job.log(line.strip())
+                store.write_json(job.owner, job.id, ARTIFACT_NAMES['traceability_json'], traceability)
+                result['files']['traceability_json'] = ARTIFACT_NAMES['traceability_json']
+                result['coverage'] = {
+                    'covered': len(traceability['requirements']) - len(traceability['uncovered']),
+                    'total': len(traceability['requirements']),
+                    'uncovered': traceability['uncovered'],
+                }
+            
+            store.write_json(job.owner, job.id, ARTIFACT_NAMES['test_cases_json'], test_cases)
+            result['files']['test_cases_json'] = ARTIFACT_NAMES['test_cases_json']
+            result['test_cases_count'] = len(test_cases)
+            result['test_cases_stats'] = TestCaseStats.from_test_cases(test_cases).to_dict()
+            try:
+                get_test_case_store().save_suite(project_name, test_cases, source='web')
+            except (sqlite3.Error, OSError) as e:
+                job.log(f"⚠️ Test case store not updated: {e}")
+            job.log(f"✅ Generated {len(test_cases)} test cases!", 'success')
+        except JobCancelled:
+            raise
+        except Exception as e:
+            job.log(f"❌ Error generating test cases: {e}", 'error')
+        finally:
+            job.partial = []   # The live table is done; the test cases are on disk now
+    
+    job.log(describe_usage(client))
+    if not result['files']:
+        raise RuntimeError("nothing was generated, see the log for details")
+    return result
+
+
+def create_word_document(renderers, test_plan, project_name, output):
     """Create Word document from test plan"""
-    doc = Document()
-    
-    # Title
-    title = doc.add_heading(f'{project_name} - QA Test Plan', 0)
-    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    
-    # Project Info Table
-    doc.add_heading('1. Project Information', level=1)
-    table = doc.add_table(rows=5, cols=2)
-    table.style = 'Light Grid Accent 1'
-    
-    info = test_plan.get('project_info', {})
-    table.rows[0].cells[0].text = 'Project Name'
-    table.rows[0].cells[1].text = info.get('name', project_name)
-    table.rows[1].cells[0].text = 'Version'
-    table.rows[1].cells[1].text = info.get('version', '1.0')
-    table.rows[2].cells[0].text = 'Prepared By'
-    table.rows[2].cells[1].text = info.get('prepared_by', 'QA Team')
-    table.rows[3].cells[0].text = 'Date'
-    table.rows[3].cells[1].text = info.get('date', datetime.now().strftime('%Y-%m-%d'))
-    table.rows[4].cells[0].text = 'Test Environment'
-    table.rows[4].cells[1].text = ', '.join(info.get('test_environment', []))
-    
-    # Description
-    doc.add_heading('2. Description', level=1)
-    doc.add_paragraph(test_plan.get('description', 'N/A'))
-    
-    # Introduction
-    doc.add_heading('3. Introduction', level=1)
-    doc.add_paragraph(test_plan.get('introduction', 'N/A'))
-    
-    # Goal
-    doc.add_heading('4. Goal', level=1)
-    doc.add_paragraph(test_plan.get('goal', 'N/A'))
-    
-    # Test Strategy
-    doc.add_heading('5. Test Strategy', level=1)
-    strategy = test_plan.get('test_strategy', {})
-    if strategy:
-        doc.add_heading('5.1 Functional Testing', level=2)
-        doc.add_paragraph(strategy.get('functional', 'N/A'))
-        doc.add_heading('5.2 Integration Testing', level=2)
-        doc.add_paragraph(strategy.get('integration', 'N/A'))
-        doc.add_heading('5.3 UI/UX Testing', level=2)
-        doc.add_paragraph(strategy.get('ui_ux', 'N/A'))
-        doc.add_heading('5.4 Performance Testing', level=2)
-        doc.add_paragraph(strategy.get('performance', 'N/A'))
-        doc.add_heading('5.5 Security Testing', level=2)
-        doc.add_paragraph(strategy.get('security', 'N/A'))
-        doc.add_heading('5.6 Cross-Platform Testing', level=2)
-        doc.add_paragraph(strategy.get('cross_platform', 'N/A'))
-        doc.add_heading('5.7 Regression Testing', level=2)
-        doc.add_paragraph(strategy.get('regression', 'N/A'))
-    
-    # Test Scope
-    doc.add_heading('6. Test Scope', level=1)
-    scope = test_plan.get('scope', {})
-    if scope:
-        doc.add_heading('6.1 In-Scope', level=2)
-        for item in scope.get('in_scope', []):
-            doc.add_paragraph(item, style='List Bullet')
-        doc.add_heading('6.2 Out-of-Scope', level=2)
-        for item in scope.get('out_of_scope', []):
-            doc.add_paragraph(item, style='List Bullet')
-    
-    # Functional Requirements
-    doc.add_heading('7. Functional Requirements', level=1)
-    func_reqs = test_plan.get('functional_requirements', [])
-    if func_reqs:
-        for req in func_reqs:
-            doc.add_heading(f"{req.get('req_id', 'FR-XXX')}: {req.get('description', 'N/A')[:50]}...", level=2)
-            doc.add_paragraph(f"Description: {req.get('description', 'N/A')}")
-            doc.add_paragraph(f"Acceptance Criteria: {req.get('acceptance_criteria', 'N/A')}")
-    
-    # Non-Functional Requirements
-    doc.add_heading('8. Non-Functional Requirements', level=1)
-    non_func_reqs = test_plan.get('non_functional_requirements', [])
-    if non_func_reqs:
-        for req in non_func_reqs:
-            doc.add_paragraph(f"{req.get('category', 'N/A')}: {req.get('requirement', 'N/A')}", style='List Bullet')
-    
-    # Impact Zones
-    doc.add_heading('9. Impact Zones', level=1)
-    impact = test_plan.get('impact_zones', {})
-    if impact:
-        doc.add_heading('9.1 Red Zone (High Risk)', level=2)
-        for item in impact.get('red', []):
-            doc.add_paragraph(item, style='List Bullet')
-        doc.add_heading('9.2 Yellow Zone (Medium Risk)', level=2)
-        for item in impact.get('yellow', []):
-            doc.add_paragraph(item, style='List Bullet')
-        doc.add_heading('9.3 Green Zone (Low Risk)', level=2)
-        for item in impact.get('green', []):
-            doc.add_paragraph(item, style='List Bullet')
-    
-    # Entry Criteria
-    doc.add_heading('10. Entry Criteria', level=1)
-    for item in test_plan.get('entry_criteria', []):
-        doc.add_paragraph(item, style='List Bullet')
-    
-    # Exit Criteria
-    doc.add_heading('11. Exit Criteria', level=1)
-    for item in test_plan.get('exit_criteria', []):
-        doc.add_paragraph(item, style='List Bullet')
-    
-    # Test Data Requirements
-    doc.add_heading('12. Test Data Requirements', level=1)
-    for item in test_plan.get('test_data', []):
-        doc.add_paragraph(item, style='List Bullet')
-    
-    # Test Environment
-    doc.add_heading('13. Test Environment', level=1)
-    doc.add_paragraph(', '.join(info.get('test_environment', [])))
-    
-    # Testing Activities
-    doc.add_heading('14. Testing Activities', level=1)
-    activities = test_plan.get('testing_activities', [])
-    if activities:
-        table = doc.add_table(rows=len(activities)+1, cols=3)
-        table.style = 'Light Grid Accent 1'
-        table.rows[0].cells[0].text = 'Phase'
-        table.rows[0].cells[1].text = 'Activity'
-        table.rows[0].cells[2].text = 'Timeline'
-        for i, activity in enumerate(activities, 1):
-            table.rows[i].cells[0].text = activity.get('phase', 'N/A')
-            table.rows[i].cells[1].text = activity.get('activity', 'N/A')
-            table.rows[i].cells[2].text = activity.get('timeline', 'N/A')
-    
-    # Roles and Responsibilities
-    doc.add_heading('15. Roles and Responsibilities', level=1)
-    roles = test_plan.get('roles', [])
-    if roles:
-        for role in roles:
-            doc.add_heading(role.get('role', 'N/A'), level=2)
-            doc.add_paragraph(role.get('responsibility', 'N/A'))
-    
-    # Risks
-    doc.add_heading('16. Risks and Mitigation', level=1)
-    risks = test_plan.get('risks', [])
-    if risks:
-        for risk in risks:
-            doc.add_paragraph(f"Risk: {risk.get('risk', 'N/A')}", style='List Bullet')
-            doc.add_paragraph(f"Mitigation: {risk.get('mitigation', 'N/A')}", style='List Bullet 2')
-    
-    # Assumptions
-    doc.add_heading('17. Assumptions', level=1)
-    for item in test_plan.get('assumptions', []):
-        doc.add_paragraph(item, style='List Bullet')
-    
-    # Dependencies
-    doc.add_heading('18. Dependencies', level=1)
-    for item in test_plan.get('dependencies', []):
-        doc.add_paragraph(item, style='List Bullet')
-    
-    # Defect Management
-    doc.add_heading('19. Defect Management', level=1)
-    defect = test_plan.get('defect_management', {})
-    if defect:
-        doc.add_heading('P1 - Critical', level=2)
-        doc.add_paragraph(defect.get('p1', 'N/A'))
-        doc.add_heading('P2 - High', level=2)
-        doc.add_paragraph(defect.get('p2', 'N/A'))
-        doc.add_heading('P3 - Medium', level=2)
-        doc.add_paragraph(defect.get('p3', 'N/A'))
-        doc.add_heading('P4 - Low', level=2)
-        doc.add_paragraph(defect.get('p4', 'N/A'))
-    
-    # Test Metrics
-    doc.add_heading('20. Test Metrics and KPIs', level=1)
-    for item in test_plan.get('metrics', []):
-        doc.add_paragraph(item, style='List Bullet')
-    
-    # Deliverables
-    doc.add_heading('21. Deliverables', level=1)
-    for item in test_plan.get('deliverables', []):
-        doc.add_paragraph(item, style='List Bullet')
-    
-    # Limitations
-    doc.add_heading('22. Limitations and Exclusions', level=1)
-    for item in test_plan.get('limitations', []):
-        doc.add_paragraph(item, style='List Bullet')
-    
-    # Approval Section
-    doc.add_heading('23. Approval', level=1)
-    approval_table = doc.add_table(rows=4, cols=3)
-    approval_table.style = 'Light Grid Accent 1'
-    approval_table.rows[0].cells[0].text = 'Role'
-    approval_table.rows[0].cells[1].text = 'Name'
-    approval_table.rows[0].cells[2].text = 'Signature & Date'
-    approval_table.rows[1].cells[0].text = 'QA Lead'
-    approval_table.rows[2].cells[0].text = 'Project Manager'
-    approval_table.rows[3].cells[0].text = 'Product Owner'
-    
-    # Convert to bytes
-    doc_bytes = io.BytesIO()
-    doc.save(doc_bytes)
-    doc_bytes.seek(0)
-    return doc_bytes
-
-
-def create_excel_file(test_cases, project_name):
-    """Create Excel file from test cases"""
-    wb = Workbook()
-    sheet = wb.active
-    sheet.title = "Test Cases"
-    
-    # Headers
-    headers = ['Test Case ID', 'Module', 'Test Case Title', 'Description', 
-               'Pre-conditions', 'Test Steps', 'Expected Results', 
-               'Priority', 'Test Type', 'Platform']
-    
-    header_font = Font(bold=True, color='FFFFFF', size=11)
-    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-    
-    for col, header in enumerate(headers, 1):
-        cell = sheet.cell(row=1, column=col)
-        cell.value = header
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-    
-    # Data
-    for idx, tc in enumerate(test_cases, start=2):
-        sheet[f'A{idx}'] = tc.get('id', f'TC_{idx-1:03d}')
-        sheet[f'B{idx}'] = tc.get('module', '')
-        sheet[f'C{idx}'] = tc.get('title', '')
-        sheet[f'D{idx}'] = tc.get('description', '')
-        sheet[f'E{idx}'] = tc.get('preconditions', '')
-        sheet[f'F{idx}'] = tc.get('steps', '')
-        sheet[f'G{idx}'] = tc.get('expected', '')
-        sheet[f'H{idx}'] = tc.get('priority', 'P2')
-        sheet[f'I{idx}'] = tc.get('type', 'Functional')
-        sheet[f'J{idx}'] = tc.get('platform', 'Both')
-    
-    # Convert to bytes
-    excel_bytes = io.BytesIO()
-    wb.save(excel_bytes)
-    excel_bytes.seek(0)
-    return excel_bytes
+    renderers.render_test_plan(TestPlan.from_dict(test_plan, project_name), output)
 
 
-def main():
-    # Initialize session state for generated files
-    if 'test_plan_docx' not in st.session_state:
-        st.session_state.test_plan_docx = None
-    if 'test_plan_json' not in st.session_state:
-        st.session_state.test_plan_json = None
-    if 'test_cases_xlsx' not in st.session_state:
-        st.session_state.test_cases_xlsx = None
-    if 'test_cases_json' not in st.session_state:
-        st.session_state.test_cases_json = None
-    if 'project_name' not in st.session_state:
-        st.session_state.project_name = None
-    if 'test_cases_count' not in st.session_state:
-        st.session_state.test_cases_count = 0
-    if 'test_cases_stats' not in st.session_state:
-        st.session_state.test_cases_stats = {}
+def create_excel_file(renderers, test_cases, project_name, output, traceability=None):
+    """
+    Create Excel file from test cases (any iterable, including a stream of test cases),
+    with a Traceability sheet when a traceability matrix is given
+    """
+    renderers.render_test_cases(test_cases, output, traceability=traceability)
+
+
+def url_state(name, default=None):
+    """
+    Value kept in both the page URL (survives a browser refresh) and session
+    state (survives switching pages, which clears the URL's query string)
+    """
+    value = st.query_params.get(name) or st.session_state.get(f"url_{name}") or default
+    if value:
+        st.session_state[f"url_{name}"] = value
+        if st.query_params.get(name) != value:
+            st.query_params[name] = value
+    return value
+
+
+def set_url_state(name, value):
+    """Change or (with None) clear a url_state() value"""
+    st.session_state.pop(f"url_{name}", None)
+    if name in st.query_params:
+        del st.query_params[name]
+    if value:
+        url_state(name, value)
+
+
+def get_workspace_id():
+    """
+    Workspace token kept with url_state(), so a browser refresh finds the same
+    jobs while every new visitor gets a workspace of their own
+    """
+    return url_state('workspace', uuid.uuid4().hex[:12])
+
+
+def show_job_log(job):
+    """Show the job's log lines in the style each step used to print them"""
+    writers = {'success': st.success, 'warning': st.warning, 'error': st.error}
+    for level, text in list(job.logs):
+        writers.get(level, st.caption)(text)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def show_job_progress(job_id):
+    """Poll a queued or running job; reruns the whole page once it has finished"""
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None or job.is_finished:
+        st.rerun()
     
-    # Header
-    st.markdown('<p class="main-header">🚀 QA Documentation Generator</p>', unsafe_allow_html=True)
-    st.markdown('<p class="sub-header">Automatically generate Test Plans and Test Cases using AI</p>', unsafe_allow_html=True)
+    st.header(f"⏳ Generating: {job.label}")
+    position = queue.position(job)
+    if position:
+        st.info(f"⏳ Waiting in the queue (position {position}); it starts as soon as a worker is free.")
+    st.progress(job.progress, text=job.message)
+    st.caption(f"⏱️ {job.seconds:.0f}s elapsed · you can refresh or close this tab, the job keeps running")
+    show_job_log(job)
     
-    # Sidebar
-    with st.sidebar:
-        st.header("⚙️ Configuration")
-        
-        # API Key check
-        if CLAUDE_API_KEY:
-            st.success("✅ API Key Configured")
+    if job.partial:
+        st.dataframe(
+            [{key: case.get(key, '') for key in ('id', 'module', 'title', 'priority', 'type')}
+             for case in list(job.partial)],
+            use_container_width=True
+        )
+    
+    if st.button("🛑 Cancel", key=f"cancel_{job.id}", disabled=job.cancel_requested):
+        queue.cancel(job.id)
+
+
+def template_version(renderers):
+    """Changes whenever the Word template is edited, so cached renders are not reused"""
+    try:
+        return str(os.path.getmtime(renderers.TEMPLATE_PATH))
+    except OSError:
+        return 'default'
+
+
+def artifact_download_button(job, artifact, label, file_name, mime):
+    """
+    Download button that reads the job's file from disk only when it is
+    clicked. Word and Excel files are rendered from the stored JSON on that
+    first click, memoized by content hash, so finishing a job renders nothing.
+    """
+    store = get_artifact_store()
+    source, rendered_name = RENDERED_ARTIFACTS.get(artifact, (artifact, None))
+    path = store.path(job.owner, job.id, job.result['files'][source])
+    if path is None:
+        st.caption(f"⌛ {label.replace('📥 Download ', '')} has expired, generate it again")
+        return
+    
+    if rendered_name is None:
+        data = store.loader(path)
+    else:
+        project_name = job.result['project_name']
+        renderers = get_renderers()
+        if artifact == 'test_plan_docx':
+            render = lambda test_plan, output: create_word_document(renderers, test_plan, project_name, output)
+            salt = f"docx:{project_name}:{template_version(renderers)}"
+        elif 'traceability_json' in job.result['files']:
+            # The Traceability sheet depends on this job's plan too, so the file is not shared
+            traceability_path = store.path(job.owner, job.id, job.result['files']['traceability_json'])
+            render = lambda test_cases, output: create_excel_file(
+                renderers, test_cases, project_name, output,
+                json.loads(store.loader(traceability_path)()) if traceability_path else None
+            )
+            salt = f"xlsx:{job.id}"
         else:
-            st.error("❌ API Key Not Set")
-            st.info("Set ANTHROPIC_API_KEY environment variable")
+            render = lambda test_cases, output: create_excel_file(renderers, test_cases, project_name, output)
+            salt = "xlsx"
         
-        st.markdown("---")
-        st.header("📚 About")
-        st.markdown("""
-        This tool uses **Claude AI** to generate:
-        - 📄 Professional Test Plans
-        - 🧪 Comprehensive Test Cases
+        def data():
+            return store.loader(store.rendered(path, rendered_name, render, salt))()
+    
+    st.download_button(
+        label=label,
+        data=data,
+        file_name=file_name,
+        mime=mime,
+        key=f"download_{artifact}"
+    )
+
+
+def show_cross_tabs(stats, expanded=False):
+    """Module × priority, type × platform and type × priority tables"""
+    with st.expander("📊 Breakdown", expanded=expanded):
+        for row, column in CROSS_TABS:
+            table = stats.table(row, column)
+            if table:
+                st.caption(f"{row.title()} × {column.title()}")
+                st.dataframe([{row: value, **counts} for value, counts in table.items()],
+                             hide_index=True, use_container_width=True)
+
+
+def show_job_results(job):
+    """Log, statistics and download buttons for a finished job"""
+    result = job.result
+    files = result.get('files', {})
+    file_stem = job.label.replace(' ', '_')
+    
+    st.markdown("---")
+    with st.expander(f"📋 Generation log ({job.seconds:.0f}s)", expanded=job.status != 'done'):
+        show_job_log(job)
+    
+    if job.status == 'failed':
+        st.error(f"❌ Generation failed: {job.error}")
+    elif job.status == 'cancelled':
+        st.warning("🛑 Generation was cancelled")
+    else:
+        st.markdown('<div class="success-box">🎉 <strong>Generation Complete!</strong><br>Download your files below.</div>', unsafe_allow_html=True)
+    
+    if files:
+        st.header("📥 Download Your Files")
         
-        **Powered by:**
-        - Anthropic Claude API
-        - Streamlit
-        """)
+        # Test Plan Downloads
+        if 'test_plan_json' in files:
+            st.subheader("📄 Test Plan")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                artifact_download_button(
+                    job, 'test_plan_docx', "📥 Download Test Plan (Word)", f"{file_stem}_Test_Plan.docx",
+                    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+            
+            with col2:
+                artifact_download_button(
+                    job, 'test_plan_json', "📥 Download Test Plan (JSON)", f"{file_stem}_Test_Plan.json",
+                    "application/json"
+                )
         
-        st.markdown("---")
-        st.header("💡 Tips")
-        st.markdown("""
-        - Upload clear PDF requirements
-        - Use descriptive project names
-        - Review generated docs
-        - Customize as needed
-        """)
+        # Test Cases Downloads
+        if 'test_cases_json' in files:
+            st.subheader("🧪 Test Cases")
+            
+            section_diff = result.get('section_diff')
+            if section_diff:
+                st.caption(
+                    f"🔁 Sections: {section_diff['unchanged']} unchanged, {section_diff['changed']} changed, "
+                    f"{section_diff['added']} added, {section_diff['removed']} removed"
+                )
+            
+            # Show statistics
+            stats = TestCaseStats.from_dict(result.get('test_cases_stats', {}))
+            col1, col2, col3 = st.columns(3)
+            
+            with col1:
+                st.metric("Total Test Cases", result.get('test_cases_count', 0))
+            with col2:
+                st.metric("P1 (Critical)", stats.count('priority', 'P1'))
+            with col3:
+                st.metric("Test Types", len(stats.distributions['type']))
+            show_cross_tabs(stats)
+            
+            coverage = result.get('coverage')
+            if coverage:
+                st.caption(f"🔗 {coverage['covered']}/{coverage['total']} functional requirements have test cases")
+                if coverage['uncovered']:
+                    st.warning(f"❌ No test cases for: {', '.join(coverage['uncovered'])}")
+            
+            # Download buttons
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                artifact_download_button(
+                    job, 'test_cases_xlsx', "📥 Download Test Cases (Excel)", f"{file_stem}_Test_Cases.xlsx",
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+            
+            with col2:
+                artifact_download_button(
+                    job, 'test_cases_json', "📥 Download Test Cases (JSON)", f"{file_stem}_Test_Cases.json",
+                    "application/json"
+                )
+            
+            if 'traceability_json' in files:
+                artifact_download_button(
+                    job, 'traceability_json', "📥 Download Traceability Matrix (JSON)", f"{file_stem}_Traceability.json",
+                    "application/json"
+                )
+    
+    # Clear button
+    st.markdown("---")
+    if st.button("🔄 Generate New Documents", type="secondary"):
+        set_url_state('job', None)
+        st.rerun()
+
+
+def generate_page():
+    """Upload requirements, start a generation job and follow it to the downloads"""
+    queue = get_job_queue()
+    workspace = get_workspace_id()
+    current_job = queue.get(url_state('job') or '')
+    job_running = current_job is not None and not current_job.is_finished
+    settings = st.session_state
     
     # Main content
     col1, col2 = st.columns([2, 1])
@@ -597,6 +886,7 @@ def main():
     
     if uploaded_file:
         st.markdown('<div class="info-box">✅ PDF Uploaded Successfully</div>', unsafe_allow_html=True)
+        pdf_text = read_pdf(uploaded_file, use_cache=settings.use_extraction_cache)
         
         # What to generate
         st.header("🎯 What would you like to generate?")
@@ -612,172 +902,53 @@ def main():
         
         if not (generate_plan or generate_cases):
             st.warning("⚠️ Please select at least one option")
-            return
+        
+        base_job = None
+        if generate_cases and settings.incremental_update:
+            # Earlier jobs of this workspace that saved a section map, newest first
+            labels = {None: "Nothing, start a new section map"}
+            for job in queue.jobs_for(workspace):
+                if 'sections_json' in job.result.get('files', {}) and \
+                        get_artifact_store().path(job.owner, job.id, ARTIFACT_NAMES['sections_json']):
+                    labels[job.id] = (f"{job.label} ({datetime.fromtimestamp(job.created).strftime('%Y-%m-%d %H:%M')}, "
+                                      f"{job.result.get('test_cases_count', 0)} test cases)")
+            base_job = st.selectbox(
+                "🔁 Update the test cases of",
+                list(labels),
+                index=1 if len(labels) > 1 else 0,
+                format_func=labels.get,
+                help="Only sections that changed since that job are sent to Claude; the rest keep their test cases and IDs."
+            )
         
         # Generate button
         st.markdown("---")
-        if st.button("🚀 Generate Documentation", type="primary"):
+        if st.button("🚀 Generate Documentation", type="primary",
+                     disabled=job_running or not pdf_text or not (generate_plan or generate_cases),
+                     help="Wait for the current job to finish or cancel it first" if job_running else None):
             if not CLAUDE_API_KEY:
                 st.error("❌ Please set ANTHROPIC_API_KEY environment variable first!")
                 return
             
-            # Clear previous files
-            st.session_state.test_plan_docx = None
-            st.session_state.test_plan_json = None
-            st.session_state.test_cases_xlsx = None
-            st.session_state.test_cases_json = None
-            st.session_state.project_name = project_name
-            st.session_state.test_cases_count = 0
-            st.session_state.test_cases_stats = {}
-            
-            # Read PDF
-            st.header("📖 Processing Requirements")
-            pdf_text = read_pdf(uploaded_file)
-            
-            if not pdf_text:
-                return
-            
-            st.success(f"✅ Extracted {len(pdf_text)} characters from PDF")
-            
-            # Generate Test Plan
-            if generate_plan:
-                st.header("📄 Generating Test Plan")
-                test_plan = generate_test_plan_content(pdf_text, project_name)
-                
-                if test_plan:
-                    st.success("✅ Test Plan generated successfully!")
-                    
-                    # Create Word document
-                    with st.spinner("📝 Creating Word document..."):
-                        doc_bytes = create_word_document(test_plan, project_name)
-                    
-                    # Store in session state
-                    st.session_state.test_plan_docx = doc_bytes.getvalue()
-                    
-                    # Create JSON
-                    json_bytes = json.dumps(test_plan, indent=2, ensure_ascii=False).encode('utf-8')
-                    st.session_state.test_plan_json = json_bytes
-            
-            # Generate Test Cases
-            if generate_cases:
-                st.header("🧪 Generating Test Cases")
-                test_cases = generate_test_cases_content(pdf_text, project_name)
-                
-                if test_cases:
-                    st.success(f"✅ Generated {len(test_cases)} test cases!")
-                    
-                    # Store count and stats
-                    st.session_state.test_cases_count = len(test_cases)
-                    
-                    # Calculate statistics
-                    priorities = {}
-                    types = {}
-                    
-                    for tc in test_cases:
-                        p = tc.get('priority', 'P2')
-                        priorities[p] = priorities.get(p, 0) + 1
-                        t = tc.get('type', 'Functional')
-                        types[t] = types.get(t, 0) + 1
-                    
-                    st.session_state.test_cases_stats = {
-                        'priorities': priorities,
-                        'types': types
-                    }
-                    
-                    # Create Excel
-                    with st.spinner("📊 Creating Excel file..."):
-                        excel_bytes = create_excel_file(test_cases, project_name)
-                    
-                    # Store in session state
-                    st.session_state.test_cases_xlsx = excel_bytes.getvalue()
-                    
-                    # Create JSON
-                    json_bytes = json.dumps(test_cases, indent=2, ensure_ascii=False).encode('utf-8')
-                    st.session_state.test_cases_json = json_bytes
-            
-            # Success message
-            st.markdown('<div class="success-box">🎉 <strong>Generation Complete!</strong><br>Scroll down to download your files.</div>', unsafe_allow_html=True)
-            st.rerun()  # Rerun to show download section
-        
-        # Display download buttons if files exist in session state
-        if st.session_state.test_plan_docx or st.session_state.test_cases_xlsx:
-            st.markdown("---")
-            st.header("📥 Download Your Files")
-            
-            # Test Plan Downloads
-            if st.session_state.test_plan_docx:
-                st.subheader("📄 Test Plan")
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.download_button(
-                        label="📥 Download Test Plan (Word)",
-                        data=st.session_state.test_plan_docx,
-                        file_name=f"{st.session_state.project_name.replace(' ', '_')}_Test_Plan.docx",
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        key="download_plan_docx"
-                    )
-                
-                with col2:
-                    st.download_button(
-                        label="📥 Download Test Plan (JSON)",
-                        data=st.session_state.test_plan_json,
-                        file_name=f"{st.session_state.project_name.replace(' ', '_')}_Test_Plan.json",
-                        mime="application/json",
-                        key="download_plan_json"
-                    )
-            
-            # Test Cases Downloads
-            if st.session_state.test_cases_xlsx:
-                st.subheader("🧪 Test Cases")
-                
-                # Show statistics
-                if st.session_state.test_cases_stats:
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.metric("Total Test Cases", st.session_state.test_cases_count)
-                    with col2:
-                        priorities = st.session_state.test_cases_stats.get('priorities', {})
-                        st.metric("P1 (Critical)", priorities.get('P1', 0))
-                    with col3:
-                        types = st.session_state.test_cases_stats.get('types', {})
-                        st.metric("Test Types", len(types))
-                
-                # Download buttons
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.download_button(
-                        label="📥 Download Test Cases (Excel)",
-                        data=st.session_state.test_cases_xlsx,
-                        file_name=f"{st.session_state.project_name.replace(' ', '_')}_Test_Cases.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="download_cases_xlsx"
-                    )
-                
-                with col2:
-                    st.download_button(
-                        label="📥 Download Test Cases (JSON)",
-                        data=st.session_state.test_cases_json,
-                        file_name=f"{st.session_state.project_name.replace(' ', '_')}_Test_Cases.json",
-                        mime="application/json",
-                        key="download_cases_json"
-                    )
-            
-            # Clear button
-            st.markdown("---")
-            if st.button("🔄 Generate New Documents", type="secondary"):
-                st.session_state.test_plan_docx = None
-                st.session_state.test_plan_json = None
-                st.session_state.test_cases_xlsx = None
-                st.session_state.test_cases_json = None
-                st.session_state.project_name = None
-                st.session_state.test_cases_count = 0
-                st.session_state.test_cases_stats = {}
-                st.rerun()
+            # The job gets the extracted text; the upload itself is not kept
+            job = queue.submit(workspace, project_name, run_generation_job, pdf_text, project_name, {
+                'generate_plan': generate_plan,
+                'generate_cases': generate_cases,
+                'stream_test_cases': settings.stream_test_cases,
+                'chunk_requirements': settings.chunk_requirements,
+                'parallel_plan': settings.parallel_plan,
+                'fill_coverage_gaps': settings.fill_coverage_gaps,
+                'incremental': settings.incremental_update,
+                'base_job': base_job,
+                'use_response_cache': settings.use_response_cache,
+            }, get_anthropic_client())
+            set_url_state('job', job.id)
+            st.rerun()
     
-    else:
+    if job_running:
+        show_job_progress(current_job.id)
+    elif current_job is not None:
+        show_job_results(current_job)
+    elif not uploaded_file:
         # Instructions
         st.info("""
         ### 👋 Welcome to QA Documentation Generator!
@@ -789,6 +960,9 @@ def main():
         4. 🚀 Click "Generate Documentation"
         5. 📥 Download your generated files
         
+        Generation runs in the background: you can refresh the page or
+        close the tab and come back to the same link for your files.
+        
         **Requirements:**
         - Set `ANTHROPIC_API_KEY` environment variable
         - Upload PDF with clear requirements
@@ -796,5 +970,197 @@ def main():
         """)
 
 
+def jobs_page():
+    """This workspace's jobs, newest first, with the shared queue's load"""
+    queue = get_job_queue()
+    workspace = get_workspace_id()
+    jobs = queue.jobs_for(workspace)
+    
+    st.header("🗂️ Your Jobs")
+    queue_stats = queue.stats()
+    st.caption(
+        f"{queue_stats['running']}/{queue_stats['workers']} workers busy · "
+        f"{queue_stats['queued']} jobs waiting across all users"
+    )
+    
+    if not jobs:
+        st.info("No jobs yet. Start one from the 🚀 Generate page.")
+        return
+    
+    # Dashboard across every finished suite, added up from the stored summaries
+    summaries = [TestCaseStats.from_dict(job.result['test_cases_stats'])
+                 for job in jobs if 'test_cases_stats' in job.result]
+    if summaries:
+        stats = TestCaseStats.combine(summaries)
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Suites", stats.suites)
+        with col2:
+            st.metric("Test Cases", stats.total)
+        with col3:
+            st.metric("P1 (Critical)", stats.count('priority', 'P1'))
+        with col4:
+            st.metric("Modules", len(stats.distributions['module']))
+        show_cross_tabs(stats)
+    
+    for job in jobs:
+        col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+        with col1:
+            st.write(f"{JOB_STATUS_ICONS.get(job.status, '•')} **{job.label}**")
+        with col2:
+            st.caption(f"{datetime.fromtimestamp(job.created).strftime('%Y-%m-%d %H:%M')} · {job.status}")
+        with col3:
+            if 'test_cases_count' in job.result:
+                st.caption(f"{job.result['test_cases_count']} test cases · {job.seconds:.0f}s")
+            elif job.is_finished:
+                st.caption(f"{job.seconds:.0f}s")
+            else:
+                st.caption(job.message)
+        with col4:
+            if st.button("Open", key=f"open_{job.id}"):
+                set_url_state('job', job.id)
+                st.switch_page(GENERATE_PAGE)
+
+
+def search_page():
+    """Full-text search over every suite in the local test case store"""
+    case_store = get_test_case_store()
+    
+    st.header("🔎 Search Test Cases")
+    suites = case_store.projects()
+    if not suites:
+        st.info("No test cases stored yet. Generated suites are added here automatically.")
+        return
+    st.caption(f"{len(suites)} projects · {sum(suite['test_case_count'] for suite in suites)} test cases")
+    
+    text = st.text_input("Search titles and steps", placeholder="e.g. login otp, password reset*")
+    col1, col2, col3, col4 = st.columns(4)
+    filters = {}
+    for column, field in zip((col1, col2, col3, col4), ('project', 'module', 'priority', 'type')):
+        with column:
+            filters[field] = st.selectbox(field.title(), [None] + case_store.values(field),
+                                          format_func=lambda value: value or "All", key=f"search_{field}")
+    
+    results = case_store.search(text, **filters)
+    st.caption(f"{len(results)} test case{'s' if len(results) != 1 else ''} found")
+    if results:
+        st.dataframe(
+            [{field: tc.get(field, '') for field in ('project', 'id', 'module', 'title', 'priority', 'type')}
+             for tc in results],
+            hide_index=True, use_container_width=True
+        )
+
+
+GENERATE_PAGE = st.Page(generate_page, title="Generate", icon="🚀", default=True)
+JOBS_PAGE = st.Page(jobs_page, title="Jobs", icon="🗂️")
+SEARCH_PAGE = st.Page(search_page, title="Search", icon="🔎")
+
+
+def main():
+    queue = get_job_queue()
+    page = st.navigation([GENERATE_PAGE, JOBS_PAGE, SEARCH_PAGE])
+    
+    # Header
+    st.markdown('<p class="main-header">🚀 QA Documentation Generator</p>', unsafe_allow_html=True)
+    st.markdown('<p class="sub-header">Automatically generate Test Plans and Test Cases using AI</p>', unsafe_allow_html=True)
+    
+    # Sidebar (shared by every page; the settings are read back from session state)
+    with st.sidebar:
+        st.header("⚙️ Configuration")
+        
+        # API Key check
+        if CLAUDE_API_KEY:
+            st.success("✅ API Key Configured")
+        else:
+            st.error("❌ API Key Not Set")
+            st.info("Set ANTHROPIC_API_KEY environment variable")
+        
+        st.checkbox(
+            "⚡ Stream test cases live",
+            value=True,
+            key="stream_test_cases",
+            help="Show each test case as soon as Claude writes it instead of waiting for the full set."
+        )
+        
+        st.checkbox(
+            "🧩 Split large requirements into chunks",
+            value=False,
+            key="chunk_requirements",
+            help="Generate test cases section by section in parallel for long PDFs, then merge and renumber them."
+        )
+        
+        st.checkbox(
+            "⚡ Generate test plan sections in parallel",
+            value=False,
+            key="parallel_plan",
+            help="Ask for the plan's section groups as concurrent, smaller calls and merge them; "
+                 "the wait is set by the slowest group instead of the whole plan."
+        )
+        
+        st.checkbox(
+            "🎯 Fill requirement coverage gaps",
+            value=False,
+            key="fill_coverage_gaps",
+            help="When both documents are generated, ask Claude for test cases of only the "
+                 "functional requirements that have none yet."
+        )
+        
+        st.checkbox(
+            "🔁 Update test cases incrementally",
+            value=False,
+            key="incremental_update",
+            help="Keep a section map of each job. For a revised PDF, regenerate only the changed sections "
+                 "and keep the other test cases and their IDs."
+        )
+        
+        st.checkbox(
+            "💾 Reuse cached Claude responses",
+            value=True,
+            key="use_response_cache",
+            help="Identical requirements and settings are served from the response cache instead of a new paid API call."
+        )
+        cache_stats = get_response_cache().stats()
+        st.caption(
+            f"{cache_stats['lifetime_hits']} hits · {cache_stats['lifetime_misses']} misses · "
+            f"{cache_stats['entries']} cached responses"
+        )
+        
+        st.checkbox(
+            "♻️ Reuse cached PDF extraction",
+            value=True,
+            key="use_extraction_cache",
+            help="Skip re-reading a PDF that was already extracted. Untick to force a fresh extraction."
+        )
+        
+        queue_stats = queue.stats()
+        st.caption(
+            f"🗂️ {queue_stats['running']}/{queue_stats['workers']} workers busy · "
+            f"{queue_stats['queued']} jobs waiting"
+        )
+        
+        st.markdown("---")
+        st.header("📚 About")
+        st.markdown("""
+        This tool uses **Claude AI** to generate:
+        - 📄 Professional Test Plans
+        - 🧪 Comprehensive Test Cases
+        
+        **Powered by:**
+        - Anthropic Claude API
+        - Streamlit
+        """)
+        
+        st.markdown("---")
+        st.header("💡 Tips")
+        st.markdown("""
+        - Upload clear PDF requirements
+        - Use descriptive project names
+        - Review generated docs
+        - Customize as needed
+        """)
+    
+    page.run()
+
+
 if __name__ == "__main__":
     main()